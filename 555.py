@@ -22,14 +22,18 @@ ureticiler = list(set(urun_uretici_data['Üretici']))
 
 # Sözlükler
 satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
+urun_uretici_dict = dict(zip(zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']), urun_uretici_data['Birim Maliyet']))
+urun_param_dict = {u: {"ortalama": m, "std": s} for u, m, s in zip(urun_param_df["Ürün"], urun_param_df["Ortalama"], urun_param_df["STD"])}
 
 
 # Üretici Kapasite Verilerini Sözlük Haline Getirme
 uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
 uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
 
+# Sınır ve kapasite sözlükleri (döngü içinde .loc araması yerine)
+urun_alt_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Alt Sınır']))
+urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
+
 
 def iterasyon_sonuclarini_yazdir(iterasyon, sales_stochastic, x_values, toplam_kar, toplam_maliyet, uretici_toplam_uretim):
     print(f"\n=== {iterasyon + 1}. İTERASYON SONUÇLARI ===")
@@ -56,8 +60,8 @@ for i in range(ITERASYON_SAYISI):
     sales_stochastic = {urun: max(0, np.random.normal(deger["ortalama"], deger["std"])) for urun, deger in urun_param_dict.items()}
     
     # Ürün Üst Sınırlarını Belirleme
-    urun_ust_kisit = {urun: min(sales_stochastic[urun], urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Üst Sınır'].values[0]) for urun in urunler}
-    urun_alt_kisit = {urun: max(sales_stochastic[urun], urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Alt Sınır'].values[0]) for urun in urunler}
+    urun_ust_kisit = {urun: min(sales_stochastic[urun], urun_ust_kisit_dict[urun]) for urun in urunler}
+    urun_alt_kisit = {urun: max(sales_stochastic[urun], urun_alt_kisit_dict[urun]) for urun in urunler}
     # Optimizasyon Modeli Kurulumu
     solver = pywraplp.Solver.CreateSolver('SCIP')
     
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from scenarios import demand_matrix_from_params
 from ortools.linear_solver import pywraplp
 
 # === Parametreler ===
@@ -18,22 +19,21 @@ urunler = [urun for urun in urun_kisit_data['Ürün'] if urun != "Toplam Maliyet
 ureticiler = list(set(urun_uretici_data['Üretici']))
 
 satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
+urun_uretici_dict = dict(zip(zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']), urun_uretici_data['Birim Maliyet']))
+urun_param_dict = {u: {"ortalama": m, "std": s} for u, m, s in zip(urun_param_df["Ürün"], urun_param_df["Ortalama"], urun_param_df["STD"])}
 uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
 uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
 
+# Sınır ve kapasite sözlükleri (döngü içinde .loc araması yerine)
+urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
+
 
 
 # === Tüm Senaryoları Üret ===
-sales_scenarios = []
-for i in range(SIMULASYON_SAYISI):
-    np.random.seed(12 + i)
-    scenario = {
-        urun: max(0, np.random.normal(urun_param_dict[urun]['ortalama'], urun_param_dict[urun]['std']))
-        for urun in urunler
-    }
-    sales_scenarios.append(scenario)
+# K x N talep matrisi; senaryo k kendi SeedSequence akışından üretilir, her satır bir senaryo sözlüğü olur
+talep_matrisi = demand_matrix_from_params(urunler, urun_param_dict, SIMULASYON_SAYISI, seed=12,
+                                          per_scenario=True)
+sales_scenarios = [dict(zip(urunler, satir)) for satir in talep_matrisi.tolist()]
 
 # === Optimizasyon Modeli ===
 solver = pywraplp.Solver.CreateSolver("SCIP")
@@ -49,7 +49,7 @@ for urun in urunler:
 for s_index, scenario in enumerate(sales_scenarios):
     for urun in urunler:
         urun_toplam = sum(x[(urun, uretici)] for uretici in ureticiler if (urun, uretici) in x)
-        uretilen_maks = urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Üst Sınır'].values[0]
+        uretilen_maks = urun_ust_kisit_dict[urun]
         solver.Add(urun_toplam <= min(scenario[urun], uretilen_maks), f"senaryo_{s_index}_urun_{urun}")
 
 # Üretici Kapasite Kısıtları
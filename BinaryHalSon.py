@@ -36,10 +36,16 @@ satis_fiyat = dict(
 ureticiler = [uretici for uretici in uretici_kapasite_data['Üretici']]
 
 # Ürün ve Üretici Maliyet Bilgilerini Dictionary Olarak Hazırlama
-urun_uretici_dict = {
-    (row['Ürün'], row['Üretici']): row['Birim Maliyet']
-    for _, row in urun_uretici_data.iterrows()
-}
+urun_uretici_dict = dict(zip(
+    zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']),
+    urun_uretici_data['Birim Maliyet']
+))
+
+# Sınır ve kapasite sözlükleri (döngü içinde .loc araması yerine)
+urun_alt_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Alt Sınır']))
+urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
+uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
+uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
 
 # Solver ve Değişkenlerin Tanımlanması
 solver = pywraplp.Solver.CreateSolver('SCIP')
@@ -62,8 +68,8 @@ for uretici in ureticiler:
 # Kısıtlar
 # Ürün Alt ve Üst Üretim Sınırı
 for urun in urunler:
-    urun_alt = urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Alt Sınır'].values[0]
-    urun_ust = urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Üst Sınır'].values[0]
+    urun_alt = urun_alt_kisit_dict[urun]
+    urun_ust = urun_ust_kisit_dict[urun]
     
     gecerli_uretici_ciftleri = [uretici for uretici in ureticiler if (urun, uretici) in x]
     
@@ -90,8 +96,8 @@ solver.Add(
 for uretici in ureticiler:
     gecerli_urun_ciftleri = [urun for urun in urunler if (urun, uretici) in x]
     
-    alt_kapasite = uretici_kapasite_data.loc[uretici_kapasite_data['Üretici'] == uretici, 'Alt Kapasite'].values[0]
-    ust_kapasite = uretici_kapasite_data.loc[uretici_kapasite_data['Üretici'] == uretici, 'Üst Kapasite'].values[0]
+    alt_kapasite = uretici_alt_kapasite_dict[uretici]
+    ust_kapasite = uretici_kapasite_dict[uretici]
     
     # Üretici kullanılıyorsa (z[uretici] = 1), alt kapasite kısıtı geçerli olur
     solver.Add(
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import scipy.stats as st
+from sales_history import DEFAULT_CHUNK_SIZE, iter_history
 
 def best_fit_distribution(data):
     distributions = [
@@ -37,31 +38,35 @@ def normalize_data(data):
     return data
 
 
-def main():
-    file_path = 'Ürün - Adet.xlsx'
-    df = pd.read_excel(file_path, header=None)  # Başlık olmadığı için header=None
-    
+def main(file_path='Ürün - Adet.xlsx', chunk_size=DEFAULT_CHUNK_SIZE):
     results = []
     
-    for index, row in df.iterrows():
-        product_name = row[0]  # Ürün ismi
-        sales_data = row[1:].dropna().values  # Satış verileri
-        
-        if len(sales_data) < 2:
-            results.append([product_name, "Yetersiz Veri", "-"])
-            continue
-        
-        normalized_data = normalize_data(sales_data)  # 📌 Normalizasyon
-        
-        best_dist, best_params, p_value = best_fit_distribution(normalized_data)
-        
-        if best_dist:
-            results.append([product_name, best_dist.name, str(best_params), p_value])
-        else:
-            results.append([product_name, "Belirlenemedi", "-"])
+    # Başlıksız tablo: ürünler parça parça okunur, tablo bütünüyle belleğe alınmaz
+    for urunler, _, satislar in iter_history(file_path, header=False, chunk_size=chunk_size):
+        for product_name, row in zip(urunler, satislar):
+            sales_data = row[~np.isnan(row)]  # Satış verileri
+            
+            if len(sales_data) < 2:
+                results.append([product_name, "Yetersiz Veri", "-"])
+                continue
+            
+            normalized_data = normalize_data(sales_data)  # 📌 Normalizasyon
+            
+            best_dist, best_params, p_value = best_fit_distribution(normalized_data)
+            
+            if best_dist:
+                # Uydurma normalize edilmiş ölçekte; örnekleme için ters dönüşüm bilgisi saklanır
+                donusum = 'minmax' if np.any(sales_data <= 0) else 'log1p'
+                # numpy 2 np.float64(...) gösterimi ast.literal_eval ile okunamaz; düz float yazılır
+                results.append([product_name, best_dist.name, str(tuple(float(v) for v in best_params)), p_value,
+                                donusum, sales_data.min(), sales_data.max()])
+            else:
+                results.append([product_name, "Belirlenemedi", "-"])
     
-    result_df = pd.DataFrame(results, columns=["Ürün", "En İyi Dağılım", "Parametreler", "p-value"])
+    result_df = pd.DataFrame(results, columns=["Ürün", "En İyi Dağılım", "Parametreler", "p-value",
+                                             "Dönüşüm", "Min", "Max"])
     result_df.to_excel('Uygun_Dagilimlar.xlsx', index=False)
     print("Dağılımlar belirlendi ve sonuçlar 'Uygun_Dagilimlar.xlsx' dosyasına kaydedildi.")
 
-main()
+if __name__ == "__main__":
+    main()
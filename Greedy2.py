@@ -1,99 +1,51 @@
+import numpy as np
 import pandas as pd
+from instance_io import open_instance
 pd.set_option('future.no_silent_downcasting', True)
 
-def load_data(file_path):
-    urun_kisit_data = pd.read_excel(file_path, sheet_name="Ürün - Kısıt")
-    urun_satis_data = pd.read_excel(file_path, sheet_name="Ürün - Satış")
-    urun_uretici_data = pd.read_excel(file_path, sheet_name="Ürün - Üretici")
-    uretici_kapasite_data = pd.read_excel(file_path, sheet_name="Üretici - Kapasite")
-    
-    # "Toplam Maliyet" satırını hariç tutma
-    toplam_maliyet = float(urun_kisit_data[urun_kisit_data['Ürün'] == 'Toplam Maliyet']['Maliyet'].values[0])
-    urun_kisit_data = urun_kisit_data[urun_kisit_data['Ürün'] != "Toplam Maliyet"]
-    
-    return urun_kisit_data, urun_satis_data, urun_uretici_data, uretici_kapasite_data, toplam_maliyet
-
-def calculate_coefficients(urun_satis_data, urun_uretici_data):
-    # Satış olasılıklarını hesapla
-    sales_probability = dict(
-        zip(
-            urun_satis_data['Ürün'],
-            urun_satis_data.iloc[:, 1:6].replace("-", 0).mean(axis=1)
-        )
-    )
-    
-    # Satış fiyatlarını al
-    satis_fiyat = dict(
-        zip(
-            urun_satis_data['Ürün'],
-            urun_satis_data['Satış Fiyatı']
-        )
-    )
-    
-    # Katsayıları hesapla (kar potansiyeli)
-    coefficients = {}
-    for _, row in urun_uretici_data.iterrows():
-        urun = row['Ürün']
-        uretici = row['Üretici']
-        maliyet = row['Birim Maliyet']
-        net_kar = (satis_fiyat[urun] * sales_probability[urun]) - maliyet
-        coefficients[(urun, uretici)] = {
-            'net_kar': net_kar,
-            'birim_maliyet': maliyet
-        }
-    
-    return coefficients, sales_probability, satis_fiyat
-
-def calculate_production_plan(urun_kisit_data, uretici_kapasite_data, coefficients, toplam_maliyet):
-    # Üretici kapasitelerini dictionary'e al
-    uretici_kapasiteleri = {}
-    for _, row in uretici_kapasite_data.iterrows():
-        uretici_kapasiteleri[row['Üretici']] = {
-            'kalan_kapasite': row['Üst Kapasite'],
-            'alt_kapasite': row['Alt Kapasite'],
-            'ust_kapasite': row['Üst Kapasite']
-        }
-    
-    # Ürün üretim sınırlarını dictionary'e al
-    urun_sinirlari = {}
-    for _, row in urun_kisit_data.iterrows():
-        urun_sinirlari[row['Ürün']] = {
-            'kalan_uretim': row['Üretim Üst Sınır'],
-            'alt_sinir': row['Üretim Alt Sınır'],
-            'ust_sinir': row['Üretim Üst Sınır']
-        }
-    
-    # Sonuçları tutacak dictionary
-    uretim_plani = {}
-    kalan_toplam_maliyet = toplam_maliyet
-    
-    # Katsayıları sırala
-    sorted_coefficients = sorted(
-        coefficients.items(),
-        key=lambda x: x[1]['net_kar'],
-        reverse=True
-    )
-    
-    # Greedy algoritma
-    for (urun, uretici), coefficient in sorted_coefficients:
+def calculate_production_plan_from_instance(instance):
+    # Greedy algoritmanın dizi tabanlı hali (Excel veya .ortest örneği)
+    if instance.satis_olasiligi is None:
+        raise ValueError("Örnekte 'Ürün - Satış' verisi yok, satış olasılıkları hesaplanamıyor")
+    
+    # Bağlantı bazında net kar katsayıları
+    fiyat = instance.satis_fiyat[instance.arc_urun]
+    olasilik = instance.satis_olasiligi[instance.arc_urun]
+    net_kar = fiyat * olasilik - instance.birim_maliyet
+    sirali = np.argsort(-net_kar, kind='stable')
+    
+    kalan_uretim = instance.ust_sinir.tolist()
+    kalan_kapasite = instance.uretici_ust_kapasite.tolist()
+    kalan_toplam_maliyet = instance.toplam_maliyet
+    arc_urun = instance.arc_urun.tolist()
+    arc_uretici = instance.uretici_idx.tolist()
+    maliyet = instance.birim_maliyet.tolist()
+    x = np.zeros(instance.n_arc)
+    
+    for a in sirali.tolist():
         if kalan_toplam_maliyet <= 0:
             break
-            
-        max_uretim = min(
-            urun_sinirlari[urun]['kalan_uretim'],
-            uretici_kapasiteleri[uretici]['kalan_kapasite'],
-            int(kalan_toplam_maliyet / coefficient['birim_maliyet'])
-        )
+        
+        u, j = arc_urun[a], arc_uretici[a]
+        max_uretim = min(kalan_uretim[u], kalan_kapasite[j], int(kalan_toplam_maliyet / maliyet[a]))
         
         if max_uretim > 0:
-            uretim_plani[(urun, uretici)] = max_uretim
-            
-            # Kapasiteleri güncelle
-            urun_sinirlari[urun]['kalan_uretim'] -= max_uretim
-            uretici_kapasiteleri[uretici]['kalan_kapasite'] -= max_uretim
-            kalan_toplam_maliyet -= max_uretim * coefficient['birim_maliyet']
+            x[a] = max_uretim
+            kalan_uretim[u] -= max_uretim
+            kalan_kapasite[j] -= max_uretim
+            kalan_toplam_maliyet -= max_uretim * maliyet[a]
+    
+    # Rapor fonksiyonlarının beklediği sözlük yapıları
+    keys = instance.arc_keys()
+    uretim_plani = {keys[a]: x[a] for a in np.flatnonzero(x).tolist()}
+    coefficients = {
+        key: {'net_kar': k, 'birim_maliyet': c}
+        for key, k, c in zip(keys, net_kar.tolist(), maliyet)
+    }
+    sales_probability = dict(zip(instance.urunler, instance.satis_olasiligi.tolist()))
+    satis_fiyat = dict(zip(instance.urunler, instance.satis_fiyat.tolist()))
     
-    return uretim_plani
+    return uretim_plani, coefficients, sales_probability, satis_fiyat
 
 def create_excel_report(uretim_plani, coefficients, sales_probability, satis_fiyat):
     # Dictionary to store results for each product
@@ -155,14 +107,10 @@ def create_excel_report(uretim_plani, coefficients, sales_probability, satis_fiy
     return df
 
 def main(file_path):
-    # Load data
-    urun_kisit_data, urun_satis_data, urun_uretici_data, uretici_kapasite_data, toplam_maliyet = load_data(file_path)
-    
-    # Calculate coefficients
-    coefficients, sales_probability, satis_fiyat = calculate_coefficients(urun_satis_data, urun_uretici_data)
-    
-    # Calculate production plan
-    uretim_plani = calculate_production_plan(urun_kisit_data, uretici_kapasite_data, coefficients, toplam_maliyet)
+    # Load instance (Excel workbook or converted .ortest directory)
+    with open_instance(file_path, lazy=True) as instance:
+        # Calculate coefficients and production plan on the instance arrays
+        uretim_plani, coefficients, sales_probability, satis_fiyat = calculate_production_plan_from_instance(instance)
     
     # Create and export Excel report
     df = create_excel_report(uretim_plani, coefficients, sales_probability, satis_fiyat)
@@ -1,46 +1,57 @@
-import pandas as pd
 import numpy as np
 import time
 from ortools.linear_solver import pywraplp
 from tqdm import tqdm
+from instance_loader import load_data
+from problem_instance import ProblemInstance
+from scenarios import demand_matrix_from_params
+from scenario_cache import ScenarioCache
+from scenario_stream import evaluate_plan_streaming
+from bound_tightening import TightBounds
 
 # ==========================================
 # 1. YARDIMCI FONKSİYONLAR
 # ==========================================
 
-def generate_random_scenarios(urun_param_dict, sim_sayisi, seed=None):
-    if seed is not None:
-        np.random.seed(seed)
-    return {
-        urun: [max(0, int(round(np.random.normal(p["ortalama"], p["std"]))))
-               for _ in range(sim_sayisi)]
-        for urun, p in urun_param_dict.items()
-    }
+def generate_random_scenarios(urunler, urun_param_dict, sim_sayisi, seed=None, cache=None, sampler=None):
+    """Tamsayı talep senaryoları (K x N); cache verilirse diskteki matris yeniden kullanılır
+
+    Talepler kesik, ayrıklaştırılmış normalden gelir (scenarios.integer_from_normal);
+    yuvarlanmış max(0, normal) gibi sıfırda nokta kütlesi yoktur.
+    sampler verilirse (ör. HistoryBootstrap) senaryolar onun generate_scenarios'undan gelir.
+    """
+    if sampler is not None:
+        return np.rint(sampler.generate_scenarios(urunler, urun_param_dict, sim_sayisi, seed))
+    if cache is not None and seed is not None:
+        return cache.demand_matrix(urunler, urun_param_dict, sim_sayisi, seed, dagilim='tamsayi')
+    return demand_matrix_from_params(urunler, urun_param_dict, sim_sayisi, seed=seed, dagilim='tamsayi')
 
 def solve_production_model(sales_scenarios, urunler, ureticiler, satis_fiyat,
                            urun_uretici_dict, uretici_kapasite_dict,
-                           uretici_alt_kapasite_dict, sim_sayisi):
+                           uretici_alt_kapasite_dict, sim_sayisi, x_ust=None):
+    """x_ust verilirse ({(ürün, üretici): üst sınır}, bkz. bound_tightening) yalnızca
+    bu bağlantılar ve sınırlarla kurulur; satışlar talebi üst sınır olarak alır"""
 
     solver = pywraplp.Solver.CreateSolver('SCIP')
     if solver is None:
         raise RuntimeError("Solver oluşturulamadı.")
 
+    if x_ust is None:
+        x_ust = {key: solver.infinity() for key in urun_uretici_dict}
     x = {
-        (urun, uretici): solver.IntVar(0, sum(sales_scenarios[urun]) // sim_sayisi + 100,
-                                       f'x_{urun}_{uretici}')
-        for urun in urunler for uretici in ureticiler if (urun, uretici) in urun_uretici_dict
+        (urun, uretici): solver.IntVar(0, x_ust[(urun, uretici)], f'x_{urun}_{uretici}')
+        for urun in urunler for uretici in ureticiler if (urun, uretici) in x_ust
     }
 
     satilan = {
-        (urun, s): solver.NumVar(0, solver.infinity(), f'satilan_{urun}_{s}')
-        for urun in urunler for s in range(sim_sayisi)
+        (urun, s): solver.NumVar(0, talep, f'satilan_{urun}_{s}')
+        for urun in urunler for s, talep in enumerate(np.asarray(sales_scenarios[urun], dtype=float).tolist())
     }
 
     for urun in urunler:
         toplam_uretim = sum(x[(urun, uretici)] for uretici in ureticiler if (urun, uretici) in x)
         for s in range(sim_sayisi):
             solver.Add(satilan[(urun, s)] <= toplam_uretim)
-            solver.Add(satilan[(urun, s)] <= sales_scenarios[urun][s])
 
     for uretici in ureticiler:
         toplam = sum(x[(urun, uretici)] for urun in urunler if (urun, uretici) in x)
@@ -57,80 +68,94 @@ def solve_production_model(sales_scenarios, urunler, ureticiler, satis_fiyat,
 
     status = solver.Solve()
     if status == pywraplp.Solver.OPTIMAL:
-        plan = {(urun, uretici): x[(urun, uretici)].solution_value()
-                for (urun, uretici) in x}
+        plan = {(urun, uretici): x[(urun, uretici)].solution_value() if (urun, uretici) in x else 0.0
+                for urun in urunler for uretici in ureticiler if (urun, uretici) in urun_uretici_dict}
         return plan
     else:
         return None
 
-def evaluate_plan(plan, test_scenarios, urunler, ureticiler, satis_fiyat, urun_uretici_dict, sim_sayisi):
-    total_profit = 0
-    for urun in urunler:
-        uretim_miktari = sum(plan.get((urun, uretici), 0) for uretici in ureticiler)
-        for s in range(sim_sayisi):
-            satis = min(uretim_miktari, test_scenarios[urun][s])
-            total_profit += (satis * satis_fiyat[urun] / sim_sayisi)
-    total_cost = sum(plan[(urun, uretici)] * urun_uretici_dict[(urun, uretici)]
-                     for (urun, uretici) in plan)
-    return total_profit - total_cost
+def evaluate_plan(plan, test_demand, instance):
+    """Planı K x N test senaryo matrisinde dizi tabanlı olarak değerlendir"""
+    x_arc = instance.plan_to_array(plan)
+    return instance.expected_profit(x_arc, test_demand)
 
 # ==========================================
 # 2. ANA AKIŞ – SAA YAKLAŞIMI
 # ==========================================
 
-# Dosya ve veri okuma
-file_path = "ORTEST.xlsx"
-urun_kisit_data = pd.read_excel(file_path, sheet_name="Ürün - Kısıt")
-urun_satis_data = pd.read_excel(file_path, sheet_name="Ürün - Fiyat")
-urun_uretici_data = pd.read_excel(file_path, sheet_name="Ürün - Üretici")
-uretici_kapasite_data = pd.read_excel(file_path, sheet_name="Üretici - Kapasite")
-urun_param_df = pd.read_excel(file_path, sheet_name="Ürün - Param")
-
-urunler = [urun for urun in urun_kisit_data['Ürün'] if urun != "Toplam Maliyet"]
-ureticiler = list(set(urun_uretici_data['Üretici']))
-
-satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
-uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
-uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
-
 # SAA Parametreleri
 NUM_GROUPS = 5
 NUM_EVALUATION = 10
 SIMULASYON_SAYISI = 5000
+OOS_SEED = 777
+
+
+def run_saa(file_path="ORTEST.xlsx", num_groups=NUM_GROUPS, num_evaluation=NUM_EVALUATION,
+            simulasyon_sayisi=SIMULASYON_SAYISI, cache=True, scenario_sampler=None,
+            oos_senaryo=None, workers=None):
+    """SAA akışı: her grup için modeli çöz, planı test senaryolarında değerlendir
+
+    Değerlendirme kümeleri (seed=100+e) bir kez üretilip tüm gruplarda
+    kullanılır; cache=True iken senaryolar çalıştırmalar arasında diskte saklanır.
+    oos_senaryo verilirse en iyi plan bu kadar yeni senaryo üzerinde bloklar
+    halinde (sabit bellekle, workers işçiyle) örneklem dışı değerlendirilir.
+    """
+    data = load_data(file_path)
+    urunler = data['urunler']
+    ureticiler = data['ureticiler']
+    urun_param_dict = data['urun_param_dict']
+
+    # Değerlendirme için dizi tabanlı örnek
+    instance = ProblemInstance.from_data(data)
+
+    cache = ScenarioCache() if cache is True else (cache or None)
+    test_sets = [generate_random_scenarios(urunler, urun_param_dict, simulasyon_sayisi, seed=100 + e, cache=cache,
+                                           sampler=scenario_sampler)
+                 for e in range(num_evaluation)]
+
+    best_plan = None
+    best_profit = -float('inf')
+
+    print("SAA başlatılıyor...\n")
+    for g in tqdm(range(num_groups), desc="SAA Grupları"):
+        demand = generate_random_scenarios(urunler, urun_param_dict, simulasyon_sayisi, seed=g, cache=cache,
+                                           sampler=scenario_sampler)
+        scenarios = dict(zip(urunler, demand.T))
+        # Bu modelde ürün alt/üst sınırı yok; sınırlar yalnızca talep ve kapasitelerden
+        sinirlar = TightBounds(instance, demand, urun_sinirlari=False)
+        plan = solve_production_model(
+            scenarios, urunler, ureticiler, data['satis_fiyat'], data['urun_uretici_dict'],
+            data['uretici_kapasite_dict'], data['uretici_alt_kapasite_dict'], simulasyon_sayisi,
+            x_ust=sinirlar.arc_bounds())
+
+        if plan is None:
+            continue
+
+        evaluation_profits = [evaluate_plan(plan, test_demand, instance) for test_demand in test_sets]
+
+        avg_profit = np.mean(evaluation_profits)
+        if avg_profit > best_profit:
+            best_profit = avg_profit
+            best_plan = plan
+
+    # ==========================================
+    # 3. SONUÇLAR
+    # ==========================================
+
+    print("\n=== En İyi Plan ===")
+    for urun in urunler:
+        toplam_uretim = sum(best_plan.get((urun, uretici), 0) for uretici in ureticiler)
+        print(f"{urun}: {toplam_uretim}")
 
-best_plan = None
-best_profit = -float('inf')
-
-print("SAA başlatılıyor...\n")
-for g in tqdm(range(NUM_GROUPS), desc="SAA Grupları"):
-    scenarios = generate_random_scenarios(urun_param_dict, SIMULASYON_SAYISI, seed=g)
-    plan = solve_production_model(
-        scenarios, urunler, ureticiler, satis_fiyat, urun_uretici_dict,
-        uretici_kapasite_dict, uretici_alt_kapasite_dict, SIMULASYON_SAYISI)
-
-    if plan is None:
-        continue
-
-    evaluation_profits = []
-    for e in range(NUM_EVALUATION):
-        test_scenarios = generate_random_scenarios(urun_param_dict, SIMULASYON_SAYISI, seed=100+e)
-        profit = evaluate_plan(plan, test_scenarios, urunler, ureticiler, satis_fiyat, urun_uretici_dict, SIMULASYON_SAYISI)
-        evaluation_profits.append(profit)
-
-    avg_profit = np.mean(evaluation_profits)
-    if avg_profit > best_profit:
-        best_profit = avg_profit
-        best_plan = plan
+    print(f"\nEn iyi planın ortalama karı (SAA test grupları üzerinde): {best_profit:,.2f}")
 
-# ==========================================
-# 3. SONUÇLAR
-# ==========================================
+    if oos_senaryo and best_plan is not None:
+        oos = evaluate_plan_streaming(instance, instance.plan_to_array(best_plan), oos_senaryo,
+                                      seed=OOS_SEED, workers=workers, dagilim='tamsayi')
+        print(f"Örneklem dışı ({oos['senaryo']:,} senaryo): {oos['ortalama']:,.2f} "
+              f"± {1.96 * oos['std_hata']:,.2f} (%95)")
+    return best_plan, best_profit
 
-print("\n=== En İyi Plan ===")
-for urun in urunler:
-    toplam_uretim = sum(best_plan.get((urun, uretici), 0) for uretici in ureticiler)
-    print(f"{urun}: {toplam_uretim}")
 
-print(f"\nEn iyi planın ortalama karı (SAA test grupları üzerinde): {best_profit:,.2f}")
+if __name__ == "__main__":
+    run_saa()
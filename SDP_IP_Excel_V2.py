@@ -1,6 +1,18 @@
 import pandas as pd
 import numpy as np
 from ortools.linear_solver import pywraplp
+from instance_loader import load_data
+from scenarios import demand_matrix_from_params
+from scenario_reduction import reduce_scenarios
+from fitted_distributions import FITTED_FILE, load_fitted
+from copula import CopulaModel
+from scenario_cache import ScenarioCache
+from history_bootstrap import HistoryBootstrap
+from recourse import (FORMULASYONLAR, CutPool, add_violated_cuts, expected_sales, expected_sales_cuts,
+                      integrality_violations, revenue_segments, sales_bound)
+from problem_instance import ProblemInstance
+from matrix_model import model_nonzeros, solve_two_stage
+from bound_tightening import TightBounds
 from tqdm import tqdm
 import time
 import threading
@@ -9,55 +21,85 @@ from datetime import datetime
 import json
 
 class OptimizationTester:
-    def __init__(self):
+    def __init__(self, sampler='mc', dagilim='normal', reduce_to=None, reduction='kmedoids',
+                 dagilim_dosyasi=FITTED_FILE, korelasyon=False, korelasyon_rank=None, onbellek=True,
+                 bootstrap=False, gecmis_dosyasi=None, formulasyon='senaryo', model_kurucu='pywraplp',
+                 uretim_degiskeni=True, sinir_sikilastirma=True, surekli_satis=True, tamsayi_dogrula=False):
+        # Senaryo örnekleyicisi: mc, antithetic, lhs, sobol (bkz. scenarios.py)
+        self.sampler = sampler
+        self.dagilim = dagilim
+        # dagilim='fitted' iken ürün dağılımları Dağılım_Bulma çıktısından okunur
+        self.dagilim_dosyasi = dagilim_dosyasi
+        self._fitted = None
+        # korelasyon=True iken ürünler arası korelasyon dosyanın "Ürün - Adet"
+        # geçmişinden kestirilir ve senaryolar Gauss kopulası ile üretilir
+        self.korelasyon = korelasyon
+        self.korelasyon_rank = korelasyon_rank
+        self._copulas = {}
+        # Aynı (parametre, örnekleyici, tohum) senaryoları çalıştırmalar arasında diskten okunur
+        self.scenario_cache = ScenarioCache() if onbellek else None
+        # bootstrap=True iken senaryolar geçmiş satış dönemlerinden yeniden örneklenir;
+        # gecmis_dosyasi verilmezse test dosyasının "Ürün - Adet" sayfası kullanılır
+        self.bootstrap = bootstrap
+        self.gecmis_dosyasi = gecmis_dosyasi
+        self._bootstraps = {}
+        # İkinci aşama: 'senaryo' (N x K y değişkeni) ya da sıralı talep kırılmalarıyla
+        # kompakt 'segment' / 'epigraf' (bkz. recourse.py)
+        self.formulasyon = formulasyon
+        # model_kurucu='matris' iken model NumPy/SciPy seyrek matris olarak kurulup
+        # ModelBuilder'a tek seferde yüklenir (bkz. matrix_model.py; epigraf pywraplp ile kalır)
+        self.model_kurucu = model_kurucu
+        # uretim_degiskeni=True iken çok üreticili ürünlerin toplam üretimi x'lere bir kez
+        # bağlanan tek değişkendir; senaryo kısıtları |üretici| yerine tek katsayı taşır
+        self.uretim_degiskeni = uretim_degiskeni
+        # sinir_sikilastirma=True iken x / toplam üretim üst sınırları ve büyük-M katsayıları
+        # talep ve kapasitelerden türetilir, baskın olunan bağlantılar elenir (bkz. bound_tightening.py)
+        self.sinir_sikilastirma = sinir_sikilastirma
+        # surekli_satis=True iken y her zaman sürekli (talep tabanıyla sınırlı; bkz. recourse.sales_bound);
+        # tamsayi_dogrula=True iken çözümden sonra y değerlerinin tam sayılığı denetlenir
+        self.surekli_satis = surekli_satis
+        self.tamsayi_dogrula = tamsayi_dogrula
+        # reduce_to verilirse K senaryo model kurulmadan M ağırlıklı temsilciye indirgenir
+        self.reduce_to = reduce_to
+        self.reduction = reduction
         self.results_summary = []
         self.detailed_results = {}
         self.all_scenarios = {}
         
     def load_data(self, file_path):
-        """Excel dosyasından verileri yükle"""
+        """Excel dosyasından verileri yükle (ayrıştırılmış veri önbellekten gelir)"""
         try:
-            urun_kisit_data = pd.read_excel(file_path, sheet_name="Ürün - Kısıt")
-            urun_satis_data = pd.read_excel(file_path, sheet_name="Ürün - Fiyat")
-            urun_uretici_data = pd.read_excel(file_path, sheet_name="Ürün - Üretici")
-            uretici_kapasite_data = pd.read_excel(file_path, sheet_name="Üretici - Kapasite")
-            urun_param_df = pd.read_excel(file_path, sheet_name="Ürün - Param")
-            
-            # Veri yapıları
-            urunler = [u for u in urun_kisit_data['Ürün'] if u != "Toplam Maliyet"]
-            ureticiler = list(set(urun_uretici_data['Üretici']))
-            satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-            urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-            urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
-            uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
-            uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
-            urun_alt_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Alt Sınır']))
-            urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
-            
-            return {
-                'urunler': urunler,
-                'ureticiler': ureticiler,
-                'satis_fiyat': satis_fiyat,
-                'urun_uretici_dict': urun_uretici_dict,
-                'urun_param_dict': urun_param_dict,
-                'uretici_kapasite_dict': uretici_kapasite_dict,
-                'uretici_alt_kapasite_dict': uretici_alt_kapasite_dict,
-                'urun_alt_kisit_dict': urun_alt_kisit_dict,
-                'urun_ust_kisit_dict': urun_ust_kisit_dict
-            }
+            return load_data(file_path)
         except Exception as e:
             print(f"❌ Veri yükleme hatası: {e}")
             return None
     
-    def generate_scenarios(self, urunler, urun_param_dict, simulasyon_sayisi, seed):
+    def load_copula(self, file_path):
+        """Dosyanın satış geçmişinden kopula faktör modeli (dosya başına bir kez)"""
+        if file_path not in self._copulas:
+            self._copulas[file_path] = CopulaModel.from_file(file_path, rank=self.korelasyon_rank)
+        return self._copulas[file_path]
+    
+    def load_bootstrap(self, file_path):
+        """Geçmiş satış bootstrap üreteci (dosya başına bir kez)"""
+        kaynak = self.gecmis_dosyasi or file_path
+        if kaynak not in self._bootstraps:
+            self._bootstraps[kaynak] = HistoryBootstrap.from_file(kaynak)
+        return self._bootstraps[kaynak]
+    
+    def generate_scenarios(self, urunler, urun_param_dict, simulasyon_sayisi, seed, copula=None, bootstrap=None):
         """Senaryoları oluştur"""
-        sales_scenarios = {urun: [] for urun in urunler}
-        np.random.seed(seed)
-        
-        for k in range(simulasyon_sayisi):
-            for urun in urunler:
-                talep = max(0, np.random.normal(urun_param_dict[urun]['ortalama'], urun_param_dict[urun]['std']))
-                sales_scenarios[urun].append(talep)
+        if bootstrap is not None:
+            return bootstrap.generate_scenarios(urunler, urun_param_dict, simulasyon_sayisi, seed)
+        # K x N talep matrisi (satır = senaryo, sütun = ürün), tek vektörel çekiliş
+        if self.scenario_cache is not None and copula is None and self.dagilim != 'fitted':
+            return self.scenario_cache.demand_matrix(urunler, urun_param_dict, simulasyon_sayisi, seed,
+                                                     sampler=self.sampler, dagilim=self.dagilim)
+        if self.dagilim == 'fitted' and self._fitted is None:
+            self._fitted = load_fitted(self.dagilim_dosyasi)
+        sales_scenarios = demand_matrix_from_params(urunler, urun_param_dict, simulasyon_sayisi, seed=seed,
+                                                    sampler=self.sampler, dagilim=self.dagilim,
+                                                    fitted=self._fitted, copula=copula)
         
         return sales_scenarios
     
@@ -78,25 +120,74 @@ class OptimizationTester:
         
         return estimated_seconds
     
-    def solve_optimization(self, data, sales_scenarios, simulasyon_sayisi, verbose=True):
-        """Optimizasyon problemini çöz"""
+    def solve_optimization(self, data, sales_scenarios, simulasyon_sayisi, verbose=True, olasiliklar=None,
+                           rapor_senaryo=None):
+        """Optimizasyon problemini çöz (olasiliklar verilmezse senaryolar eşit ağırlıklı)
+
+        rapor_senaryo: kar/gelir raporunun normalize edildiği senaryo sayısı. İndirgenmiş
+        modelde (M temsilci) özgün K verilir; böylece indirgenmiş ve indirgenmemiş
+        çalıştırmaların 'profit' değeri aynı tanımdadır (ağırlıklı beklenen gelir - maliyet / K).
+        """
+        if olasiliklar is None:
+            olasiliklar = np.full(simulasyon_sayisi, 1.0 / simulasyon_sayisi)
+        if rapor_senaryo is None:
+            rapor_senaryo = simulasyon_sayisi
+        if self.model_kurucu == 'matris' and self.formulasyon != 'epigraf':
+            return self._solve_matrix(data, sales_scenarios, simulasyon_sayisi, verbose, olasiliklar, rapor_senaryo)
+        olasiliklar = olasiliklar.tolist()
         solver = pywraplp.Solver.CreateSolver('SCIP')
         
-        # Değişkenler
-        x = {(u, j): solver.IntVar(0, solver.infinity(), f"x_{u}_{j}") 
-             for u in data['urunler'] for j in data['ureticiler'] if (u, j) in data['urun_uretici_dict']}
+        # Üst sınırlar; sıkılaştırmada elenen bağlantılar için değişken kurulmaz
+        sinirlar = None
+        if self.sinir_sikilastirma:
+            sinirlar = TightBounds(ProblemInstance.from_data(data), sales_scenarios)
+            x_ust, uretim_ust = sinirlar.arc_bounds(), sinirlar.product_bounds()
+            if verbose:
+                print(f"   🔧 Sınır sıkılaştırma: {sinirlar.elenen} bağlantı elendi")
+        else:
+            x_ust = {k: solver.infinity() for k in data['urun_uretici_dict']}
+            uretim_ust = data['urun_ust_kisit_dict']
         
-        y = {(u, k): solver.IntVar(0, solver.infinity(), f"y_{u}_{k}") 
-             for u in data['urunler'] for k in range(simulasyon_sayisi)}
+        # Değişkenler
+        x = {(u, j): solver.IntVar(0, x_ust[(u, j)], f"x_{u}_{j}") 
+             for u in data['urunler'] for j in data['ureticiler'] if (u, j) in x_ust}
+        
+        # Satışlar taban(talep) ile sınırlanınca y = min(taban(talep), üretim) LP'si tamamen
+        # unimodülerdir: x tam sayı olduğundan en iyi y zaten tam sayıdır ve y sürekli olabilir.
+        # surekli_satis=False iken y yalnızca talepler tam sayıysa (dagilim='tamsayi') sürekli
+        tamsayi_talep = bool(np.all(np.mod(sales_scenarios, 1) == 0))
+        surekli_y = self.surekli_satis or tamsayi_talep
+        talep_siniri = sales_bound(sales_scenarios)
+        kompakt = self.formulasyon != 'senaryo'
+        y = {}
+        if not kompakt:
+            y_var = solver.NumVar if surekli_y else solver.IntVar
+            # Sıkılaştırmada talep, ayrı kısıt yerine y'nin üst sınırıdır
+            y_ust = talep_siniri if self.sinir_sikilastirma else \
+                np.full(np.shape(sales_scenarios), solver.infinity())
+            y = {(u, k): y_var(0, ub, f"y_{u}_{k}") 
+                 for i, u in enumerate(data['urunler']) for k, ub in enumerate(y_ust[:, i].tolist())}
+        integer_vars = len(x) + (0 if surekli_y else len(y))
         
         b_vars = {u: solver.BoolVar(f"b_{u}") for u in data['urunler']}
         
+        # Toplamı ürünün üretimini veren değişkenler (x'ler ya da tek üretim değişkeni)
+        uretim_terimleri = {u: [x[(u, j)] for j in data['ureticiler'] if (u, j) in x] for u in data['urunler']}
+        if self.uretim_degiskeni:
+            # Tek üreticili üründe x zaten toplamdır; değişken yalnızca çok kaynaklı ürünlere
+            for u, x_u in uretim_terimleri.items():
+                if len(x_u) <= 1:
+                    continue
+                uretim = solver.NumVar(0, uretim_ust[u], f"uretim_{u}")
+                solver.Add(uretim == sum(x_u))
+                uretim_terimleri[u] = [uretim]
+        
         # Amaç fonksiyonu
         total_profit = solver.Objective()
         for (u, j), var in x.items():
             total_profit.SetCoefficient(var, -data['urun_uretici_dict'][(u, j)])
         for (u, k), var in y.items():
-            total_profit.SetCoefficient(var, data['satis_fiyat'][u] / simulasyon_sayisi)
+            total_profit.SetCoefficient(var, data['satis_fiyat'][u] * olasiliklar[k])
         total_profit.SetMaximization()
         
         # Kısıtlar
@@ -108,49 +199,79 @@ class OptimizationTester:
         
         # Ürün alt-üst sınır kısıtları
         for u in data['urunler']:
-            toplam_uretim = sum(x[(u, j)] for j in data['ureticiler'] if (u, j) in x)
+            toplam_uretim = sum(uretim_terimleri[u])
             alt = data['urun_alt_kisit_dict'][u]
-            ust = data['urun_ust_kisit_dict'][u]
+            ust = uretim_ust[u]
             solver.Add(toplam_uretim >= alt * b_vars[u])
             solver.Add(toplam_uretim <= ust * b_vars[u])
         
         # Satılabilir miktar kısıtları
-        for u in data['urunler']:
-            toplam_uretim = sum(x[(u, j)] for j in data['ureticiler'] if (u, j) in x)
-            for k in range(simulasyon_sayisi):
-                solver.Add(y[(u, k)] <= toplam_uretim)
-                solver.Add(y[(u, k)] <= sales_scenarios[u][k])
+        if kompakt:
+            # Tam sayı y <= kesirli talep, y <= taban(talep) demektir; kırılmalar buna göre alınır
+            talep_matrisi = talep_siniri
+            kesme_havuzu = self._add_compact_recourse(solver, total_profit, data, uretim_terimleri, talep_matrisi,
+                                                      np.asarray(olasiliklar))
+        else:
+            for i, u in enumerate(data['urunler']):
+                toplam_uretim = sum(uretim_terimleri[u])
+                talep = talep_siniri[:, i].tolist()
+                for k in range(simulasyon_sayisi):
+                    solver.Add(y[(u, k)] <= toplam_uretim)
+                    if not self.sinir_sikilastirma:
+                        solver.Add(y[(u, k)] <= talep[k])
         
         # Çözüm süresini tahmin et
         estimated_time = self.estimate_solve_time(
             solver.NumVariables(), 
-            len(x) + len(y), 
+            integer_vars, 
             solver.NumConstraints(), 
             simulasyon_sayisi
         )
         
+        nonzeros = model_nonzeros(solver)
+        
         if verbose:
             print(f"   📊 Değişken sayısı: {solver.NumVariables():,}")
-            print(f"   📊 Integer değişken: {len(x) + len(y):,}")
-            print(f"   📊 Kısıt sayısı: {solver.NumConstraints():,}")
+            print(f"   📊 Integer değişken: {integer_vars:,}")
+            print(f"   📊 Kısıt sayısı: {solver.NumConstraints():,} | Sıfır olmayan katsayı: {nonzeros:,}")
             print(f"   ⏱️  Tahmini süre: {estimated_time:.1f} saniye")
         
         # Çözüm
         start_time = time.time()
         status = solver.Solve()
+        if kompakt and self.formulasyon == 'epigraf':
+            # Dış yaklaşım: ihlal edilen kesmeleri ekleyip yeniden çöz (sonlu sayıda doğru)
+            while status in [pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE] \
+                    and add_violated_cuts(solver, kesme_havuzu):
+                status = solver.Solve()
         end_time = time.time()
         
         solve_time = end_time - start_time
         
         if status in [pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE]:
             x_values = {k: v.solution_value() for k, v in x.items()}
-            y_values = {k: v.solution_value() for k, v in y.items()}
+            if sinirlar is not None:
+                x_values.update({k: 0.0 for k in sinirlar.arc_keys if k not in x_values})
             b_values = {k: v.solution_value() for k, v in b_vars.items()}
             
             # Performans metrikleri
             uretim_maliyet = sum(x_values[(u, j)] * data['urun_uretici_dict'][(u, j)] for (u, j) in x_values)
-            toplam_gelir = sum(y_values[(u, k)] * data['satis_fiyat'][u] for (u, k) in y_values)
-            ortalama_kar = (toplam_gelir - uretim_maliyet) / simulasyon_sayisi
+            if kompakt:
+                # Satışlar modelde yok; y = min(üretim, talep) senaryo başına hesaplanmaz
+                y_values = None
+                uretim = [sum(x_values[(u, j)] for j in data['ureticiler'] if (u, j) in x_values)
+                          for u in data['urunler']]
+                satis = expected_sales(uretim, talep_matrisi, np.asarray(olasiliklar))
+                toplam_gelir = float(satis @ np.array([data['satis_fiyat'][u] for u in data['urunler']])) \
+                    * rapor_senaryo
+            else:
+                y_values = {k: v.solution_value() for k, v in y.items()}
+                if self.tamsayi_dogrula and surekli_y:
+                    self._report_integrality(list(y_values.values()), verbose)
+                # Eşit ağırlıkta senaryo gelirlerinin toplamıyla aynıdır
+                toplam_gelir = sum(y_values[(u, k)] * data['satis_fiyat'][u] * olasiliklar[k]
+                                   for (u, k) in y_values) * rapor_senaryo
+            ortalama_kar = (toplam_gelir - uretim_maliyet) / rapor_senaryo
             
             return {
                 'status': 'success',
@@ -162,6 +283,7 @@ class OptimizationTester:
                 'x_values': x_values,
                 'y_values': y_values,
                 'b_values': b_values,
+                'nonzeros': nonzeros,
                 'solver_status': status
             }
         else:
@@ -169,9 +291,132 @@ class OptimizationTester:
                 'status': 'failed',
                 'solve_time': solve_time,
                 'estimated_time': estimated_time,
+                'nonzeros': nonzeros,
                 'solver_status': status
             }
     
+    def _solve_matrix(self, data, sales_scenarios, simulasyon_sayisi, verbose, olasiliklar, rapor_senaryo):
+        """solve_optimization ile aynı model; matris kurucu ile ve aşama süreleriyle"""
+        t0 = time.perf_counter()
+        instance = ProblemInstance.from_data(data)
+        olasiliklar = np.asarray(olasiliklar, dtype=np.float64)
+        tamsayi_talep = bool(np.all(np.mod(sales_scenarios, 1) == 0))
+        surekli_y = self.surekli_satis or tamsayi_talep
+        talep_matrisi = sales_bound(np.asarray(sales_scenarios, dtype=np.float64))
+        aktif, x_ust, uretim_ust = np.ones(instance.n_arc, dtype=bool), None, None
+        model_ornegi = instance
+        if self.sinir_sikilastirma:
+            sinirlar = TightBounds(instance, sales_scenarios)
+            aktif, uretim_ust = sinirlar.aktif, sinirlar.uretim_ust
+            x_ust = sinirlar.x_ust[aktif]
+            model_ornegi = instance.restrict_arcs(aktif)
+            if verbose:
+                print(f"   🔧 Sınır sıkılaştırma: {sinirlar.elenen} bağlantı elendi")
+        hazirlik = time.perf_counter() - t0
+
+        sonuc = solve_two_stage(model_ornegi, talep_matrisi, olasiliklar, self.formulasyon, surekli_y,
+                                self.uretim_degiskeni, x_ust, uretim_ust)
+        sureler = {'hazirlik': hazirlik, **sonuc['sureler']}
+        estimated_time = self.estimate_solve_time(sonuc['n_var'], sonuc['n_int'], sonuc['n_row'],
+                                                  simulasyon_sayisi)
+        if verbose:
+            print(f"   📊 Değişken sayısı: {sonuc['n_var']:,}")
+            print(f"   📊 Integer değişken: {sonuc['n_int']:,}")
+            print(f"   📊 Kısıt sayısı: {sonuc['n_row']:,} | Sıfır olmayan katsayı: {sonuc['nnz']:,}")
+            print(f"   ⏱️  Tahmini süre: {estimated_time:.1f} saniye")
+
+        if not sonuc['ok']:
+            if verbose:
+                print("   ⏱️  Aşamalar: " + " | ".join(f"{k}: {v:.2f}s" for k, v in sureler.items()))
+            return {
+                'status': 'failed',
+                'solve_time': sonuc['sureler']['cozum'],
+                'estimated_time': estimated_time,
+                'phase_times': sureler,
+                'nonzeros': sonuc['nnz'],
+                'solver_status': sonuc['status']
+            }
+
+        t0 = time.perf_counter()
+        degerler = sonuc['values']
+        indeksler = sonuc['indeksler']
+        x_arc = np.zeros(instance.n_arc)
+        x_arc[aktif] = degerler[indeksler['x']]
+        x_values = instance.array_to_plan(x_arc)
+        b_values = dict(zip(instance.urunler, degerler[indeksler['b']].tolist()))
+        uretim_maliyet = instance.production_cost(x_arc)
+        if 'y' in indeksler:
+            y = degerler[indeksler['y']].reshape(instance.n_urun, simulasyon_sayisi)
+            if self.tamsayi_dogrula and surekli_y:
+                self._report_integrality(y, verbose)
+            y_values = {(u, k): v for u, satir in zip(instance.urunler, y.tolist()) for k, v in enumerate(satir)}
+            toplam_gelir = float(instance.satis_fiyat @ y @ olasiliklar) * rapor_senaryo
+        else:
+            y_values = None
+            satis = expected_sales(instance.production_by_product(x_arc), talep_matrisi, olasiliklar)
+            toplam_gelir = float(satis @ instance.satis_fiyat) * rapor_senaryo
+        ortalama_kar = (toplam_gelir - uretim_maliyet) / rapor_senaryo
+        sureler['cikarim'] = time.perf_counter() - t0
+
+        if verbose:
+            print("   ⏱️  Aşamalar: " + " | ".join(f"{k}: {v:.2f}s" for k, v in sureler.items()))
+        return {
+            'status': 'success',
+            'solve_time': sonuc['sureler']['cozum'],
+            'estimated_time': estimated_time,
+            'phase_times': sureler,
+            'profit': ortalama_kar,
+            'total_cost': uretim_maliyet,
+            'total_revenue': toplam_gelir,
+            'x_values': x_values,
+            'y_values': y_values,
+            'b_values': b_values,
+            'nonzeros': sonuc['nnz'],
+            'solver_status': sonuc['status']
+        }
+    
+    @staticmethod
+    def _report_integrality(y_degerleri, verbose):
+        """Sürekli tanımlanan satışların tam sayılığını denetle ve raporla"""
+        ihlal, sapma = integrality_violations(y_degerleri)
+        if ihlal:
+            print(f"   ⚠️ Tam sayı olmayan satış: {ihlal:,} değişken (en büyük sapma {sapma:.2e})")
+        elif verbose:
+            print(f"   ✔️ Satışlar tam sayı (en büyük sapma {sapma:.2e})")
+        return ihlal
+    
+    def _add_compact_recourse(self, solver, objective, data, uretim_terimleri, talep_matrisi, olasiliklar):
+        """Beklenen satış geliri, ürün başına toplam üretimin içbükey parçalı doğrusal fonksiyonu
+
+        segment: her kırılma aralığı için [0, uzunluk] sürekli değişken, toplamı <= üretim.
+        epigraf: ürün başına tek satış değişkeni; parça doğruları kesme olarak yalnızca
+        ihlal edildikçe eklenir (bkz. recourse.add_violated_cuts), döndürülen havuzda tutulur.
+        Model boyutu O(N x K) yerine O(N x farklı talep değeri) (segment) ya da
+        O(N x etkin kesme) (epigraf) olur.
+        """
+        kesme_havuzu = []
+        for i, u in enumerate(data['urunler']):
+            x_u = uretim_terimleri[u]
+            kirilma, uzunluk, egim = revenue_segments(talep_matrisi[:, i], olasiliklar)
+            fiyat = data['satis_fiyat'][u]
+            if self.formulasyon == 'segment':
+                ct = solver.Constraint(-solver.infinity(), 0)
+                for t, (L, e) in enumerate(zip(uzunluk.tolist(), egim.tolist())):
+                    s = solver.NumVar(0, L, f"s_{u}_{t}")
+                    ct.SetCoefficient(s, 1)
+                    objective.SetCoefficient(s, fiyat * e)
+                for var in x_u:
+                    ct.SetCoefficient(var, -1)
+            elif self.formulasyon == 'epigraf':
+                theta = solver.NumVar(0, solver.infinity(), f"satis_{u}")
+                objective.SetCoefficient(theta, fiyat)
+                kesme = CutPool(theta, x_u, *expected_sales_cuts(kirilma, uzunluk, egim))
+                kesme.add_initial(solver)
+                kesme_havuzu.append(kesme)
+            else:
+                raise ValueError(f"Bilinmeyen formülasyon: {self.formulasyon} (seçenekler: {', '.join(FORMULASYONLAR)})")
+        return kesme_havuzu
+    
     def run_single_test(self, file_path, simulasyon_sayisi, seed, verbose=True):
         """Tek bir test çalıştır"""
         if verbose:
@@ -182,25 +427,56 @@ class OptimizationTester:
         if data is None:
             return None
         
+        copula = None
+        if self.korelasyon:
+            copula = self.load_copula(file_path)
+            if verbose:
+                print(f"   🔗 Kopula: {copula.rank} faktör | Geçmişi olan ürün: "
+                      f"{copula.kapsam(data['urunler'])}/{len(data['urunler'])}")
+        
+        bootstrap = None
+        if self.bootstrap:
+            bootstrap = self.load_bootstrap(file_path)
+            if verbose:
+                print(f"   🔁 Bootstrap: {bootstrap.donem_sayisi} dönem | Geçmişi olan ürün: "
+                      f"{bootstrap.kapsam(data['urunler'])}/{len(data['urunler'])}")
+        
         # Senaryoları oluştur
         sales_scenarios = self.generate_scenarios(
             data['urunler'], 
             data['urun_param_dict'], 
             simulasyon_sayisi, 
-            seed
+            seed,
+            copula=copula,
+            bootstrap=bootstrap
         )
         
         # Senaryoları kaydet
         scenario_key = f"{os.path.basename(file_path)}_{simulasyon_sayisi}_{seed}"
-        self.all_scenarios[scenario_key] = sales_scenarios
+        self.all_scenarios[scenario_key] = (data['urunler'], sales_scenarios)
+        
+        # İsteğe bağlı senaryo indirgeme (K -> M ağırlıklı temsilci)
+        olasiliklar = None
+        model_senaryo = simulasyon_sayisi
+        wasserstein = 0.0
+        if self.reduce_to and self.reduce_to < simulasyon_sayisi:
+            sales_scenarios, olasiliklar, wasserstein = reduce_scenarios(
+                sales_scenarios, self.reduce_to, method=self.reduction, seed=seed)
+            model_senaryo = len(olasiliklar)
+            if verbose:
+                print(f"   ✂️  Senaryo indirgeme ({self.reduction}): {simulasyon_sayisi} -> {model_senaryo} | "
+                      f"Wasserstein: {wasserstein:,.2f}")
         
         # Optimizasyonu çöz
-        result = self.solve_optimization(data, sales_scenarios, simulasyon_sayisi, verbose)
+        result = self.solve_optimization(data, sales_scenarios, model_senaryo, verbose, olasiliklar,
+                                         rapor_senaryo=simulasyon_sayisi)
         
         if result:
             result.update({
                 'file': os.path.basename(file_path),
                 'scenario_count': simulasyon_sayisi,
+                'model_scenario_count': model_senaryo,
+                'wasserstein': wasserstein,
                 'seed': seed,
                 'product_count': len(data['urunler']),
                 'producer_count': len(data['ureticiler'])
@@ -290,10 +566,10 @@ class OptimizationTester:
         with open(scenarios_file, 'w', encoding='utf-8') as f:
             # JSON serializable hale getir
             serializable_scenarios = {}
-            for key, scenarios in self.all_scenarios.items():
+            for key, (urunler, scenarios) in self.all_scenarios.items():
                 serializable_scenarios[key] = {
-                    product: [float(val) for val in values] 
-                    for product, values in scenarios.items()
+                    product: scenarios[:, i].tolist()
+                    for i, product in enumerate(urunler)
                 }
             json.dump(serializable_scenarios, f, indent=2, ensure_ascii=False)
         print(f"📝 Senaryolar kaydedildi: {scenarios_file}")
@@ -1,12 +1,12 @@
 import pandas as pd
-import numpy as np
 import time
 from ortools.linear_solver import pywraplp
 from tqdm import tqdm
+from scenarios import demand_matrix_from_params
 
 # Parametreler
 SIMULASYON_SAYISI = 1000
-np.random.seed(4)
+SEED = 4
 
 # Excel'den veri okuma
 file_path = "ORTEST.xlsx"
@@ -22,17 +22,16 @@ ureticiler = list(set(urun_uretici_data['Üretici']))
 
 # Verileri sözlüklere çevirme
 satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
+urun_uretici_dict = dict(zip(zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']), urun_uretici_data['Birim Maliyet']))
+urun_param_dict = {u: {"ortalama": m, "std": s} for u, m, s in zip(urun_param_df["Ürün"], urun_param_df["Ortalama"], urun_param_df["STD"])}
 uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
 uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
 
 # Talep senaryoları üret
-sales_scenarios = {
-    urun: [max(0, int(round(np.random.normal(p["ortalama"], p["std"]))))
-           for _ in range(SIMULASYON_SAYISI)]
-    for urun, p in urun_param_dict.items()
-}
+# Tam sayı talepler kesik, ayrıklaştırılmış normalden (sıfırda nokta kütlesi yok)
+talep_matrisi = demand_matrix_from_params(list(urun_param_dict), urun_param_dict, SIMULASYON_SAYISI,
+                                          seed=SEED, dagilim='tamsayi')
+sales_scenarios = dict(zip(urun_param_dict, talep_matrisi.T))
 
 # Optimizasyon modeli başlat
 start_time = time.time()
@@ -53,7 +52,12 @@ satilan = {
 
 # Satış kısıtları
 for urun in urunler:
-    toplam_uretim = sum(x[(urun, uretici)] for uretici in ureticiler if (urun, uretici) in x)
+    # Çok üreticili üründe toplam üretim tek değişkende; senaryo kısıtları tüm x toplamını tekrarlamaz
+    x_u = [x[(urun, uretici)] for uretici in ureticiler if (urun, uretici) in x]
+    toplam_uretim = sum(x_u)
+    if len(x_u) > 1:
+        toplam_uretim = solver.NumVar(0, solver.infinity(), f'uretim_{urun}')
+        solver.Add(toplam_uretim == sum(x_u))
     for s in range(SIMULASYON_SAYISI):
         solver.Add(satilan[(urun, s)] <= toplam_uretim)
         solver.Add(satilan[(urun, s)] <= sales_scenarios[urun][s])
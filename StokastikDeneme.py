@@ -22,14 +22,20 @@ sales_mean = sales_data.mean(axis=1)
 sales_stddev = sales_data.std(axis=1)
 
 # Ürün ve üretici maliyet verilerini sözlük olarak hazırla
-urun_uretici_dict = {
-    (row['Ürün'], row['Üretici']): row['Birim Maliyet']
-    for _, row in urun_uretici_data.iterrows()
-}
+urun_uretici_dict = dict(zip(
+    zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']),
+    urun_uretici_data['Birim Maliyet']
+))
 
 # Ürünlerin satış fiyatlarını hazırlama
 satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
 
+# Sınır ve kapasite sözlükleri (döngü içinde .loc araması yerine)
+urun_alt_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Alt Sınır']))
+urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
+uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
+uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
+
 # Solver ve değişkenler
 solver = pywraplp.Solver.CreateSolver('SCIP')
 
@@ -47,8 +53,8 @@ z = {uretici: solver.BoolVar(f'z_{uretici}') for uretici in uretici_kapasite_dat
 
 # Kısıtlar
 for urun in urunler:
-    urun_alt = urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Alt Sınır'].values[0]
-    urun_ust = urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Üst Sınır'].values[0]
+    urun_alt = urun_alt_kisit_dict[urun]
+    urun_ust = urun_ust_kisit_dict[urun]
     gecerli_uretici_ciftleri = [(urun, uretici) for uretici in uretici_kapasite_data['Üretici'].unique()]
     
     solver.Add(solver.Sum(x[(urun, uretici)] for urun, uretici in gecerli_uretici_ciftleri) >= urun_alt * y[urun])
@@ -61,8 +67,8 @@ solver.Add(solver.Sum(x[(urun, uretici)] * urun_uretici_dict.get((urun, uretici)
 # Üretici kapasite kısıtları
 for uretici in uretici_kapasite_data['Üretici'].unique():
     gecerli_urun_ciftleri = [(urun, uretici) for urun in urunler]
-    alt_kapasite = uretici_kapasite_data.loc[uretici_kapasite_data['Üretici'] == uretici, 'Alt Kapasite'].values[0]
-    ust_kapasite = uretici_kapasite_data.loc[uretici_kapasite_data['Üretici'] == uretici, 'Üst Kapasite'].values[0]
+    alt_kapasite = uretici_alt_kapasite_dict[uretici]
+    ust_kapasite = uretici_kapasite_dict[uretici]
     
     solver.Add(solver.Sum(x[(urun, uretici)] for urun, uretici in gecerli_urun_ciftleri) >= alt_kapasite * z[uretici])
     solver.Add(solver.Sum(x[(urun, uretici)] for urun, uretici in gecerli_urun_ciftleri) <= ust_kapasite * z[uretici])
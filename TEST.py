@@ -1,51 +1,34 @@
-import pandas as pd
 import numpy as np
 from ortools.linear_solver import pywraplp
+from instance_loader import load_data
+from scenarios import demand_matrix_from_params
+from recourse import integrality_violations, sales_bound
 import time
 import os
 from datetime import datetime
 import json
 
 class ORTEST50_Tester:
-    def __init__(self):
+    def __init__(self, surekli_satis=True, tamsayi_dogrula=True):
         self.results = []
         self.all_scenarios = {}
+        # surekli_satis=False iken y tam sayı değişken olarak kurulur (eski model);
+        # tamsayi_dogrula=True iken sürekli y'nin çözümde tam sayı olduğu denetlenir
+        self.surekli_satis = surekli_satis
+        self.tamsayi_dogrula = tamsayi_dogrula
         
     def load_data(self, file_path="ORTEST50_IP.xlsx"):
-        """Excel dosyasından verileri yükle"""
+        """Excel dosyasından verileri yükle (ayrıştırılmış veri önbellekten gelir)"""
         print(f"📁 Veri yükleniyor: {file_path}")
         
         try:
-            urun_kisit_data = pd.read_excel(file_path, sheet_name="Ürün - Kısıt")
-            urun_satis_data = pd.read_excel(file_path, sheet_name="Ürün - Fiyat")
-            urun_uretici_data = pd.read_excel(file_path, sheet_name="Ürün - Üretici")
-            uretici_kapasite_data = pd.read_excel(file_path, sheet_name="Üretici - Kapasite")
-            urun_param_df = pd.read_excel(file_path, sheet_name="Ürün - Param")
-            
-            # Veri yapıları
-            urunler = [u for u in urun_kisit_data['Ürün'] if u != "Toplam Maliyet"]
-            ureticiler = list(set(urun_uretici_data['Üretici']))
-            satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-            urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-            urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
-            uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
-            uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
-            urun_alt_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Alt Sınır']))
-            urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
+            data = load_data(file_path)
+            urunler = data['urunler']
+            ureticiler = data['ureticiler']
             
             print(f"✅ Veri yüklendi - Ürün: {len(urunler)}, Üretici: {len(ureticiler)}")
             
-            return {
-                'urunler': urunler,
-                'ureticiler': ureticiler,
-                'satis_fiyat': satis_fiyat,
-                'urun_uretici_dict': urun_uretici_dict,
-                'urun_param_dict': urun_param_dict,
-                'uretici_kapasite_dict': uretici_kapasite_dict,
-                'uretici_alt_kapasite_dict': uretici_alt_kapasite_dict,
-                'urun_alt_kisit_dict': urun_alt_kisit_dict,
-                'urun_ust_kisit_dict': urun_ust_kisit_dict
-            }
+            return data
         except Exception as e:
             print(f"❌ Veri yükleme hatası: {e}")
             return None
@@ -54,13 +37,8 @@ class ORTEST50_Tester:
         """Senaryoları oluştur"""
         print(f"🎲 Senaryolar oluşturuluyor - Sayı: {simulasyon_sayisi}, Seed: {seed}")
         
-        sales_scenarios = {urun: [] for urun in urunler}
-        np.random.seed(seed)
-        
-        for k in range(simulasyon_sayisi):
-            for urun in urunler:
-                talep = max(0, np.random.normal(urun_param_dict[urun]['ortalama'], urun_param_dict[urun]['std']))
-                sales_scenarios[urun].append(talep)
+        # K x N talep matrisi (satır = senaryo, sütun = ürün), tek vektörel çekiliş
+        sales_scenarios = demand_matrix_from_params(urunler, urun_param_dict, simulasyon_sayisi, seed=seed)
         
         print(f"✅ {simulasyon_sayisi} senaryo oluşturuldu")
         return sales_scenarios
@@ -75,11 +53,23 @@ class ORTEST50_Tester:
         x = {(u, j): solver.IntVar(0, solver.infinity(), f"x_{u}_{j}") 
              for u in data['urunler'] for j in data['ureticiler'] if (u, j) in data['urun_uretici_dict']}
         
-        y = {(u, k): solver.IntVar(0, solver.infinity(), f"y_{u}_{k}") 
+        # Satışlar taban(talep) ile sınırlı olduğundan en iyi y zaten tam sayıdır (bkz. recourse.sales_bound)
+        y_var = solver.NumVar if self.surekli_satis else solver.IntVar
+        y = {(u, k): y_var(0, solver.infinity(), f"y_{u}_{k}") 
              for u in data['urunler'] for k in range(simulasyon_sayisi)}
         
         b_vars = {u: solver.BoolVar(f"b_{u}") for u in data['urunler']}
         
+        # Ürün başına toplam üretim; senaryo kısıtları yalnızca bunu kullanır. Tek üreticili
+        # üründe x zaten toplamdır, değişken yalnızca çok kaynaklı ürünlerde x'lere bir kez bağlanır
+        uretim = {}
+        for u in data['urunler']:
+            x_u = [x[(u, j)] for j in data['ureticiler'] if (u, j) in x]
+            uretim[u] = sum(x_u)
+            if len(x_u) > 1:
+                uretim[u] = solver.NumVar(0, solver.infinity(), f"uretim_{u}")
+                solver.Add(uretim[u] == sum(x_u))
+        
         print(f"📊 Model istatistikleri:")
         print(f"   - Üretim değişkenleri (x): {len(x):,}")
         print(f"   - Satış değişkenleri (y): {len(y):,}")
@@ -103,18 +93,19 @@ class ORTEST50_Tester:
         
         # Ürün alt-üst sınır kısıtları
         for u in data['urunler']:
-            toplam_uretim = sum(x[(u, j)] for j in data['ureticiler'] if (u, j) in x)
+            toplam_uretim = uretim[u]
             alt = data['urun_alt_kisit_dict'][u]
             ust = data['urun_ust_kisit_dict'][u]
             solver.Add(toplam_uretim >= alt * b_vars[u])
             solver.Add(toplam_uretim <= ust * b_vars[u])
         
         # Satılabilir miktar kısıtları
-        for u in data['urunler']:
-            toplam_uretim = sum(x[(u, j)] for j in data['ureticiler'] if (u, j) in x)
+        for i, u in enumerate(data['urunler']):
+            toplam_uretim = uretim[u]
+            talep = sales_bound(sales_scenarios[:, i]).tolist()
             for k in range(simulasyon_sayisi):
                 solver.Add(y[(u, k)] <= toplam_uretim)
-                solver.Add(y[(u, k)] <= sales_scenarios[u][k])
+                solver.Add(y[(u, k)] <= talep[k])
         
         print(f"   - Toplam kısıt: {solver.NumConstraints():,}")
         
@@ -132,6 +123,9 @@ class ORTEST50_Tester:
             
             x_values = {k: v.solution_value() for k, v in x.items()}
             y_values = {k: v.solution_value() for k, v in y.items()}
+            if self.tamsayi_dogrula and self.surekli_satis:
+                ihlal, sapma = integrality_violations(list(y_values.values()))
+                print(f"{'⚠️' if ihlal else '✔️'} Tam sayı olmayan satış: {ihlal} (en büyük sapma {sapma:.2e})")
             b_values = {k: v.solution_value() for k, v in b_vars.items()}
             
             # Performans metrikleri
@@ -206,7 +200,7 @@ class ORTEST50_Tester:
                 
                 # Senaryoları kaydet
                 scenario_key = f"ORTEST50_{scenario_count}_{seed}"
-                self.all_scenarios[scenario_key] = sales_scenarios
+                self.all_scenarios[scenario_key] = (data['urunler'], sales_scenarios)
                 
                 # Optimizasyonu çöz
                 result = self.solve_optimization(data, sales_scenarios, scenario_count)
@@ -242,10 +236,10 @@ class ORTEST50_Tester:
         with open(scenarios_file, 'w', encoding='utf-8') as f:
             # JSON serializable hale getir
             serializable_scenarios = {}
-            for key, scenarios in self.all_scenarios.items():
+            for key, (urunler, scenarios) in self.all_scenarios.items():
                 serializable_scenarios[key] = {
-                    product: [float(val) for val in values] 
-                    for product, values in scenarios.items()
+                    product: scenarios[:, i].tolist()
+                    for i, product in enumerate(urunler)
                 }
             json.dump(serializable_scenarios, f, indent=2, ensure_ascii=False)
         print(f"   ✅ Senaryolar: {scenarios_file}")
@@ -18,8 +18,8 @@ urun_param_df = pd.read_excel(file_path, sheet_name="Ürün - Param")
 urunler = [u for u in urun_kisit_data['Ürün'] if u != "Toplam Maliyet"]
 ureticiler = list(set(urun_uretici_data['Üretici']))
 satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
+urun_uretici_dict = dict(zip(zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']), urun_uretici_data['Birim Maliyet']))
+urun_param_dict = {u: {"ortalama": m, "std": s} for u, m, s in zip(urun_param_df["Ürün"], urun_param_df["Ortalama"], urun_param_df["STD"])}
 uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
 uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
 
@@ -91,8 +91,13 @@ print("\n=== Kısıtlar Oluşturuluyor ===")
 # 1. Satış kısıtları: her senaryo için satışlar üretim ve talebi aşamaz
 with tqdm(total=len(urunler), desc="Ürün-Senaryo Kısıtları") as progress_bar:
     for u in urunler:
-        # Her ürün için toplam üretim miktarı
-        toplam_uretim = sum(x[(u, j)] for j in ureticiler if (u, j) in x)
+        # Her ürün için toplam üretim miktarı: çok üreticili üründe x'lere bir kez bağlanan
+        # tek değişken, böylece her senaryo kısıtı |üretici| yerine 2 katsayı taşır
+        x_u = [x[(u, j)] for j in ureticiler if (u, j) in x]
+        toplam_uretim = sum(x_u)
+        if len(x_u) > 1:
+            toplam_uretim = solver.NumVar(0, solver.infinity(), f"uretim_{u}")
+            solver.Add(toplam_uretim == sum(x_u))
         
         # Her senaryo için satış kısıtları
         for k in range(SIMULASYON_SAYISI):
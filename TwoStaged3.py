@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from scenarios import demand_matrix_from_params
 from ortools.linear_solver import pywraplp
 
 # === Parametreler ===
@@ -18,18 +19,16 @@ urun_param_df = pd.read_excel(file_path, sheet_name="Ürün - Param")
 urunler = [u for u in urun_kisit_data['Ürün'] if u != "Toplam Maliyet"]
 ureticiler = list(set(urun_uretici_data['Üretici']))
 satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
+urun_uretici_dict = dict(zip(zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']), urun_uretici_data['Birim Maliyet']))
+urun_param_dict = {u: {"ortalama": m, "std": s} for u, m, s in zip(urun_param_df["Ürün"], urun_param_df["Ortalama"], urun_param_df["STD"])}
 uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
 uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
 
 # === 1. AŞAMA: Senaryoları oluştur ===
-sales_scenarios = {urun: [] for urun in urunler}
-for k in range(SIMULASYON_SAYISI):
-    np.random.seed(1000 + k)
-    for urun in urunler:
-        talep = max(0, np.random.normal(urun_param_dict[urun]['ortalama'], urun_param_dict[urun]['std']))
-        sales_scenarios[urun].append(talep)
+# K x N talep matrisi; senaryo k kendi SeedSequence akışından üretilir, ürün bazlı erişim sütun görünümleridir
+talep_matrisi = demand_matrix_from_params(urunler, urun_param_dict, SIMULASYON_SAYISI, seed=1000,
+                                          per_scenario=True)
+sales_scenarios = dict(zip(urunler, talep_matrisi.T))
 
 # === 2. AŞAMA: Senaryoları göz önünde bulundurarak optimal üretim kararlarını bul ===
 solver = pywraplp.Solver.CreateSolver('SCIP')
@@ -1,10 +1,12 @@
 import pandas as pd
-import numpy as np
+from scenarios import demand_matrix_from_params
+from recourse import integrality_violations, sales_bound
 from ortools.linear_solver import pywraplp
 from tqdm import tqdm
 
 # === Parametreler ===
 SIMULASYON_SAYISI = 500  # Belirli sayıda senaryo
+TAMSAYI_DOGRULA = True   # Sürekli satışların çözümden sonra tam sayı olduğunu denetle
 
 
 # === Excel'den veri okuma ===
@@ -19,32 +21,31 @@ urun_param_df = pd.read_excel(file_path, sheet_name="Ürün - Param")
 urunler = [u for u in urun_kisit_data['Ürün'] if u != "Toplam Maliyet"]
 ureticiler = list(set(urun_uretici_data['Üretici']))
 satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
+urun_uretici_dict = dict(zip(zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']), urun_uretici_data['Birim Maliyet']))
+urun_param_dict = {u: {"ortalama": m, "std": s} for u, m, s in zip(urun_param_df["Ürün"], urun_param_df["Ortalama"], urun_param_df["STD"])}
 uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
 uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
 urun_alt_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Alt Sınır']))
 urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
 
 # === 1. AŞAMA: Senaryoları oluştur ===
-sales_scenarios = {urun: [] for urun in urunler}
-for k in range(SIMULASYON_SAYISI):
-    np.random.seed(1300 + k)
-    for urun in urunler:
-        talep = max(0, np.random.normal(urun_param_dict[urun]['ortalama'], urun_param_dict[urun]['std']))
-        sales_scenarios[urun].append(talep)
+# K x N talep matrisi; senaryo k kendi SeedSequence akışından üretilir, ürün bazlı erişim sütun görünümleridir
+talep_matrisi = demand_matrix_from_params(urunler, urun_param_dict, SIMULASYON_SAYISI, seed=1300,
+                                          per_scenario=True)
+sales_scenarios = dict(zip(urunler, talep_matrisi.T))
 
 # === 2. AŞAMA: Karar değişkenlerini senaryo bazlı oluştur ve çöz ===
 solver = pywraplp.Solver.CreateSolver('SCIP')
 
-# TÜM DEĞİŞKENLER INTEGER YAPILDI
 # Üretim değişkenleri (integer)
 x = {(u, j): solver.IntVar(0, solver.infinity(), f"x_{u}_{j}") 
      for u in urunler for j in ureticiler if (u, j) in urun_uretici_dict}
 
-# Satış değişkenleri (integer)
-y = {(u, k): solver.IntVar(0, solver.infinity(), f"y_{u}_{k}") 
+# Satış değişkenleri (sürekli): y <= üretim, y <= taban(talep) LP'si tamamen unimodüler,
+# x tam sayı olduğundan en iyi y zaten tam sayıdır (bkz. recourse.sales_bound)
+y = {(u, k): solver.NumVar(0, solver.infinity(), f"y_{u}_{k}") 
      for u in urunler for k in range(SIMULASYON_SAYISI)}
+talep_siniri = {u: sales_bound(sales_scenarios[u]).tolist() for u in urunler}
 
 # Boolean değişkenler (zaten integer - 0 veya 1)
 b_vars = {u: solver.BoolVar(f"b_{u}") for u in urunler}
@@ -76,19 +77,19 @@ for u in urunler:
     toplam_uretim = sum(x[(u, j)] for j in ureticiler if (u, j) in x)
     for k in range(SIMULASYON_SAYISI):
         solver.Add(y[(u, k)] <= toplam_uretim)
-        solver.Add(y[(u, k)] <= sales_scenarios[u][k])
+        solver.Add(y[(u, k)] <= talep_siniri[u][k])
 
 # Modeli çöz
-print("=== TÜM INTEGER MODEL ÇÖZÜMÜ ===")
-print("Model çözülüyor... (Tüm değişkenler integer olduğu için uzun sürebilir)")
+print("=== INTEGER ÜRETİM MODELİ ÇÖZÜMÜ ===")
+print("Model çözülüyor... (Satışlar sürekli, tam sayılık üretimden gelir)")
 print(f"Toplam değişken sayısı: {solver.NumVariables()}")
 print(f"Toplam kısıt sayısı: {solver.NumConstraints()}")
-print(f"Integer değişken sayısı: {len(x) + len(y)}")
+print(f"Integer değişken sayısı: {len(x)}")
 print(f"Boolean değişken sayısı: {len(b_vars)}")
 
 # Tahmini çözüm süresi hesaplama (Düzeltilmiş formül)
 total_vars = solver.NumVariables()
-integer_vars = len(x) + len(y)
+integer_vars = len(x)
 constraints = solver.NumConstraints()
 
 # Daha gerçekçi tahmini formül
@@ -247,6 +248,9 @@ print(f"{'='*70}")
 if status in [pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE]:
     x_values = {k: v.solution_value() for k, v in x.items()}
     y_values = {k: v.solution_value() for k, v in y.items()}
+    if TAMSAYI_DOGRULA:
+        ihlal, sapma = integrality_violations(list(y_values.values()))
+        print(f"{'⚠️' if ihlal else '✔️'} Tam sayı olmayan satış: {ihlal} (en büyük sapma {sapma:.2e})")
     b_values = {k: v.solution_value() for k, v in b_vars.items()}
 else:
     print("Çözüm bulunamadığı için sonuçlar gösterilemiyor.")
@@ -272,7 +276,7 @@ ortalama_eksik = toplam_eksik / SIMULASYON_SAYISI
 
 # === SONUÇLAR ===
 print("\n" + "="*50)
-print("SONUÇLAR - TÜM INTEGER MODEL")
+print("SONUÇLAR - INTEGER ÜRETİM MODELİ")
 print("="*50)
 
 print("\n=== ÜRÜN ÜRETİM KARARLARI ===")
@@ -302,7 +306,7 @@ for k in range(min(5, SIMULASYON_SAYISI)):
     senaryo_satis_toplam = 0
     for u in urunler:
         talep = int(sales_scenarios[u][k])
-        satis = int(y_values[(u, k)])
+        satis = int(round(y_values[(u, k)]))
         uretim = sum(int(x_values[(u, j)]) for j in ureticiler if (u, j) in x_values)
         
         if satis > 0 or talep > 0:
@@ -329,7 +333,7 @@ print(f"{'='*50}")
 print(f"Çözüm Süresi              : {end_time - start_time:>10.2f} saniye")
 print(f"Çözüm Kalitesi            : {'Optimal' if status == pywraplp.Solver.OPTIMAL else 'Uygun'}")
 print(f"Toplam Değişken Sayısı     : {solver.NumVariables():>10,}")
-print(f"Integer Değişken Sayısı    : {len(x) + len(y):>10,}")
+print(f"Integer Değişken Sayısı    : {len(x):>10,}")
 print(f"Boolean Değişken Sayısı    : {len(b_vars):>10,}")
 print(f"Toplam Kısıt Sayısı        : {solver.NumConstraints():>10,}")
 print(f"Senaryo Sayısı             : {SIMULASYON_SAYISI:>10,}") 
\ No newline at end of file
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class TightBounds:
+    """Model kurulmadan önce örnek dizilerinden türetilen sıkı sınırlar
+
+    uretim_ust (N): ürünün toplam üretimi için geçerli üst sınır. Maliyetler
+    negatif değilse, toplam üretimi max(tavan(en büyük talep), ürün alt sınırı,
+    ürünün üreticilerinin alt kapasiteleri toplamı) değerini aşan bir en iyi
+    çözüm, alt kapasiteleri bozmadan bir birim azaltılabilir; bu yüzden sınır
+    en iyi değeri kesmez. Ürün üst sınırıyla (urun_sinirlari=True) kırpılır.
+
+    x_ust (A): min(uretim_ust, üretici üst kapasitesi).
+
+    aktif (A): baskın olunan bağlantılar False. Aynı ürünün daha ucuz (ya da
+    eşit maliyetli) bir bağlantısı, kapasitesi hiçbir zaman bağlamayan bir
+    üreticiye gidiyorsa (üst kapasite >= bağlantı üst sınırları toplamı) ve
+    elenen bağlantının üreticisinin alt kapasitesi yoksa, elenen bağlantının
+    üretimi ucuz üreticiye kaydırılabilir.
+    """
+
+    def __init__(self, instance, demand, urun_sinirlari=True):
+        demand = np.asarray(demand, dtype=np.float64)
+        n = instance.n_urun
+        arc_alt = instance.uretici_alt_kapasite[instance.uretici_idx]
+        zorunlu = np.bincount(instance.arc_urun, weights=arc_alt, minlength=n)
+
+        urun_ust = instance.ust_sinir if urun_sinirlari else np.full(n, np.inf)
+        if len(demand) and np.all(instance.birim_maliyet >= 0):
+            talep_ust = np.ceil(demand.max(axis=0))
+            if urun_sinirlari:
+                talep_ust = np.maximum(talep_ust, instance.alt_sinir)
+            self.uretim_ust = np.minimum(urun_ust, np.maximum(talep_ust, zorunlu))
+        else:
+            self.uretim_ust = np.asarray(urun_ust, dtype=np.float64).copy()
+        self.x_ust = np.minimum(self.uretim_ust[instance.arc_urun],
+                                instance.uretici_ust_kapasite[instance.uretici_idx])
+
+        # Kapasitesi bağlamayan üreticiler ve ürün başına bunlara giden en ucuz bağlantı
+        yuk = np.bincount(instance.uretici_idx, weights=self.x_ust, minlength=instance.n_uretici)
+        serbest = (instance.uretici_ust_kapasite >= yuk)[instance.uretici_idx]
+        en_ucuz = np.full(n, np.inf)
+        np.minimum.at(en_ucuz, instance.arc_urun, np.where(serbest, instance.birim_maliyet, np.inf))
+        aday = np.flatnonzero(serbest & (instance.birim_maliyet == en_ucuz[instance.arc_urun]))
+        _, ilk = np.unique(instance.arc_urun[aday], return_index=True)
+        secilen = np.zeros(instance.n_arc, dtype=bool)
+        secilen[aday[ilk]] = True
+
+        self.aktif = secilen | (instance.birim_maliyet < en_ucuz[instance.arc_urun]) | (arc_alt > 0)
+        self.x_ust[~self.aktif] = 0.0
+        self.arc_keys = instance.arc_keys()
+        self.urunler = instance.urunler
+
+    @property
+    def elenen(self):
+        return int((~self.aktif).sum())
+
+    def arc_bounds(self):
+        """{(ürün, üretici): üst sınır}, yalnızca aktif bağlantılar"""
+        return {key: ub for key, ub, a in zip(self.arc_keys, self.x_ust.tolist(), self.aktif.tolist()) if a}
+
+    def product_bounds(self):
+        """{ürün: toplam üretim üst sınırı}"""
+        return dict(zip(self.urunler, self.uretim_ust.tolist()))
@@ -0,0 +1,117 @@
+import numpy as np
+
+from sales_history import iter_history
+
+HISTORY_SHEET = "Ürün - Adet"
+# Az dönemli geçmişte örnek korelasyonu gürültülüdür; birim matrise doğru büzülür
+DEFAULT_SHRINKAGE = 0.1
+
+
+def load_history(file_path, sheet_name=HISTORY_SHEET):
+    """Satış geçmişini (ürünler, N x T matris) olarak oku (parça parça, bkz. sales_history)
+
+    Başlık satırı kendiliğinden tanınır; ORTEST sayfası ("Ürün" başlıklı),
+    Test.csv ve başlıksız tek sayfalı "Ürün - Adet.xlsx" aynı şekilde okunur.
+    """
+    urunler, parcalar = [], []
+    for u, _, satislar in iter_history(file_path, sheet_name=sheet_name, header='auto'):
+        urunler.extend(u)
+        parcalar.append(satislar)
+    if not parcalar:
+        return [], np.empty((0, 0))
+    return urunler, np.vstack(parcalar)
+
+
+def normal_scores(satislar):
+    """Satır bazında sıralama -> standart normal skorlar (marjinalden bağımsız)
+
+    Eksik dönemler ürünün ortalamasıyla doldurulur; korelasyona katkısı olmaz.
+    """
+    from scipy.special import ndtri
+    from scipy.stats import rankdata
+    satislar = np.array(satislar, dtype=np.float64)
+    eksik = np.isnan(satislar)
+    ortalama = np.where(eksik, 0, satislar).sum(axis=1) / np.maximum((~eksik).sum(axis=1), 1)
+    satislar = np.where(eksik, ortalama[:, None], satislar)
+    t = satislar.shape[1]
+    return ndtri(rankdata(satislar, axis=1) / (t + 1))
+
+
+class CopulaModel:
+    """Gauss kopulası için düşük ranklı faktör modeli
+
+    Korelasyon R = F F' + diag(d) olarak tutulur (F: N x r yükler, d: özgül
+    varyans). N x N matris hiç kurulmaz; bellek O(N r), K senaryo üretimi
+    O(K N r). Geçmiş dönem sayısı T iken örnek korelasyonunun rankı en fazla
+    T - 1 olduğundan r = T - 1 faktör büzülmüş korelasyonu birebir verir
+    (tam Cholesky'ye gerek kalmaz); rank verilirse ilk r bileşen tutulur.
+    """
+
+    def __init__(self, urunler, faktor, ozgul):
+        self.urunler = list(urunler)
+        self.faktor = np.ascontiguousarray(faktor, dtype=np.float64)
+        self.ozgul = np.ascontiguousarray(ozgul, dtype=np.float64)
+        self._index = {u: i for i, u in enumerate(self.urunler)}
+
+    @classmethod
+    def fit(cls, urunler, satislar, rank=None, shrinkage=DEFAULT_SHRINKAGE):
+        """N x T satış geçmişinden faktör modelini kestir"""
+        z = normal_scores(satislar)
+        z -= z.mean(axis=1, keepdims=True)
+        norm = np.linalg.norm(z, axis=1, keepdims=True)
+        # Sabit satışlı ürünlerin yükü sıfır kalır (bağımsız)
+        z = np.divide(z, norm, out=np.zeros_like(z), where=norm > 0)
+        u, s, _ = np.linalg.svd(z, full_matrices=False)
+        r = int(np.sum(s > 1e-10 * max(s.max(initial=0), 1)))
+        if rank is not None:
+            r = min(r, rank)
+        faktor = u[:, :r] * (s[:r] * np.sqrt(1 - shrinkage))
+        ozgul = np.clip(1 - np.einsum('ij,ij->i', faktor, faktor), shrinkage, 1)
+        return cls(urunler, faktor, ozgul)
+
+    @classmethod
+    def from_file(cls, file_path, sheet_name=HISTORY_SHEET, rank=None, shrinkage=DEFAULT_SHRINKAGE):
+        urunler, satislar = load_history(file_path, sheet_name)
+        return cls.fit(urunler, satislar, rank=rank, shrinkage=shrinkage)
+
+    @property
+    def rank(self):
+        return self.faktor.shape[1]
+
+    def kapsam(self, urunler):
+        """Geçmişi (korelasyon bilgisi) olan ürün sayısı"""
+        return sum(u in self._index for u in urunler)
+
+    def subset(self, urunler):
+        """Verilen ürün sırasına göre model; geçmişi olmayan ürünler bağımsız kalır"""
+        idx = np.array([self._index.get(u, -1) for u in urunler], dtype=np.int64)
+        var = idx >= 0
+        faktor = np.zeros((len(urunler), self.rank))
+        faktor[var] = self.faktor[idx[var]]
+        ozgul = np.ones(len(urunler))
+        ozgul[var] = self.ozgul[idx[var]]
+        return CopulaModel(urunler, faktor, ozgul)
+
+    def correlation(self):
+        """Tam N x N korelasyon matrisi (yalnızca küçük N'de kontrol için)"""
+        return self.faktor @ self.faktor.T + np.diag(self.ozgul)
+
+    def normals(self, simulasyon_sayisi, seed=None, sampler='mc'):
+        """K x N korelasyonlu standart normal matris: G = Z_f F' + Z_e sqrt(d)
+
+        Bağımsız normaller scenarios.uniform_matrix ile üretilir; böylece
+        LHS / Sobol / antitetik örnekleyiciler kopula ile birlikte kullanılabilir.
+        """
+        from scipy.special import ndtri
+        from scenarios import uniform_matrix
+        n, r = self.faktor.shape
+        u = uniform_matrix(sampler, simulasyon_sayisi, r + n, seed)
+        z = ndtri(np.clip(u, 1e-12, 1 - 1e-12))
+        g = z[:, r:] * np.sqrt(self.ozgul)
+        g += z[:, :r] @ self.faktor.T
+        return g
+
+    def uniforms(self, simulasyon_sayisi, seed=None, sampler='mc'):
+        """K x N kopula örneği (düzgün marjinaller); herhangi bir ppf ile talebe çevrilir"""
+        from scipy.special import ndtr
+        return ndtr(self.normals(simulasyon_sayisi, seed, sampler))
@@ -0,0 +1,82 @@
+import argparse
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from SDP_IP_Excel import OptimizationTester
+
+
+def run_benchmark(files, scenario_counts=(25, 50, 100), seeds=(1300,), model_kurucu='pywraplp'):
+    """Toplam üretim değişkeniyle / değişkensiz modelin yoğunluk ve süre karşılaştırması
+
+    Aynı senaryolar iki modelde de çözülür; sıfır olmayan katsayı sayısı,
+    kurulum süresi (solve_optimization - Solve) ve çözüm süresi kaydedilir.
+    """
+    rows = []
+    for file_path in files:
+        testers = {mod: OptimizationTester(model_kurucu=model_kurucu, uretim_degiskeni=mod) for mod in (False, True)}
+        data = testers[False].load_data(file_path)
+        if data is None:
+            continue
+        print(f"\n📁 {os.path.basename(file_path)} | Ürün: {len(data['urunler'])} | "
+              f"Bağlantı: {len(data['urun_uretici_dict'])}")
+
+        for k in scenario_counts:
+            for seed in seeds:
+                scenarios = testers[False].generate_scenarios(data['urunler'], data['urun_param_dict'], k, seed)
+                for mod, tester in testers.items():
+                    t0 = time.perf_counter()
+                    result = tester.solve_optimization(data, scenarios, k, verbose=False)
+                    toplam = time.perf_counter() - t0
+                    rows.append({
+                        'file': os.path.basename(file_path),
+                        'scenario_count': k,
+                        'seed': seed,
+                        'uretim_degiskeni': mod,
+                        'nonzeros': result['nonzeros'],
+                        'build_time': toplam - result['solve_time'],
+                        'solve_time': result['solve_time'],
+                        'profit': result.get('profit'),
+                    })
+                    print(f"   K={k:<5} seed={seed:<5} {'toplu' if mod else 'açık ':<5} | "
+                          f"nnz: {result['nonzeros']:>10,} | kurulum: {toplam - result['solve_time']:6.2f}s | "
+                          f"çözüm: {result['solve_time']:7.2f}s | kar: {result.get('profit') or 0:,.2f}")
+    return pd.DataFrame(rows)
+
+
+def summarize(df):
+    """Dosya ve K bazında iki modelin yan yana ortalamaları ve oranları"""
+    ozet = (df.groupby(['file', 'scenario_count', 'uretim_degiskeni'])
+              [['nonzeros', 'build_time', 'solve_time']].mean()
+              .unstack('uretim_degiskeni'))
+    ozet.columns = [f"{ad}_{'toplu' if mod else 'acik'}" for ad, mod in ozet.columns]
+    for ad in ('nonzeros', 'build_time', 'solve_time'):
+        ozet[f'{ad}_oran'] = ozet[f'{ad}_toplu'] / ozet[f'{ad}_acik']
+    return ozet.reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplam üretim değişkeninin kısıt yoğunluğuna ve süreye etkisi")
+    parser.add_argument('files', nargs='*', default=["ORTEST100_IP.xlsx", "ORTEST200_IP.xlsx"])
+    parser.add_argument('--senaryo', type=int, nargs='+', default=[25, 50, 100])
+    parser.add_argument('--seed', type=int, nargs='+', default=[1300])
+    parser.add_argument('--matris', action='store_true', help="Matris kurucu ile (bkz. matrix_model.py)")
+    args = parser.parse_args()
+
+    start = time.time()
+    df = run_benchmark(args.files, args.senaryo, args.seed, 'matris' if args.matris else 'pywraplp')
+    if df.empty:
+        print("❌ Başarılı çözüm yok")
+        return
+    ozet = summarize(df)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_file = f"density_benchmark_{timestamp}.csv"
+    ozet.to_csv(out_file, index=False, encoding='utf-8-sig')
+    print(f"\n{ozet.to_string(index=False, float_format=lambda v: f'{v:,.2f}')}")
+    print(f"\n📊 Sonuçlar kaydedildi: {out_file} | Toplam süre: {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
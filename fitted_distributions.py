@@ -0,0 +1,125 @@
+import ast
+import warnings
+
+import numpy as np
+import pandas as pd
+
+FITTED_FILE = 'Uygun_Dagilimlar.xlsx'
+
+
+def load_fitted(file_path=FITTED_FILE):
+    """Dağılım_Bulma çıktısını oku: ürün -> (aile, parametreler, dönüşüm, min, max)
+
+    Uydurma normalize edilmiş veri üzerinde yapılır; "Dönüşüm" sütunu yoksa
+    (eski çıktılar) pozitif satış verisi için kullanılan log1p varsayılır.
+    Dağılımı belirlenemeyen ürünler ("-") atlanır; parametresi okunamayan
+    satırlar için uyarı verilir.
+    """
+    df = pd.read_excel(file_path)
+    if 'Dönüşüm' not in df.columns:
+        df['Dönüşüm'] = 'log1p'
+    for col in ('Min', 'Max'):
+        if col not in df.columns:
+            df[col] = np.nan
+
+    fitted = {}
+    okunamayan = []
+    for urun, aile, params, donusum, mn, mx in zip(df['Ürün'], df['En İyi Dağılım'], df['Parametreler'],
+                                                  df['Dönüşüm'], df['Min'], df['Max']):
+        if pd.isna(params) or str(params).strip() == '-':
+            continue
+        try:
+            params = tuple(float(v) for v in ast.literal_eval(str(params)))
+        except (ValueError, SyntaxError, TypeError):
+            okunamayan.append(urun)
+            continue
+        fitted[urun] = (aile, params, donusum, mn, mx)
+    if okunamayan:
+        warnings.warn(f"{file_path}: {len(okunamayan)} ürünün parametreleri okunamadı, bağımsız normal "
+                      f"kullanılacak: {', '.join(str(u) for u in okunamayan[:10])}", stacklevel=2)
+    return fitted
+
+
+def _inverse_transform(x, donusum, mn, mx):
+    """Normalize edilmiş ölçekten satış adedine dön (Dağılım_Bulma.normalize_data tersi)"""
+    minmax = donusum == 'minmax'
+    if not np.any(minmax):
+        return np.expm1(x)
+    return np.where(minmax, x * (mx - mn + 1e-9) + mn, np.expm1(np.where(minmax, 0, x)))
+
+
+def fitted_demand_matrix(urunler, fitted, simulasyon_sayisi, seed=None, urun_param_dict=None):
+    """Uydurulmuş dağılımlardan K x N talep matrisi
+
+    Ürünler dağılım ailesine göre gruplanır ve her aile tek bir vektörel
+    rvs çağrısıyla örneklenir (parametreler ürün ekseninde yayınlanır).
+    Uydurması olmayan ürünler urun_param_dict ile max(0, Normal) örneklenir.
+    """
+    rng = np.random.default_rng(seed)
+    demand = np.empty((simulasyon_sayisi, len(urunler)))
+    gruplar, eksik = _family_groups(urunler, fitted)
+
+    for (aile, _), cols in gruplar.items():
+        x = aile.rvs(*_group_params(urunler, fitted, cols), size=(simulasyon_sayisi, len(cols)), random_state=rng)
+        demand[:, cols] = _group_inverse(urunler, fitted, cols, x)
+
+    if eksik:
+        ortalama, std = _fallback_params(urunler, urun_param_dict, eksik)
+        demand[:, eksik] = rng.normal(ortalama, std, size=(simulasyon_sayisi, len(eksik)))
+
+    np.maximum(demand, 0, out=demand)
+    return demand
+
+
+def fitted_quantiles(urunler, fitted, u, urun_param_dict=None):
+    """K x N düzgün matristen (ör. kopula örneği) uydurulmuş marjinallerle talep
+
+    fitted_demand_matrix ile aynı gruplama; rvs yerine aile başına tek ppf çağrısı.
+    """
+    from scipy.special import ndtri
+    u = np.clip(u, 1e-12, 1 - 1e-12)
+    demand = np.empty(u.shape)
+    gruplar, eksik = _family_groups(urunler, fitted)
+
+    for (aile, _), cols in gruplar.items():
+        x = aile.ppf(u[:, cols], *_group_params(urunler, fitted, cols))
+        demand[:, cols] = _group_inverse(urunler, fitted, cols, x)
+
+    if eksik:
+        ortalama, std = _fallback_params(urunler, urun_param_dict, eksik)
+        demand[:, eksik] = ortalama + std * ndtri(u[:, eksik])
+
+    np.maximum(demand, 0, out=demand)
+    return demand
+
+
+def _family_groups(urunler, fitted):
+    """(scipy dağılımı, parametre sayısı) -> sütunlar; uydurması olmayan sütunlar ayrı"""
+    import scipy.stats as st
+    gruplar = {}
+    eksik = []
+    for i, u in enumerate(urunler):
+        if u in fitted:
+            aile, params = fitted[u][:2]
+            gruplar.setdefault((getattr(st, aile), len(params)), []).append(i)
+        else:
+            eksik.append(i)
+    return gruplar, eksik
+
+
+def _group_params(urunler, fitted, cols):
+    # parametre x ürün; her parametre ürün ekseninde yayınlanır
+    return np.array([fitted[urunler[i]][1] for i in cols]).T
+
+
+def _group_inverse(urunler, fitted, cols, x):
+    donusum, mn, mx = (np.array(v) for v in zip(*(fitted[urunler[i]][2:] for i in cols)))
+    return _inverse_transform(x, donusum, mn.astype(np.float64), mx.astype(np.float64))
+
+
+def _fallback_params(urunler, urun_param_dict, eksik):
+    if urun_param_dict is None:
+        raise ValueError(f"Uydurulmuş dağılımı olmayan ürünler: {', '.join(str(urunler[i]) for i in eksik[:10])}")
+    ortalama = np.array([urun_param_dict[urunler[i]]['ortalama'] for i in eksik], dtype=np.float64)
+    std = np.array([urun_param_dict[urunler[i]]['std'] for i in eksik], dtype=np.float64)
+    return ortalama, std
@@ -0,0 +1,90 @@
+import warnings
+
+import numpy as np
+
+from copula import HISTORY_SHEET, load_history
+
+
+class HistoryBootstrap:
+    """Geçmiş satışları yeniden örnekleyen senaryo üreteci
+
+    Her senaryo geçmişten rastgele seçilen bir dönemin tüm ürünlerdeki
+    satışlarıdır (SKU'lar arası blok); ürünler arası ilişki olduğu gibi
+    korunur. Geçmiş T x N bitişik tabloda tutulur; K x N matris tek bir
+    gelişmiş indeksleme ile üretilir: tablo[dönemler[:, None], sütunlar].
+
+    generate_scenarios arayüzü OptimizationTester / SAA / EEV ile aynıdır.
+    """
+
+    def __init__(self, urunler, satislar):
+        satislar = np.array(satislar, dtype=np.float64)
+        # Eksik dönemler ürünün geçmiş ortalamasıyla doldurulur
+        eksik = np.isnan(satislar)
+        ortalama = np.where(eksik, 0, satislar).sum(axis=1) / np.maximum((~eksik).sum(axis=1), 1)
+        satislar = np.where(eksik, ortalama[:, None], satislar)
+        self.urunler = list(urunler)
+        self.tablo = np.ascontiguousarray(satislar.T)  # dönem x ürün
+        self.gecmis_ortalama = ortalama
+        self._index = {u: i for i, u in enumerate(self.urunler)}
+        self._sutunlar = {}
+
+    @classmethod
+    def from_file(cls, file_path, sheet_name=HISTORY_SHEET):
+        """Excel sayfasından ya da ';' ayrılmış CSV'den (ör. Test.csv) geçmişi oku"""
+        urunler, satislar = load_history(file_path, sheet_name)
+        return cls(urunler, satislar)
+
+    @property
+    def donem_sayisi(self):
+        return self.tablo.shape[0]
+
+    def kapsam(self, urunler):
+        """Geçmişi olan ürün sayısı"""
+        return sum(u in self._index for u in urunler)
+
+    def index_table(self, urunler):
+        """Ürün sırası -> geçmiş tablo sütunu (geçmişi yoksa -1); ürün listesi başına bir kez"""
+        key = tuple(urunler)
+        if key not in self._sutunlar:
+            self._sutunlar[key] = np.array([self._index.get(u, -1) for u in urunler], dtype=np.int64)
+            eksik = [str(u) for u in urunler if u not in self._index]
+            if eksik:
+                # Ad uyuşmazlığı (ör. "Tshirt" / "T-shirt") sessizce parametrik talebe düşmesin
+                warnings.warn(f"Satış geçmişinde bulunmayan {len(eksik)} ürün parametrik (normal) marjinalle "
+                              f"örneklenecek: {', '.join(eksik[:10])}{' ...' if len(eksik) > 10 else ''}",
+                              stacklevel=3)
+        return self._sutunlar[key]
+
+    def demand_matrix(self, urunler, simulasyon_sayisi, seed=None, urun_param_dict=None, olcekle=False):
+        """K x N bootstrap talep matrisi
+
+        olcekle=True iken her ürünün geçmişi, ortalaması urun_param_dict
+        ortalamasına eşit olacak şekilde ölçeklenir (geçmiş dalgalanma oranı korunur).
+        Geçmişi olmayan ürünler urun_param_dict ile max(0, Normal) örneklenir.
+        """
+        rng = np.random.default_rng(seed)
+        sutunlar = self.index_table(urunler)
+        var = sutunlar >= 0
+        donemler = rng.integers(self.donem_sayisi, size=simulasyon_sayisi)
+
+        demand = np.empty((simulasyon_sayisi, len(urunler)))
+        demand[:, var] = self.tablo[donemler[:, None], sutunlar[var]]
+        if olcekle:
+            hedef = np.array([urun_param_dict[u]['ortalama'] for u, v in zip(urunler, var) if v])
+            gecmis = self.gecmis_ortalama[sutunlar[var]]
+            demand[:, var] *= np.divide(hedef, gecmis, out=np.ones_like(hedef), where=gecmis > 0)
+
+        if not var.all():
+            eksik = np.flatnonzero(~var)
+            if urun_param_dict is None:
+                raise ValueError(f"Satış geçmişi olmayan ürünler: {', '.join(str(urunler[i]) for i in eksik[:10])}")
+            ortalama = np.array([urun_param_dict[urunler[i]]['ortalama'] for i in eksik], dtype=np.float64)
+            std = np.array([urun_param_dict[urunler[i]]['std'] for i in eksik], dtype=np.float64)
+            demand[:, eksik] = rng.normal(ortalama, std, size=(simulasyon_sayisi, len(eksik)))
+
+        np.maximum(demand, 0, out=demand)
+        return demand
+
+    def generate_scenarios(self, urunler, urun_param_dict, simulasyon_sayisi, seed):
+        """OptimizationTester.generate_scenarios ile aynı imza (K x N matris)"""
+        return self.demand_matrix(urunler, simulasyon_sayisi, seed=seed, urun_param_dict=urun_param_dict)
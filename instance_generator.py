@@ -0,0 +1,145 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from instance_io import FORMAT_SUFFIX, save_columnar
+from instance_loader import (SHEET_FIYAT, SHEET_KAPASITE, SHEET_KISIT, SHEET_PARAM,
+                             SHEET_SATIS, SHEET_URETICI)
+from problem_instance import ProblemInstance
+
+# Varsayılan aralıklar ORTEST200_IP.xlsx dağılımlarına yakın seçilmiştir
+DEFAULTS = {
+    'yogunluk': 0.1,                      # ürün başına bağlı üretici oranı
+    'maliyet_araligi': (300.0, 3000.0),   # birim maliyet (düzgün)
+    'fiyat_carpani': (0.4, 1.6),          # satış fiyatı = ortalama maliyet x çarpan
+    'talep_ortalama': (2500.0, 11000.0),  # talep ortalaması (düzgün)
+    'talep_cv': (0.1, 0.3),               # STD / ortalama
+    'kapasite_sikiligi': 0.6,             # toplam beklenen talep / toplam üst kapasite
+    'butce_orani': 0.8,                   # bütçe / (beklenen talep x ortalama maliyet)
+}
+
+
+def generate_instance(n_urun, n_uretici, seed=0, yogunluk=None, maliyet_araligi=None,
+                      fiyat_carpani=None, talep_ortalama=None, talep_cv=None,
+                      kapasite_sikiligi=None, butce_orani=None, satis=True):
+    """Tohumlu sentetik ProblemInstance üret
+
+    Her ürün en az bir üreticiye bağlanır; kapasite_sikiligi büyüdükçe
+    üretici kapasiteleri daralır. satis=True iken greedy için
+    "Ürün - Satış" olasılıkları da üretilir.
+    """
+    p = {k: (v if v is not None else DEFAULTS[k]) for k, v in [
+        ('yogunluk', yogunluk), ('maliyet_araligi', maliyet_araligi),
+        ('fiyat_carpani', fiyat_carpani), ('talep_ortalama', talep_ortalama),
+        ('talep_cv', talep_cv), ('kapasite_sikiligi', kapasite_sikiligi),
+        ('butce_orani', butce_orani)]}
+    if not 0 < p['yogunluk'] <= 1:
+        raise ValueError(f"yogunluk (0, 1] aralığında olmalı: {p['yogunluk']}")
+    rng = np.random.default_rng(seed)
+
+    urunler = [f"U{i:05d}" for i in range(n_urun)]
+    ureticiler = [f"Üretici {j:04d}" for j in range(n_uretici)]
+
+    # Bağlantılar: ürün başına Binomial sayıda üretici (en az 1), tekrarsız
+    derece = np.clip(rng.binomial(n_uretici, p['yogunluk'], size=n_urun), 1, n_uretici)
+    indptr = np.zeros(n_urun + 1, dtype=np.int64)
+    np.cumsum(derece, out=indptr[1:])
+    uretici_idx = np.empty(indptr[-1], dtype=np.int64)
+    for i in range(n_urun):
+        uretici_idx[indptr[i]:indptr[i + 1]] = np.sort(
+            rng.choice(n_uretici, size=derece[i], replace=False))
+    birim_maliyet = np.round(rng.uniform(*p['maliyet_araligi'], size=len(uretici_idx)))
+
+    # Ürün vektörleri
+    arc_urun = np.repeat(np.arange(n_urun), derece)
+    ort_maliyet = np.bincount(arc_urun, weights=birim_maliyet, minlength=n_urun) / derece
+    satis_fiyat = np.round(ort_maliyet * rng.uniform(*p['fiyat_carpani'], size=n_urun))
+    ortalama = np.round(rng.uniform(*p['talep_ortalama'], size=n_urun))
+    std = np.round(ortalama * rng.uniform(*p['talep_cv'], size=n_urun))
+    alt_sinir = np.round(ortalama * rng.uniform(0.1, 0.8, size=n_urun))
+    ust_sinir = np.round(ortalama * rng.uniform(1.1, 1.6, size=n_urun))
+
+    # Üretici kapasiteleri: beklenen toplam talep, sıkılık oranına göre paylaştırılır
+    pay = rng.dirichlet(np.full(n_uretici, 2.0))
+    uretici_ust = np.ceil(pay * ortalama.sum() / p['kapasite_sikiligi'])
+    uretici_alt = np.floor(uretici_ust * rng.uniform(0.01, 0.05, size=n_uretici))
+
+    toplam_maliyet = float(np.round(p['butce_orani'] * np.dot(ortalama, ort_maliyet)))
+    satis_olasiligi = rng.uniform(0.3, 0.9, size=n_urun) if satis else None
+
+    return ProblemInstance(
+        urunler, ureticiler, indptr, uretici_idx, birim_maliyet,
+        satis_fiyat, ortalama, std, alt_sinir, ust_sinir, uretici_ust, uretici_alt,
+        toplam_maliyet=toplam_maliyet, satis_olasiligi=satis_olasiligi)
+
+
+def write_excel(instance, file_path):
+    """Örneği load_data'nın beklediği çalışma kitabı düzeninde yaz"""
+    urunler = instance.urunler
+    kisit = pd.DataFrame({
+        'Ürün': urunler + ["Toplam Maliyet"],
+        'Üretim Alt Sınır': np.append(instance.alt_sinir, np.nan),
+        'Üretim Üst Sınır': np.append(instance.ust_sinir, np.nan),
+        'Maliyet': np.append(np.full(instance.n_urun, np.nan), instance.toplam_maliyet),
+    })
+    keys = instance.arc_keys()
+    sheets = {
+        SHEET_KISIT: kisit,
+        SHEET_URETICI: pd.DataFrame({'Ürün': [k[0] for k in keys],
+                                     'Üretici': [k[1] for k in keys],
+                                     'Birim Maliyet': instance.birim_maliyet}),
+        SHEET_KAPASITE: pd.DataFrame({'Üretici': instance.ureticiler,
+                                      'Alt Kapasite': instance.uretici_alt_kapasite,
+                                      'Üst Kapasite': instance.uretici_ust_kapasite}),
+        SHEET_FIYAT: pd.DataFrame({'Ürün': urunler, 'Satış Fiyatı': instance.satis_fiyat}),
+        SHEET_PARAM: pd.DataFrame({'Ürün': urunler, 'Ortalama': instance.talep_ortalama,
+                                   'STD': instance.talep_std}),
+    }
+    if instance.satis_olasiligi is not None:
+        # Beş geçmiş sütununun ortalaması satış olasılığını verir
+        satis = pd.DataFrame({'Ürün': urunler})
+        for k in range(5):
+            satis[f"Y{k}"] = instance.satis_olasiligi
+        satis['Satış Fiyatı'] = instance.satis_fiyat
+        sheets[SHEET_SATIS] = satis
+
+    with pd.ExcelWriter(file_path) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return file_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ölçek testleri için sentetik örnek üret")
+    parser.add_argument('--urun', type=int, default=2000, help="Ürün sayısı")
+    parser.add_argument('--uretici', type=int, default=200, help="Üretici sayısı")
+    parser.add_argument('--yogunluk', type=float, default=DEFAULTS['yogunluk'])
+    parser.add_argument('--maliyet', type=float, nargs=2, default=DEFAULTS['maliyet_araligi'])
+    parser.add_argument('--fiyat-carpani', type=float, nargs=2, default=DEFAULTS['fiyat_carpani'])
+    parser.add_argument('--talep', type=float, nargs=2, default=DEFAULTS['talep_ortalama'])
+    parser.add_argument('--talep-cv', type=float, nargs=2, default=DEFAULTS['talep_cv'])
+    parser.add_argument('--kapasite-sikiligi', type=float, default=DEFAULTS['kapasite_sikiligi'])
+    parser.add_argument('--butce-orani', type=float, default=DEFAULTS['butce_orani'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help=f"Çıktı yolu (.xlsx veya {FORMAT_SUFFIX})")
+    args = parser.parse_args()
+
+    out_path = args.output or f"SYN{args.urun}_{args.uretici}_s{args.seed}{FORMAT_SUFFIX}"
+    start = time.time()
+    instance = generate_instance(
+        args.urun, args.uretici, seed=args.seed, yogunluk=args.yogunluk,
+        maliyet_araligi=tuple(args.maliyet), fiyat_carpani=tuple(args.fiyat_carpani),
+        talep_ortalama=tuple(args.talep), talep_cv=tuple(args.talep_cv),
+        kapasite_sikiligi=args.kapasite_sikiligi, butce_orani=args.butce_orani)
+    if os.path.splitext(out_path)[1].lower() == '.xlsx':
+        write_excel(instance, out_path)
+    else:
+        save_columnar(instance, out_path)
+    print(f"✅ {out_path} | {instance} | Süre: {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
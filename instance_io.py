@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from problem_instance import ProblemInstance
+
+# Sütunlu örnek biçimi: <ad>.ortest/ dizini içinde meta.json + her dizi için bir .npy
+# .npy dosyaları np.load(mmap_mode='r') ile kopyalanmadan belleğe eşlenebilir.
+FORMAT_SUFFIX = ".ortest"
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+
+ARRAY_FIELDS = [
+    'indptr', 'uretici_idx', 'birim_maliyet',
+    'satis_fiyat', 'talep_ortalama', 'talep_std', 'alt_sinir', 'ust_sinir',
+    'uretici_ust_kapasite', 'uretici_alt_kapasite',
+]
+OPTIONAL_ARRAY_FIELDS = ['satis_olasiligi']
+
+
+def is_columnar(path):
+    """Yol sütunlu örnek dizini mi?"""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+
+def default_output_path(xlsx_path):
+    """ORTEST200_IP.xlsx -> ORTEST200_IP.ortest"""
+    return os.path.splitext(xlsx_path)[0] + FORMAT_SUFFIX
+
+
+def save_columnar(instance, out_path):
+    """ProblemInstance'ı sütunlu biçimde diske yaz"""
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+
+    arrays = []
+    for name in ARRAY_FIELDS + OPTIONAL_ARRAY_FIELDS:
+        arr = getattr(instance, name)
+        if arr is None:
+            continue
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(arr))
+        arrays.append(name)
+
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'urunler': list(instance.urunler),
+        'ureticiler': list(instance.ureticiler),
+        'toplam_maliyet': instance.toplam_maliyet,
+        'arrays': arrays,
+    }
+    with open(os.path.join(tmp_path, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    # Var olan çıktıyı yenisiyle değiştir
+    if os.path.exists(out_path):
+        shutil.rmtree(out_path)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def load_columnar(path, mmap=True):
+    """Sütunlu örneği yükle; mmap=True iken diziler salt okunur eşlenir"""
+    with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Desteklenmeyen biçim sürümü: {meta.get('format_version')} ({path})")
+
+    mmap_mode = 'r' if mmap else None
+    arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+              for name in meta['arrays']}
+
+    return ProblemInstance(
+        meta['urunler'], meta['ureticiler'],
+        toplam_maliyet=meta.get('toplam_maliyet'),
+        satis_olasiligi=arrays.get('satis_olasiligi'),
+        **{name: arrays[name] for name in ARRAY_FIELDS})
+
+
+def convert_excel(xlsx_path, out_path=None, validate=True):
+    """5 sayfalı Excel çalışma kitabını sütunlu biçime dönüştür"""
+    from instance_loader import read_excel_instance
+    instance = read_excel_instance(xlsx_path, validate=validate)
+    return save_columnar(instance, out_path or default_output_path(xlsx_path))
+
+
+def open_instance(path, mmap=True, lazy=False):
+    """Biçimden bağımsız örnek açıcı (sütunlu dizin veya Excel)
+
+    lazy=True iken Excel sayfaları yalnızca ilgili alan ilk kullanıldığında
+    okunur (LazyInstance); sütunlu dizinler zaten mmap ile tembel açılır.
+    """
+    if is_columnar(path):
+        return load_columnar(path, mmap=mmap)
+    if lazy:
+        from instance_loader import LazyInstance
+        return LazyInstance(path)
+    from instance_loader import load_instance
+    return load_instance(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel örneklerini sütunlu biçime dönüştür")
+    parser.add_argument('files', nargs='+', help="Dönüştürülecek .xlsx dosyaları")
+    parser.add_argument('-o', '--output', help="Çıktı dizini (tek dosya için)")
+    parser.add_argument('--no-validate', action='store_true', help="Veri doğrulamasını atla")
+    args = parser.parse_args()
+
+    if args.output and len(args.files) > 1:
+        parser.error("--output yalnızca tek dosya ile kullanılabilir")
+
+    for xlsx_path in args.files:
+        start = time.time()
+        out_path = convert_excel(xlsx_path, args.output, validate=not args.no_validate)
+        convert_time = time.time() - start
+
+        start = time.time()
+        instance = load_columnar(out_path)
+        load_time = time.time() - start
+        print(f"✅ {xlsx_path} -> {out_path} | {instance} | "
+              f"Dönüştürme: {convert_time:.2f}s | Açılış: {load_time * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+import hashlib
+import os
+import pickle
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from problem_instance import ProblemInstance
+
+# Önbellek ayarları
+CACHE_DIR = ".ortest_cache"
+CACHE_VERSION = 3
+
+# Süreç içi önbellek: (mutlak yol, mtime, boyut) -> ayrıştırılmış veri
+_memo = {}
+
+
+# Ortak çalışma kitabı düzeni
+SHEET_KISIT = "Ürün - Kısıt"
+SHEET_FIYAT = "Ürün - Fiyat"
+SHEET_URETICI = "Ürün - Üretici"
+SHEET_KAPASITE = "Üretici - Kapasite"
+SHEET_PARAM = "Ürün - Param"
+SHEET_SATIS = "Ürün - Satış"
+INSTANCE_SHEETS = [SHEET_KISIT, SHEET_FIYAT, SHEET_URETICI, SHEET_KAPASITE, SHEET_PARAM]
+# Varsa okunan ek sayfalar (Greedy satış olasılıkları)
+OPTIONAL_SHEETS = [SHEET_SATIS]
+
+
+def read_workbook_frames(file_path, sheets=INSTANCE_SHEETS, optional_sheets=OPTIONAL_SHEETS):
+    """İstenen sayfaları tek açılışta DataFrame sözlüğü olarak oku"""
+    with pd.ExcelFile(file_path) as xls:
+        names = list(sheets) + [s for s in optional_sheets if s in xls.sheet_names]
+        return {name: xls.parse(name) for name in names}
+
+
+def _duplicate_keys(df, cols):
+    """Tekrarlanan anahtarları listele"""
+    dup = df.loc[df.duplicated(cols), cols].astype(str)
+    if dup.empty:
+        return []
+    return dup.agg(' / '.join, axis=1).tolist()
+
+
+def _split_budget(kisit):
+    """"Toplam Maliyet" satırını ayır: (ürün satırları, bütçe)"""
+    toplam_mask = (kisit['Ürün'] == "Toplam Maliyet").to_numpy()
+    toplam_maliyet = None
+    if toplam_mask.any() and 'Maliyet' in kisit.columns:
+        toplam_maliyet = float(kisit.loc[toplam_mask, 'Maliyet'].iloc[0])
+    return kisit.loc[~toplam_mask].drop_duplicates('Ürün', keep='last'), toplam_maliyet
+
+
+def _product_vector(df, col, urun_index):
+    """Ürün anahtarlı sütunu ürün indeksine hizalanmış vektöre çevir"""
+    s = df.drop_duplicates('Ürün', keep='last').set_index('Ürün')[col]
+    return s.reindex(urun_index).to_numpy(dtype=np.float64)
+
+
+def _capacity_vectors(kapasite, uretici_index):
+    """Üretici üst/alt kapasite vektörleri (eksikler: inf / 0)"""
+    kap = kapasite.drop_duplicates('Üretici', keep='last').set_index('Üretici').reindex(uretici_index)
+    return (kap['Üst Kapasite'].fillna(np.inf).to_numpy(dtype=np.float64),
+            kap['Alt Kapasite'].fillna(0).to_numpy(dtype=np.float64))
+
+
+def _csr_from_arcs(arcs, urun_index, uretici_index):
+    """Ürün - Üretici satırlarından CSR (indptr, üretici indeksi, maliyet) üret"""
+    # Bilinmeyen ürünler atılır, bağlantılar (ürün, üretici) sırasına dizilir
+    arcs = arcs.drop_duplicates(['Ürün', 'Üretici'], keep='last')
+    rows = urun_index.get_indexer(arcs['Ürün'])
+    cols = uretici_index.get_indexer(arcs['Üretici'])
+    cost = arcs['Birim Maliyet'].to_numpy(dtype=np.float64)
+    keep = rows >= 0
+    rows, cols, cost = rows[keep], cols[keep], cost[keep]
+    order = np.lexsort((cols, rows))
+    rows, cols, cost = rows[order], cols[order], cost[order]
+    indptr = np.zeros(len(urun_index) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(urun_index)), out=indptr[1:])
+    return indptr, cols, cost
+
+
+def _sales_probability(satis, urun_index):
+    """Greedy için satış olasılığı: "Ürün - Satış" geçmiş sütunlarının ortalaması"""
+    satis = satis.drop_duplicates('Ürün', keep='last').set_index('Ürün')
+    olasilik = satis.iloc[:, 0:5].replace("-", 0).apply(pd.to_numeric, errors='coerce').mean(axis=1)
+    return olasilik.reindex(urun_index).to_numpy(dtype=np.float64)
+
+
+def build_instance(frames, validate=True):
+    """Sayfa DataFrame'lerini sütun bazlı işlemlerle ProblemInstance'a dönüştür
+
+    validate=True iken tekrarlanan anahtarlar, fiyatı eksik ürünler ve
+    üreticisi olmayan ürünler tek geçişte toplanıp ValueError ile bildirilir.
+    validate=False iken eski dict(zip(...)) davranışı korunur (son kayıt geçerli).
+    """
+    kisit_raw = frames[SHEET_KISIT]
+    fiyat = frames[SHEET_FIYAT]
+    arcs = frames[SHEET_URETICI]
+    kapasite = frames[SHEET_KAPASITE]
+    param = frames[SHEET_PARAM]
+
+    problems = []
+    if validate:
+        for sheet, df, cols in [(SHEET_KISIT, kisit_raw, ['Ürün']),
+                                (SHEET_FIYAT, fiyat, ['Ürün']),
+                                (SHEET_URETICI, arcs, ['Ürün', 'Üretici']),
+                                (SHEET_KAPASITE, kapasite, ['Üretici']),
+                                (SHEET_PARAM, param, ['Ürün'])]:
+            dups = _duplicate_keys(df, cols)
+            if dups:
+                problems.append(f"'{sheet}' tekrarlanan anahtar: {', '.join(dups[:10])}")
+
+    # Ürün indeksi (Kısıt sayfasındaki sıra), üretici indeksi (ilk görülme sırası)
+    kisit, toplam_maliyet = _split_budget(kisit_raw)
+    urun_index = pd.Index(kisit['Ürün'])
+    uretici_index = pd.Index(pd.unique(arcs['Üretici']))
+
+    satis_fiyat = _product_vector(fiyat, 'Satış Fiyatı', urun_index)
+    indptr, cols, cost = _csr_from_arcs(arcs, urun_index, uretici_index)
+
+    if validate:
+        missing_price = urun_index[np.isnan(satis_fiyat)]
+        if len(missing_price):
+            problems.append(f"Fiyatı eksik ürünler: {', '.join(map(str, missing_price[:10]))}")
+        no_producer = urun_index[np.diff(indptr) == 0]
+        if len(no_producer):
+            problems.append(f"Üreticisi olmayan ürünler: {', '.join(map(str, no_producer[:10]))}")
+        if problems:
+            raise ValueError("Veri doğrulama hatası:\n  - " + "\n  - ".join(problems))
+
+    uretici_ust, uretici_alt = _capacity_vectors(kapasite, uretici_index)
+    satis_olasiligi = None
+    if SHEET_SATIS in frames:
+        satis_olasiligi = _sales_probability(frames[SHEET_SATIS], urun_index)
+
+    return ProblemInstance(
+        urun_index.tolist(), uretici_index.tolist(), indptr, cols, cost,
+        satis_fiyat,
+        _product_vector(param, 'Ortalama', urun_index),
+        _product_vector(param, 'STD', urun_index),
+        kisit['Üretim Alt Sınır'].to_numpy(dtype=np.float64),
+        kisit['Üretim Üst Sınır'].to_numpy(dtype=np.float64),
+        uretici_ust, uretici_alt, toplam_maliyet=toplam_maliyet,
+        satis_olasiligi=satis_olasiligi)
+
+
+class LazyInstance(ProblemInstance):
+    """Sayfaları ve türetilmiş dizileri ilk erişimde ayrıştıran ProblemInstance
+
+    Çalışma kitabı tek sefer açılır; her sayfa yalnızca ona bağlı bir dizi
+    istendiğinde okunur ve saklanır. Örneğin greedy akışı "Ürün - Param"
+    sayfasını hiç okumaz. Doğrulama yapılmaz; tam kontrol için
+    read_excel_instance kullanılmalıdır.
+    """
+
+    def __init__(self, file_path):
+        # ProblemInstance.__init__ bilerek çağrılmaz: alanlar tembel özelliklerdir
+        self.file_path = file_path
+        self._xls = None
+        self._sheets = {}
+
+    def __repr__(self):
+        return f"LazyInstance({self.file_path!r}, okunan_sayfalar={list(self._sheets)})"
+
+    def sheet(self, name):
+        """Sayfayı ilk erişimde ayrıştır ve sakla"""
+        if name not in self._sheets:
+            if self._xls is None:
+                self._xls = pd.ExcelFile(self.file_path)
+            self._sheets[name] = self._xls.parse(name)
+        return self._sheets[name]
+
+    def has_sheet(self, name):
+        if self._xls is None:
+            self._xls = pd.ExcelFile(self.file_path)
+        return name in self._xls.sheet_names
+
+    def close(self):
+        if self._xls is not None:
+            self._xls.close()
+            self._xls = None
+
+    @cached_property
+    def _kisit(self):
+        return _split_budget(self.sheet(SHEET_KISIT))
+
+    @cached_property
+    def _urun_pd_index(self):
+        return pd.Index(self._kisit[0]['Ürün'])
+
+    @cached_property
+    def _uretici_pd_index(self):
+        return pd.Index(pd.unique(self.sheet(SHEET_URETICI)['Üretici']))
+
+    @cached_property
+    def _csr(self):
+        return _csr_from_arcs(self.sheet(SHEET_URETICI), self._urun_pd_index, self._uretici_pd_index)
+
+    @cached_property
+    def _kapasite(self):
+        return _capacity_vectors(self.sheet(SHEET_KAPASITE), self._uretici_pd_index)
+
+    # ProblemInstance alanları
+    urunler = cached_property(lambda self: self._urun_pd_index.tolist())
+    ureticiler = cached_property(lambda self: self._uretici_pd_index.tolist())
+    urun_index = cached_property(lambda self: {u: i for i, u in enumerate(self.urunler)})
+    uretici_index = cached_property(lambda self: {j: i for i, j in enumerate(self.ureticiler)})
+    toplam_maliyet = cached_property(lambda self: self._kisit[1])
+    indptr = cached_property(lambda self: self._csr[0])
+    uretici_idx = cached_property(lambda self: self._csr[1])
+    birim_maliyet = cached_property(lambda self: self._csr[2])
+    arc_urun = cached_property(
+        lambda self: np.repeat(np.arange(self.n_urun, dtype=np.int64), np.diff(self.indptr)))
+    satis_fiyat = cached_property(
+        lambda self: _product_vector(self.sheet(SHEET_FIYAT), 'Satış Fiyatı', self._urun_pd_index))
+    talep_ortalama = cached_property(
+        lambda self: _product_vector(self.sheet(SHEET_PARAM), 'Ortalama', self._urun_pd_index))
+    talep_std = cached_property(
+        lambda self: _product_vector(self.sheet(SHEET_PARAM), 'STD', self._urun_pd_index))
+    alt_sinir = cached_property(lambda self: self._kisit[0]['Üretim Alt Sınır'].to_numpy(dtype=np.float64))
+    ust_sinir = cached_property(lambda self: self._kisit[0]['Üretim Üst Sınır'].to_numpy(dtype=np.float64))
+    uretici_ust_kapasite = cached_property(lambda self: self._kapasite[0])
+    uretici_alt_kapasite = cached_property(lambda self: self._kapasite[1])
+    satis_olasiligi = cached_property(
+        lambda self: _sales_probability(self.sheet(SHEET_SATIS), self._urun_pd_index)
+        if self.has_sheet(SHEET_SATIS) else None)
+
+    def materialize(self):
+        """Tüm alanları ayrıştırıp sıradan (pickle edilebilir) ProblemInstance döndür"""
+        return ProblemInstance(
+            self.urunler, self.ureticiler, self.indptr, self.uretici_idx, self.birim_maliyet,
+            self.satis_fiyat, self.talep_ortalama, self.talep_std, self.alt_sinir, self.ust_sinir,
+            self.uretici_ust_kapasite, self.uretici_alt_kapasite,
+            toplam_maliyet=self.toplam_maliyet, satis_olasiligi=self.satis_olasiligi)
+
+
+def read_excel_instance(file_path, validate=True):
+    """Excel dosyasını dizi tabanlı ProblemInstance olarak ayrıştır"""
+    return build_instance(read_workbook_frames(file_path), validate=validate)
+
+
+def read_excel_data(file_path):
+    """Excel dosyasındaki beş sayfayı ayrıştırıp veri sözlüğünü döndür"""
+    return read_excel_instance(file_path).to_data()
+
+
+def file_hash(file_path):
+    """Dosya içeriğinin SHA-256 özetini hesapla"""
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_path(file_path, digest, mtime_ns, namespace):
+    """Disk önbelleğindeki dosya yolunu oluştur"""
+    base = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(CACHE_DIR, f"{base}_{namespace}_v{CACHE_VERSION}_{digest[:16]}_{mtime_ns}.pkl")
+
+
+def cached_load(file_path, parser, namespace="data", use_cache=True):
+    """parser(file_path) sonucunu dosya özeti ve mtime ile önbelleğe alarak döndür"""
+    if not use_cache:
+        return parser(file_path)
+
+    stat = os.stat(file_path)
+    memo_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, namespace)
+    if memo_key in _memo:
+        return _memo[memo_key]
+
+    digest = file_hash(file_path)
+    cache_file = _cache_path(file_path, digest, stat.st_mtime_ns, namespace)
+
+    data = None
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                data = pickle.load(f)
+        except Exception:
+            # Bozuk önbellek dosyası - yeniden ayrıştır
+            data = None
+
+    if data is None:
+        data = parser(file_path)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+
+    _memo[memo_key] = data
+    return data
+
+
+def load_data(file_path, use_cache=True):
+    """Excel verisini önbellek üzerinden yükle (sütunlu biçim de kabul edilir)"""
+    from instance_io import is_columnar, load_columnar
+    if is_columnar(file_path):
+        return load_columnar(file_path).to_data()
+    return cached_load(file_path, read_excel_data, namespace="data", use_cache=use_cache)
+
+
+def load_instance(file_path, use_cache=True):
+    """ProblemInstance'ı yükle: sütunlu biçim doğrudan eşlenir, Excel önbellekten gelir"""
+    from instance_io import is_columnar, load_columnar
+    if is_columnar(file_path):
+        return load_columnar(file_path)
+    return cached_load(file_path, read_excel_instance, namespace="instance", use_cache=use_cache)
+
+
+def clear_cache(memory_only=False):
+    """Süreç içi ve (istenirse) disk önbelleğini temizle"""
+    _memo.clear()
+    if memory_only or not os.path.isdir(CACHE_DIR):
+        return
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith('.pkl'):
+            os.remove(os.path.join(CACHE_DIR, name))
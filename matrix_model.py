@@ -0,0 +1,170 @@
+import time
+
+import numpy as np
+
+from recourse import revenue_segments
+
+
+class MatrixModel:
+    """Değişken blokları ve COO üçlüleriyle kurulan doğrusal model
+
+    Kısıtlar tek tek LinearExpr ile değil, (satır, sütun, katsayı) dizileri
+    olarak eklenir; build() bunları CSR'a çevirip OR-Tools ModelBuilder'a
+    tek çağrıda (fill_model_from_sparse_data) yükler.
+    """
+
+    def __init__(self):
+        self.n_var = 0
+        self.n_row = 0
+        self._var = []   # (alt, üst, amaç, tam sayı)
+        self._row = []   # (alt, üst)
+        self._coo = []   # (satır, sütun, katsayı)
+
+    @property
+    def nnz(self):
+        return sum(len(rows) for rows, _, _ in self._coo)
+
+    def add_vars(self, n, lb=0.0, ub=np.inf, obj=0.0, integral=False):
+        """n değişkenlik blok ekle; indeksleri döndür"""
+        idx = np.arange(self.n_var, self.n_var + n, dtype=np.int64)
+        self._var.append(tuple(np.broadcast_to(np.asarray(v, dtype=t), n)
+                               for v, t in ((lb, np.float64), (ub, np.float64), (obj, np.float64), (integral, bool))))
+        self.n_var += n
+        return idx
+
+    def add_rows(self, m, rows, cols, vals, lb=-np.inf, ub=np.inf):
+        """m satırlık blok ekle; rows 0..m-1 blok içi satır indeksleridir"""
+        self._row.append(tuple(np.broadcast_to(np.asarray(v, dtype=np.float64), m) for v in (lb, ub)))
+        self._coo.append((np.asarray(rows, dtype=np.int64) + self.n_row, np.asarray(cols, dtype=np.int64),
+                          np.broadcast_to(np.asarray(vals, dtype=np.float64), len(rows))))
+        self.n_row += m
+        return np.arange(self.n_row - m, self.n_row, dtype=np.int64)
+
+    def build(self, maximize=True):
+        """ModelBuilder modeli (CSR tek seferde yüklenir)"""
+        from ortools.linear_solver.python import model_builder as mb
+        from scipy.sparse import coo_matrix
+        lb, ub, obj, integral = (np.concatenate(a) for a in zip(*self._var))
+        row_lb, row_ub = (np.concatenate(a) for a in zip(*self._row))
+        rows, cols, vals = (np.concatenate(a) for a in zip(*self._coo))
+        matrix = coo_matrix((vals, (rows, cols)), shape=(self.n_row, self.n_var)).tocsr()
+
+        model = mb.Model()
+        model.helper.fill_model_from_sparse_data(lb, ub, obj, row_lb, row_ub, matrix)
+        for i in np.flatnonzero(integral).tolist():
+            model.helper.set_var_integrality(i, True)
+        model.helper.set_maximize(maximize)
+        return model
+
+
+def solve_matrix_model(model, solver_name='scip'):
+    """Modeli çöz; (başarılı mı, durum, değişken değerleri dizisi) döndür"""
+    from ortools.linear_solver.python import model_builder as mb
+    solver = mb.Solver(solver_name)
+    status = solver.solve(model)
+    ok = status in (mb.SolveStatus.OPTIMAL, mb.SolveStatus.FEASIBLE)
+    values = solver.values(model.get_variables()).to_numpy() if ok else None
+    return ok, status, values
+
+
+def model_nonzeros(solver):
+    """pywraplp modelinin kısıt matrisindeki sıfır olmayan katsayı sayısı"""
+    from ortools.linear_solver import linear_solver_pb2
+    proto = linear_solver_pb2.MPModelProto()
+    solver.ExportModelToProto(proto)
+    return sum(len(ct.var_index) for ct in proto.constraint)
+
+
+def two_stage_model(instance, demand, olasilik, formulasyon='senaryo', surekli_y=False,
+                    uretim_degiskeni=True, x_ust=None, uretim_ust=None):
+    """İki aşamalı modeli dizilerle kur (OptimizationTester.solve_optimization ile aynı model)
+
+    senaryo: y_uk <= üretim_u kısıtları ve y_uk <= d_uk değişken üst sınırı
+    (surekli_y=True iken y sürekli; d tam sayı olmalı, bkz. recourse.sales_bound).
+    segment: recourse.revenue_segments parçaları. uretim_degiskeni=True iken
+    çok üreticili ürünlerde üretim_u = sum_j x_uj tek satırla bağlanır; diğer
+    satırlar yalnızca üretim_u'yu kullanır. x_ust / uretim_ust verilirse
+    (bkz. bound_tightening.TightBounds) değişken üst sınırı ve büyük-M olarak
+    ürün üst sınırının yerine geçer. Döndürür: (MatrixModel, indeksler).
+    """
+    n, k = demand.shape[1], demand.shape[0]
+    a = instance.n_arc
+    m = MatrixModel()
+    x = m.add_vars(a, ub=np.inf if x_ust is None else x_ust, obj=-instance.birim_maliyet, integral=True)
+    ust_sinir = instance.ust_sinir if uretim_ust is None else uretim_ust
+    b = m.add_vars(n, ub=1.0, integral=True)
+
+    # Üretici kapasiteleri: alt <= sum_{u} x_uj <= üst (tek aralık satırı)
+    m.add_rows(instance.n_uretici, instance.uretici_idx, x, 1.0,
+               lb=instance.uretici_alt_kapasite, ub=instance.uretici_ust_kapasite)
+    indeksler = {'x': x, 'b': b}
+    # Üretim terimleri: (ürün, sütun) çiftleri, toplamları ürünün üretimi
+    if uretim_degiskeni:
+        # Yalnızca birden çok üreticisi olan ürünlere; tek üreticili üründe x_u zaten toplamdır
+        cok = np.diff(instance.indptr) > 1
+        z_urun = np.flatnonzero(cok)
+        z = m.add_vars(len(z_urun), ub=ust_sinir[z_urun])
+        tek = ~cok[instance.arc_urun]
+        sira = np.cumsum(cok) - 1
+        m.add_rows(len(z), np.concatenate([np.arange(len(z)), sira[instance.arc_urun[~tek]]]),
+                   np.concatenate([z, x[~tek]]), np.concatenate([np.ones(len(z)), -np.ones(a - tek.sum())]),
+                   lb=0.0, ub=0.0)
+        terim_urun = np.concatenate([instance.arc_urun[tek], z_urun])
+        terim = np.concatenate([x[tek], z])
+        indeksler['uretim'] = z
+    else:
+        terim_urun, terim = instance.arc_urun, x
+    t = len(terim)
+
+    # Ürün sınırları: alt_u b_u <= üretim_u <= üst_u b_u
+    # (sonsuz üst sınırlı ürünlerde üst satır boş bırakılır)
+    urun = np.concatenate([terim_urun, np.arange(n)])
+    sonlu = np.isfinite(ust_sinir)
+    m.add_rows(n, urun, np.concatenate([terim, b]), np.concatenate([np.ones(t), -instance.alt_sinir]), lb=0.0)
+    m.add_rows(n, urun, np.concatenate([terim, b]),
+               np.concatenate([np.ones(t), -np.where(sonlu, ust_sinir, 0.0)]),
+               ub=np.where(sonlu, 0.0, np.inf))
+
+    if formulasyon == 'senaryo':
+        # y ürün-öncelikli: indeks u*K + k; talep üst sınır olarak girer
+        y = m.add_vars(n * k, ub=demand.T.ravel(), obj=np.outer(instance.satis_fiyat, olasilik).ravel(),
+                       integral=not surekli_y)
+        satir_terim = (terim_urun[:, None] * k + np.arange(k)[None, :]).ravel()
+        m.add_rows(n * k, np.concatenate([np.arange(n * k), satir_terim]),
+                   np.concatenate([y, np.repeat(terim, k)]),
+                   np.concatenate([np.ones(n * k), -np.ones(t * k)]), ub=0.0)
+        indeksler['y'] = y
+    elif formulasyon == 'segment':
+        parcalar = [revenue_segments(demand[:, i], olasilik) for i in range(n)]
+        uzunluk = np.concatenate([p[1] for p in parcalar])
+        egim = np.concatenate([p[2] for p in parcalar])
+        seg_urun = np.repeat(np.arange(n), [len(p[0]) for p in parcalar])
+        s = m.add_vars(len(uzunluk), ub=uzunluk, obj=instance.satis_fiyat[seg_urun] * egim)
+        m.add_rows(n, np.concatenate([seg_urun, terim_urun]), np.concatenate([s, terim]),
+                   np.concatenate([np.ones(len(s)), -np.ones(t)]), ub=0.0)
+        indeksler['s'] = s
+    else:
+        raise ValueError(f"Matris kurucu bu formülasyonu desteklemiyor: {formulasyon}")
+    return m, indeksler
+
+
+def solve_two_stage(instance, demand, olasilik, formulasyon='senaryo', surekli_y=False,
+                    uretim_degiskeni=True, x_ust=None, uretim_ust=None):
+    """Kur, yükle, çöz; aşama süreleriyle birlikte sonuç döndür"""
+    sureler = {}
+    t0 = time.perf_counter()
+    m, indeksler = two_stage_model(instance, demand, olasilik, formulasyon, surekli_y, uretim_degiskeni,
+                                   x_ust, uretim_ust)
+    sureler['matris'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    model = m.build()
+    sureler['yukleme'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ok, status, values = solve_matrix_model(model)
+    sureler['cozum'] = time.perf_counter() - t0
+    return {'ok': ok, 'status': status, 'values': values, 'indeksler': indeksler, 'sureler': sureler,
+            'n_var': m.n_var, 'n_row': m.n_row, 'nnz': m.nnz,
+            # solve_optimization ile aynı sayım (ikili b hariç)
+            'n_int': len(indeksler['x']) + (len(indeksler['y']) if 'y' in indeksler and not surekli_y else 0)}
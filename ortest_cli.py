@@ -0,0 +1,258 @@
+import argparse
+import importlib
+import sys
+import time
+
+# Bu modül yalnızca standart kütüphaneyi içe aktarır; pandas, ortools, scipy
+# gibi ağır bağımlılıklar her alt komutta yalnızca gerektiğinde yüklenir.
+_start = time.perf_counter()
+_import_times = {}
+
+# Alt komut -> ihtiyaç duyduğu modüller (sırayla yüklenir, süreleri ayrı ölçülür)
+COMMAND_MODULES = {
+    'solve': ['numpy', 'pandas', 'ortools.linear_solver.pywraplp', 'tqdm', 'SDP_IP_Excel'],
+    'saa': ['numpy', 'pandas', 'ortools.linear_solver.pywraplp', 'tqdm', 'SAAheu'],
+    'eev': ['numpy', 'pandas', 'ortools.linear_solver.pywraplp', 'EEV'],
+    'greedy': ['numpy', 'pandas', 'Greedy'],
+    'fit': ['numpy', 'pandas', 'scipy.stats', 'Dağılım_Bulma'],
+    'bench': ['numpy', 'pandas', 'instance_io', 'Greedy2'],
+    'samplers': ['numpy', 'pandas', 'ortools.linear_solver.pywraplp', 'scipy.stats.qmc', 'sampler_benchmark'],
+    'density': ['numpy', 'pandas', 'ortools.linear_solver.pywraplp', 'density_benchmark'],
+    'watch': ['numpy', 'pandas', 'ortools.linear_solver.pywraplp', 'watch_mode'],
+}
+
+
+def lazy_import(name):
+    """Modülü içe aktar ve ilk yükleme süresini kaydet"""
+    if name in sys.modules:
+        return sys.modules[name]
+    t0 = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_times[name] = time.perf_counter() - t0
+    return module
+
+
+def cmd_solve(args):
+    sdp = lazy_import('SDP_IP_Excel')
+    if args.file is None:
+        sdp.main()
+        return
+    tester = sdp.OptimizationTester(sampler=args.sampler, dagilim=args.dagilim,
+                                    reduce_to=args.indirge, reduction=args.indirgeme,
+                                    dagilim_dosyasi=args.dagilim_dosyasi, korelasyon=args.korelasyon,
+                                    korelasyon_rank=args.korelasyon_rank, onbellek=not args.onbelleksiz,
+                                    bootstrap=args.bootstrap, gecmis_dosyasi=args.gecmis,
+                                    formulasyon=args.formulasyon,
+                                    model_kurucu='matris' if args.matris else 'pywraplp',
+                                    uretim_degiskeni=not args.uretim_degiskensiz,
+                                    sinir_sikilastirma=not args.sikilastirmasiz,
+                                    surekli_satis=not args.tamsayi_satis, tamsayi_dogrula=args.tamsayi_dogrula)
+    tester.run_single_test(args.file, args.senaryo, args.seed)
+
+
+def _scenario_sampler(args):
+    """--bootstrap verildiyse geçmiş satış üreteci (--gecmis yoksa dosyanın kendi geçmişi)"""
+    if not args.bootstrap:
+        return None
+    return lazy_import('history_bootstrap').HistoryBootstrap.from_file(args.gecmis or args.file)
+
+
+def cmd_saa(args):
+    lazy_import('SAAheu').run_saa(args.file, num_groups=args.gruplar,
+                                  num_evaluation=args.degerlendirme,
+                                  simulasyon_sayisi=args.senaryo, cache=not args.onbelleksiz,
+                                  scenario_sampler=_scenario_sampler(args),
+                                  oos_senaryo=args.oos, workers=args.isci)
+
+
+def cmd_eev(args):
+    lazy_import('EEV').run_eev(args.file, simulasyon_sayisi=args.senaryo,
+                               eev_simulasyon_sayisi=args.eev_senaryo,
+                               scenario_sampler=_scenario_sampler(args))
+
+
+def cmd_greedy(args):
+    greedy = lazy_import('Greedy')
+    uretim_plani, _, _, _ = greedy.greedy_optimization(args.file)
+    if args.uretici_ozet:
+        greedy.uretici_ozet_rapor(uretim_plani)
+
+
+def cmd_fit(args):
+    lazy_import('Dağılım_Bulma').main(args.file)
+
+
+def cmd_bench(args):
+    """Yükleme, greedy ve senaryo değerlendirmesi sürelerini ölç"""
+    np = lazy_import('numpy')
+    instance_io = lazy_import('instance_io')
+    greedy2 = lazy_import('Greedy2')
+
+    t0 = time.perf_counter()
+    instance = instance_io.open_instance(args.file)
+    t_load = time.perf_counter() - t0
+
+    print(f"📊 {instance}")
+    print(f"   Yükleme     : {t_load * 1000:>9.1f} ms")
+    if instance.satis_olasiligi is None:
+        print("   ⚠️ 'Ürün - Satış' verisi yok, greedy ve değerlendirme atlandı")
+        return
+
+    t0 = time.perf_counter()
+    uretim_plani = greedy2.calculate_production_plan_from_instance(instance)[0]
+    t_greedy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rng = np.random.default_rng(args.seed)
+    demand = np.maximum(0, rng.normal(instance.talep_ortalama, instance.talep_std,
+                                      size=(args.senaryo, instance.n_urun)))
+    kar = instance.expected_profit(instance.plan_to_array(uretim_plani), demand)
+    t_eval = time.perf_counter() - t0
+
+    print(f"   Greedy      : {t_greedy * 1000:>9.1f} ms")
+    print(f"   Değerlendirme ({args.senaryo} senaryo): {t_eval * 1000:.1f} ms | Beklenen kar: {kar:,.2f}")
+
+
+def cmd_samplers(args):
+    benchmark = lazy_import('sampler_benchmark')
+    df = benchmark.run_benchmark(args.files, args.sampler, args.senaryo, args.seed, args.dagilim)
+    if not df.empty:
+        print(benchmark.summarize(df).to_string(index=False))
+
+
+def cmd_density(args):
+    benchmark = lazy_import('density_benchmark')
+    df = benchmark.run_benchmark(args.files, args.senaryo, args.seed, 'matris' if args.matris else 'pywraplp')
+    if not df.empty:
+        print(benchmark.summarize(df).to_string(index=False))
+
+
+def cmd_watch(args):
+    watcher = lazy_import('watch_mode').InstanceWatcher(args.file, args.senaryo, args.seed)
+    watcher.watch(args.aralik)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ortest_cli", description="OR-Tools üretim planlama araçları")
+    parser.add_argument('--sessiz', action='store_true',
+                        help="İçe aktarma süre dökümünü yazdırma")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('solve', help="İki aşamalı stokastik modeli çöz (dosya yoksa kapsamlı test)")
+    p.add_argument('file', nargs='?')
+    p.add_argument('--senaryo', type=int, default=100)
+    p.add_argument('--seed', type=int, default=1300)
+    p.add_argument('--sampler', choices=['mc', 'antithetic', 'lhs', 'sobol'], default='mc')
+    p.add_argument('--dagilim', choices=['normal', 'lognormal', 'fitted', 'tamsayi'], default='normal')
+    p.add_argument('--dagilim-dosyasi', default='Uygun_Dagilimlar.xlsx',
+                   help="--dagilim fitted için Dağılım_Bulma çıktısı")
+    p.add_argument('--korelasyon', action='store_true',
+                   help="Ürünler arası korelasyonu satış geçmişinden kestir (Gauss kopulası)")
+    p.add_argument('--korelasyon-rank', type=int, help="Kopula faktör sayısı üst sınırı")
+    p.add_argument('--indirge', type=int, help="Senaryoları bu sayıda ağırlıklı temsilciye indir")
+    p.add_argument('--indirgeme', choices=['kmedoids', 'fast_forward'], default='kmedoids')
+    p.add_argument('--onbelleksiz', action='store_true', help="Senaryo önbelleğini kullanma")
+    p.add_argument('--bootstrap', action='store_true',
+                   help="Senaryoları geçmiş satış dönemlerinden yeniden örnekle")
+    p.add_argument('--gecmis', help="Bootstrap geçmişi (Excel 'Ürün - Adet' ya da ';' ayrılmış CSV)")
+    p.add_argument('--formulasyon', choices=['senaryo', 'segment', 'epigraf'], default='senaryo',
+                   help="İkinci aşama: senaryo başına y ya da sıralı talep kırılmalarıyla kompakt model")
+    p.add_argument('--matris', action='store_true',
+                   help="Modeli seyrek matris olarak kurup ModelBuilder'a tek seferde yükle (aşama süreleriyle)")
+    p.add_argument('--uretim-degiskensiz', action='store_true',
+                   help="Çok üreticili ürünlere toplam üretim değişkeni ekleme (x'ler her satırda açık yazılır)")
+    p.add_argument('--sikilastirmasiz', action='store_true',
+                   help="Talepten türetilen sıkı üst sınırları ve baskın bağlantı elemeyi kapat")
+    p.add_argument('--tamsayi-satis', action='store_true',
+                   help="Satış değişkenlerini tam sayı tut (sürekli gevşetme yalnızca tamsayı talepte)")
+    p.add_argument('--tamsayi-dogrula', action='store_true',
+                   help="Çözümden sonra sürekli satış değerlerinin tam sayı olduğunu denetle")
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser('saa', help="SAA sezgiseli")
+    p.add_argument('file', nargs='?', default="ORTEST.xlsx")
+    p.add_argument('--gruplar', type=int, default=5)
+    p.add_argument('--degerlendirme', type=int, default=10)
+    p.add_argument('--senaryo', type=int, default=5000)
+    p.add_argument('--onbelleksiz', action='store_true', help="Senaryo önbelleğini kullanma")
+    p.add_argument('--bootstrap', action='store_true',
+                   help="Senaryoları geçmiş satış dönemlerinden yeniden örnekle")
+    p.add_argument('--gecmis', help="Bootstrap geçmişi (Excel 'Ürün - Adet' ya da ';' ayrılmış CSV)")
+    p.add_argument('--oos', type=int, help="En iyi planı bu kadar senaryoda bloklar halinde değerlendir")
+    p.add_argument('--isci', type=int, default=1, help="Örneklem dışı değerlendirme işçi sayısı")
+    p.set_defaults(func=cmd_saa)
+
+    p = sub.add_parser('eev', help="RP / EEV / VSS hesabı")
+    p.add_argument('file', nargs='?', default="ORTEST.xlsx")
+    p.add_argument('--senaryo', type=int, default=1000)
+    p.add_argument('--eev-senaryo', type=int, default=1000)
+    p.add_argument('--bootstrap', action='store_true',
+                   help="Senaryoları geçmiş satış dönemlerinden yeniden örnekle")
+    p.add_argument('--gecmis', help="Bootstrap geçmişi (Excel 'Ürün - Adet' ya da ';' ayrılmış CSV)")
+    p.set_defaults(func=cmd_eev)
+
+    p = sub.add_parser('greedy', help="Greedy üretim planı")
+    p.add_argument('file', nargs='?', default="ORTEST.xlsx")
+    p.add_argument('--uretici-ozet', action='store_true', help="Üretici bazlı özeti de yazdır")
+    p.set_defaults(func=cmd_greedy)
+
+    p = sub.add_parser('fit', help="Satış verisine dağılım uydur")
+    p.add_argument('file', nargs='?', default='Ürün - Adet.xlsx')
+    p.set_defaults(func=cmd_fit)
+
+    p = sub.add_parser('bench', help="Yükleme / greedy / değerlendirme süre ölçümü")
+    p.add_argument('file', nargs='?', default="ORTEST.xlsx")
+    p.add_argument('--senaryo', type=int, default=1000)
+    p.add_argument('--seed', type=int, default=0)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser('samplers', help="Senaryo örnekleyicilerinin K'ya göre amaç kararlılığı")
+    p.add_argument('files', nargs='*', default=["ORTEST50_IP.xlsx"])
+    p.add_argument('--sampler', nargs='+', choices=['mc', 'antithetic', 'lhs', 'sobol'],
+                   default=['mc', 'antithetic', 'lhs', 'sobol'])
+    p.add_argument('--senaryo', type=int, nargs='+', default=[10, 25, 50, 100])
+    p.add_argument('--seed', type=int, nargs='+', default=[1, 2, 3, 4, 5])
+    p.add_argument('--dagilim', choices=['normal', 'lognormal', 'tamsayi'], default='normal')
+    p.set_defaults(func=cmd_samplers)
+
+    p = sub.add_parser('density', help="Toplam üretim değişkeninin sıfır olmayan katsayı ve süreye etkisi")
+    p.add_argument('files', nargs='*', default=["ORTEST100_IP.xlsx", "ORTEST200_IP.xlsx"])
+    p.add_argument('--senaryo', type=int, nargs='+', default=[25, 50, 100])
+    p.add_argument('--seed', type=int, nargs='+', default=[1300])
+    p.add_argument('--matris', action='store_true', help="Matris kurucu ile")
+    p.set_defaults(func=cmd_density)
+
+    p = sub.add_parser('watch', help="Dosyayı izle, değişen sayfaya göre modeli güncelleyip yeniden çöz")
+    p.add_argument('file', nargs='?', default="ORTEST.xlsx")
+    p.add_argument('--senaryo', type=int, default=100)
+    p.add_argument('--seed', type=int, default=1300)
+    p.add_argument('--aralik', type=float, default=1.0, help="Kontrol aralığı (saniye)")
+    p.set_defaults(func=cmd_watch)
+    return parser
+
+
+def print_import_report(startup_time, run_time):
+    toplam = sum(_import_times.values())
+    print(f"\n⏱  Başlangıç: {startup_time:.2f}s (içe aktarma: {toplam:.2f}s) | Çalışma: {run_time:.2f}s")
+    for name, sure in sorted(_import_times.items(), key=lambda kv: -kv[1]):
+        print(f"   {name:<32} {sure * 1000:>8.1f} ms")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # Bağımlılıkları sırayla yükle: döküm her paketin kendi payını gösterir
+    for name in COMMAND_MODULES[args.command]:
+        lazy_import(name)
+
+    t0 = time.perf_counter()
+    startup_time = t0 - _start
+    args.func(args)
+    run_time = time.perf_counter() - t0
+    if not args.sessiz:
+        print_import_report(startup_time, run_time)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,53 +1,43 @@
 import pandas as pd
 import numpy as np
 import scipy.stats as stats
+from sales_history import iter_history
 
 # Veri yükleme
 file_path = "ORTEST.xlsx"
 
-# İlk satırı başlık olarak kullanmadan veriyi okuma
-urun_adet_data = pd.read_excel(file_path, sheet_name="Ürün - Adet", header=None)
-
-# İlk satırı sütun isimleri olarak ayarlama
-urun_adet_data.columns = urun_adet_data.iloc[0]
-urun_adet_data = urun_adet_data.drop(urun_adet_data.index[0]).reset_index(drop=True)
-
-# Sütun isimlerini ve veri türünü düzenleme
-urun_adet_data.columns = ['Ürünler'] + list(urun_adet_data.columns[1:])
-
-# NaN değerlerini ve float'ları işleme
-for col in ['2020', '2021', '2022', '2023', '2024']:
-    urun_adet_data[col] = pd.to_numeric(urun_adet_data[col], errors='coerce').fillna(0).astype(int)
-
 # Her ürün için istatistiksel parametreleri hesaplama
+# Satış geçmişi ürün parçaları halinde okunur; dönem (yıl/ay) sayısı serbesttir
 urun_parametreleri = {}
 
-for _, row in urun_adet_data.iterrows():
-    urun = row['Ürünler']
-    satis_adetleri = row[['2020', '2021', '2022', '2023', '2024']].values
+for urunler, donemler, satislar in iter_history(file_path, sheet_name="Ürün - Adet"):
+    # NaN değerlerini ve float'ları işleme
+    satislar = np.nan_to_num(satislar, nan=0).astype(int)
+    n = len(donemler)
     
-    # Temel istatistikler
-    ortalama = np.mean(satis_adetleri)
-    standart_sapma = np.std(satis_adetleri)
+    # Temel istatistikler (parça üzerinde vektörel)
+    ortalama = satislar.mean(axis=1)
+    standart_sapma = satislar.std(axis=1)
     
-    # Normallik testi
-    _, normallik_p_degeri = stats.normaltest(satis_adetleri)
+    # Normallik testi (en az 8 dönem gerekir)
+    if n >= 8:
+        _, normallik_p_degeri = stats.normaltest(satislar, axis=1)
+    else:
+        normallik_p_degeri = np.full(len(urunler), np.nan)
     
     # Güven aralığı hesaplama (95% güven düzeyi)
-    guven_araligi = stats.t.interval(alpha=0.95, 
-                                     df=len(satis_adetleri)-1, 
-                                     loc=ortalama, 
-                                     scale=stats.sem(satis_adetleri))
+    alt, ust = stats.t.interval(0.95, n - 1, loc=ortalama, scale=stats.sem(satislar, axis=1))
     
-    urun_parametreleri[urun] = {
-        'Ortalama Satış Adedi': ortalama,
-        'Standart Sapma': standart_sapma,
-        'Varyans': standart_sapma**2,
-        'Normallik P-Değeri': normallik_p_degeri,
-        'Güven Aralığı Alt Sınır': guven_araligi[0],
-        'Güven Aralığı Üst Sınır': guven_araligi[1],
-        'Satış Adetleri': list(satis_adetleri)
-    }
+    for i, urun in enumerate(urunler):
+        urun_parametreleri[urun] = {
+            'Ortalama Satış Adedi': ortalama[i],
+            'Standart Sapma': standart_sapma[i],
+            'Varyans': standart_sapma[i]**2,
+            'Normallik P-Değeri': normallik_p_degeri[i],
+            'Güven Aralığı Alt Sınır': alt[i],
+            'Güven Aralığı Üst Sınır': ust[i],
+            'Satış Adetleri': satislar[i].tolist()
+        }
 
 # Sonuçları ekrana yazdırma
 print("Ürün Satış Parametreleri:\n")
@@ -0,0 +1,184 @@
+import numpy as np
+
+
+class ProblemInstance:
+    """Tamsayı indeksli, dizi tabanlı problem örneği
+
+    Ürünler ve üreticiler 0..N-1 / 0..M-1 indeksleriyle tutulur. Maliyet
+    yapısı ürün x üretici seyrek CSR matrisi olarak saklanır: her sıfır
+    olmayan eleman bir (ürün, üretici) bağlantısıdır ("arc"). İsim <-> indeks
+    eşlemeleri yalnızca raporlama içindir.
+    """
+
+    def __init__(self, urunler, ureticiler, indptr, uretici_idx, birim_maliyet,
+                 satis_fiyat, talep_ortalama, talep_std, alt_sinir, ust_sinir,
+                 uretici_ust_kapasite, uretici_alt_kapasite, toplam_maliyet=None, satis_olasiligi=None):
+        self.urunler = list(urunler)
+        self.ureticiler = list(ureticiler)
+        self.urun_index = {u: i for i, u in enumerate(self.urunler)}
+        self.uretici_index = {j: i for i, j in enumerate(self.ureticiler)}
+
+        # CSR yapısı (satır = ürün, sütun = üretici)
+        self.indptr = np.ascontiguousarray(indptr, dtype=np.int64)
+        self.uretici_idx = np.ascontiguousarray(uretici_idx, dtype=np.int64)
+        self.birim_maliyet = np.ascontiguousarray(birim_maliyet, dtype=np.float64)
+        # Her bağlantının ait olduğu ürün indeksi
+        self.arc_urun = np.repeat(np.arange(len(self.urunler), dtype=np.int64), np.diff(self.indptr))
+
+        # Ürün vektörleri
+        self.satis_fiyat = np.ascontiguousarray(satis_fiyat, dtype=np.float64)
+        self.talep_ortalama = np.ascontiguousarray(talep_ortalama, dtype=np.float64)
+        self.talep_std = np.ascontiguousarray(talep_std, dtype=np.float64)
+        self.alt_sinir = np.ascontiguousarray(alt_sinir, dtype=np.float64)
+        self.ust_sinir = np.ascontiguousarray(ust_sinir, dtype=np.float64)
+
+        # Üretici vektörleri
+        self.uretici_ust_kapasite = np.ascontiguousarray(uretici_ust_kapasite, dtype=np.float64)
+        self.uretici_alt_kapasite = np.ascontiguousarray(uretici_alt_kapasite, dtype=np.float64)
+
+        # "Toplam Maliyet" bütçesi ve "Ürün - Satış" olasılıkları (varsa)
+        self.toplam_maliyet = toplam_maliyet
+        self.satis_olasiligi = None
+        if satis_olasiligi is not None:
+            self.satis_olasiligi = np.ascontiguousarray(satis_olasiligi, dtype=np.float64)
+
+    @property
+    def n_urun(self):
+        return len(self.urunler)
+
+    @property
+    def n_uretici(self):
+        return len(self.ureticiler)
+
+    @property
+    def n_arc(self):
+        return len(self.uretici_idx)
+
+    def __repr__(self):
+        return f"ProblemInstance(urun={self.n_urun}, uretici={self.n_uretici}, baglanti={self.n_arc})"
+
+    def close(self):
+        """Açık kaynak yok; tembel alt sınıflar (LazyInstance) dosyayı burada kapatır"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Dönüşümler
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_data(cls, data):
+        """load_data() sözlüğünden dizi tabanlı örnek oluştur"""
+        urunler = list(data['urunler'])
+        ureticiler = list(data['ureticiler'])
+        urun_index = {u: i for i, u in enumerate(urunler)}
+        uretici_index = {j: i for i, j in enumerate(ureticiler)}
+
+        # Bağlantıları (ürün, üretici) sırasına göre diz
+        arcs = [(urun_index[u], uretici_index[j], c)
+                for (u, j), c in data['urun_uretici_dict'].items()
+                if u in urun_index and j in uretici_index]
+        arcs.sort(key=lambda a: (a[0], a[1]))
+        rows = np.array([a[0] for a in arcs], dtype=np.int64)
+        indptr = np.zeros(len(urunler) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(urunler)), out=indptr[1:])
+
+        nan = float('nan')
+        return cls(
+            urunler, ureticiler, indptr,
+            uretici_idx=[a[1] for a in arcs],
+            birim_maliyet=[a[2] for a in arcs],
+            satis_fiyat=[data['satis_fiyat'].get(u, nan) for u in urunler],
+            talep_ortalama=[data['urun_param_dict'].get(u, {}).get('ortalama', nan) for u in urunler],
+            talep_std=[data['urun_param_dict'].get(u, {}).get('std', nan) for u in urunler],
+            alt_sinir=[data['urun_alt_kisit_dict'].get(u, 0) for u in urunler],
+            ust_sinir=[data['urun_ust_kisit_dict'].get(u, np.inf) for u in urunler],
+            uretici_ust_kapasite=[data['uretici_kapasite_dict'].get(j, np.inf) for j in ureticiler],
+            uretici_alt_kapasite=[data['uretici_alt_kapasite_dict'].get(j, 0) for j in ureticiler],
+        )
+
+    def to_data(self):
+        """Eski sözlük tabanlı veri yapısını geri üret (raporlama / uyumluluk)"""
+        return {
+            'urunler': list(self.urunler),
+            'ureticiler': list(self.ureticiler),
+            'satis_fiyat': dict(zip(self.urunler, self.satis_fiyat.tolist())),
+            'urun_uretici_dict': dict(zip(self.arc_keys(), self.birim_maliyet.tolist())),
+            'urun_param_dict': {u: {'ortalama': m, 'std': s} for u, m, s in
+                                zip(self.urunler, self.talep_ortalama.tolist(), self.talep_std.tolist())},
+            'uretici_kapasite_dict': dict(zip(self.ureticiler, self.uretici_ust_kapasite.tolist())),
+            'uretici_alt_kapasite_dict': dict(zip(self.ureticiler, self.uretici_alt_kapasite.tolist())),
+            'urun_alt_kisit_dict': dict(zip(self.urunler, self.alt_sinir.tolist())),
+            'urun_ust_kisit_dict': dict(zip(self.urunler, self.ust_sinir.tolist())),
+        }
+
+    def restrict_arcs(self, mask):
+        """Yalnızca mask'teki bağlantıları içeren örnek (ürün / üretici sırası korunur)"""
+        mask = np.asarray(mask, dtype=bool)
+        indptr = np.zeros(self.n_urun + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.arc_urun[mask], minlength=self.n_urun), out=indptr[1:])
+        return ProblemInstance(
+            self.urunler, self.ureticiler, indptr, self.uretici_idx[mask], self.birim_maliyet[mask],
+            self.satis_fiyat, self.talep_ortalama, self.talep_std, self.alt_sinir, self.ust_sinir,
+            self.uretici_ust_kapasite, self.uretici_alt_kapasite,
+            toplam_maliyet=self.toplam_maliyet, satis_olasiligi=self.satis_olasiligi)
+
+    def arc_keys(self):
+        """Bağlantı sırasıyla (ürün adı, üretici adı) anahtarları"""
+        return [(self.urunler[u], self.ureticiler[j])
+                for u, j in zip(self.arc_urun.tolist(), self.uretici_idx.tolist())]
+
+    def cost_matrix(self):
+        """Maliyetleri scipy.sparse CSR matrisi olarak döndür"""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.birim_maliyet, self.uretici_idx, self.indptr),
+                          shape=(self.n_urun, self.n_uretici))
+
+    def plan_to_array(self, plan):
+        """{(ürün, üretici): miktar} planını bağlantı dizisine çevir"""
+        x = np.zeros(self.n_arc, dtype=np.float64)
+        for (u, j), miktar in plan.items():
+            i = self.urun_index[u]
+            lo, hi = self.indptr[i], self.indptr[i + 1]
+            pos = lo + np.searchsorted(self.uretici_idx[lo:hi], self.uretici_index[j])
+            x[pos] = miktar
+        return x
+
+    def array_to_plan(self, x_arc):
+        """Bağlantı dizisini {(ürün, üretici): miktar} sözlüğüne çevir"""
+        return dict(zip(self.arc_keys(), np.asarray(x_arc, dtype=np.float64).tolist()))
+
+    def demand_matrix(self, sales_scenarios):
+        """{ürün: [talep_k]} senaryolarını K x N bitişik matrise çevir"""
+        return np.ascontiguousarray(
+            np.column_stack([np.asarray(sales_scenarios[u], dtype=np.float64) for u in self.urunler]))
+
+    # ------------------------------------------------------------------
+    # Vektörel hesaplar
+    # ------------------------------------------------------------------
+
+    def production_by_product(self, x_arc):
+        """Ürün bazında toplam üretim (N)"""
+        return np.bincount(self.arc_urun, weights=x_arc, minlength=self.n_urun)
+
+    def production_by_producer(self, x_arc):
+        """Üretici bazında toplam üretim (M)"""
+        return np.bincount(self.uretici_idx, weights=x_arc, minlength=self.n_uretici)
+
+    def production_cost(self, x_arc):
+        """Toplam üretim maliyeti"""
+        return float(np.dot(self.birim_maliyet, x_arc))
+
+    def scenario_profits(self, x_arc, demand):
+        """Her senaryo için kar; demand K x N talep matrisi"""
+        uretim = self.production_by_product(x_arc)
+        satis = np.minimum(uretim[None, :], demand)
+        return satis @ self.satis_fiyat - self.production_cost(x_arc)
+
+    def expected_profit(self, x_arc, demand):
+        """Senaryolar üzerinden ortalama kar"""
+        return float(self.scenario_profits(x_arc, demand).mean())
@@ -0,0 +1,118 @@
+import numpy as np
+
+FORMULASYONLAR = ('senaryo', 'segment', 'epigraf')
+# Epigraf modunda ürün başına baştan eklenen kesme sayısı
+BASLANGIC_KESME = 16
+# Sürekli satış değişkenlerinin tam sayılık doğrulamasında tolerans
+TAMSAYI_TOL = 1e-6
+
+
+def sales_bound(talep):
+    """Satış değişkeni sınırı: tam sayı y <= d, y <= taban(d) ile aynıdır
+
+    Üretim tam sayı ve bu sınır tam sayı olduğunda ikinci aşama
+    (y <= üretim, y <= taban(d)) LP'sinin kısıt matrisi tamamen unimodülerdir;
+    en iyi y köşesi zaten tam sayıdır, bu yüzden y sürekli tanımlanabilir.
+    """
+    return np.floor(talep)
+
+
+def integrality_violations(degerler, tol=TAMSAYI_TOL):
+    """(tam sayı olmayan değer sayısı, en büyük sapma)"""
+    degerler = np.asarray(degerler, dtype=np.float64)
+    if degerler.size == 0:
+        return 0, 0.0
+    sapma = np.abs(degerler - np.rint(degerler))
+    return int((sapma > tol).sum()), float(sapma.max())
+
+
+def revenue_segments(talep, olasilik=None):
+    """Beklenen satış E[min(X, D)]'nin parçalı doğrusal gösterimi
+
+    Ürünün K senaryo talebi bir kez sıralanır; kırılma noktaları farklı
+    pozitif talep değerleridir. [b_(i-1), b_i] parçasında eğim P(D >= b_i)
+    olup azalandır (içbükey fonksiyon), bu yüzden parçalar ikili değişken
+    olmadan sırayla dolar. Döndürür: (kırılmalar, parça uzunlukları, eğimler).
+    """
+    talep = np.asarray(talep, dtype=np.float64)
+    if olasilik is None:
+        olasilik = np.full(len(talep), 1.0 / len(talep))
+    degerler, ters = np.unique(talep, return_inverse=True)
+    kutle = np.bincount(ters, weights=olasilik, minlength=len(degerler))
+    # P(D >= değer): ters kümülatif toplam
+    kuyruk = np.cumsum(kutle[::-1])[::-1]
+    pozitif = degerler > 0
+    kirilma = degerler[pozitif]
+    return kirilma, np.diff(kirilma, prepend=0.0), kuyruk[pozitif]
+
+
+def expected_sales_cuts(kirilma, uzunluk, egim):
+    """Epigraf kesmeleri: E[min(X, D)] = min_i (sabit_i + eğim_i X)
+
+    Her parça için bir doğru ve en büyük talepten sonra yatay doğru.
+    """
+    onceki = kirilma - uzunluk
+    birikimli = np.cumsum(egim * uzunluk)
+    sabit = np.concatenate([[0.0], birikimli[:-1]]) - egim * onceki
+    return np.append(sabit, birikimli[-1:] if len(birikimli) else 0.0), np.append(egim, 0.0)
+
+
+def expected_sales(uretim, talep, olasilik=None):
+    """Ürün bazında beklenen satış E[min(X_u, D_u)]; talep K x N"""
+    talep = np.asarray(talep, dtype=np.float64)
+    satis = np.minimum(np.asarray(uretim, dtype=np.float64)[None, :], talep)
+    if olasilik is None:
+        return satis.mean(axis=0)
+    return np.asarray(olasilik) @ satis
+
+
+class CutPool:
+    """Bir ürünün epigraf kesmeleri: satis <= sabit_i + egim_i * sum(x_u)
+
+    Tüm doğrular dizide tutulur, modele yalnızca gerekenler eklenir.
+    """
+
+    def __init__(self, theta, x_u, sabit, egim):
+        self.theta = theta
+        self.x_u = x_u
+        self.sabit = sabit
+        self.egim = egim
+        self.eklenen = set()
+
+    def add(self, solver, i):
+        ct = solver.Constraint(-solver.infinity(), float(self.sabit[i]))
+        ct.SetCoefficient(self.theta, 1)
+        for var in self.x_u:
+            ct.SetCoefficient(var, -float(self.egim[i]))
+        self.eklenen.add(int(i))
+
+    def add_initial(self, solver, seviye=BASLANGIC_KESME):
+        """Başlangıç: eğimi (kuyruk olasılığı) eşit aralıklı seviyelere en yakın doğrular
+
+        İlk doğru orijinden, son doğru yataydır; çoğu ürün birkaç turda kapanır.
+        """
+        hedef = np.linspace(1.0, 0.0, seviye)
+        idx = np.minimum(np.searchsorted(-self.egim, -hedef), len(self.egim) - 1)
+        for i in sorted(set(idx.tolist()) | {0, len(self.egim) - 1}):
+            self.add(solver, i)
+
+    def violated(self, tol=1e-7):
+        """Mevcut çözümde ihlal edilen en sıkı doğru (yoksa None)"""
+        uretim = sum(var.solution_value() for var in self.x_u)
+        degerler = self.sabit + self.egim * uretim
+        i = int(degerler.argmin())
+        if i in self.eklenen or self.theta.solution_value() <= degerler[i] + tol * max(1.0, abs(degerler[i])):
+            return None
+        return i
+
+
+def add_violated_cuts(solver, kesme_havuzu):
+    """İhlal edilen kesmeleri ekle; eklenen kesme sayısını döndür
+
+    Model değişince çözüm değerleri geçersizleştiğinden önce tüm ihlaller bulunur.
+    """
+    ihlaller = [(kesme, kesme.violated()) for kesme in kesme_havuzu]
+    ihlaller = [(kesme, i) for kesme, i in ihlaller if i is not None]
+    for kesme, i in ihlaller:
+        kesme.add(solver, i)
+    return len(ihlaller)
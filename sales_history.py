@@ -0,0 +1,91 @@
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 1000
+# header='auto' iken ilk hücresi bu etiketlerden biri olan satır başlık sayılır
+URUN_BASLIKLARI = ('ürün', 'ürünler')
+
+
+def _to_float(value):
+    """Hücre değerini sayıya çevir; boş / metin ("-") değerler NaN olur"""
+    if value is None or isinstance(value, str):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+    return float(value)
+
+
+def _is_header(row):
+    """Satır ürün sütunu etiketiyle başlıyorsa başlıktır (ör. "Ürün", "Ürünler")"""
+    return isinstance(row[0], str) and row[0].lstrip('\ufeff').strip().casefold() in URUN_BASLIKLARI
+
+
+def _iter_excel_rows(file_path, sheet_name):
+    from openpyxl import load_workbook
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if sheet_name is None or (sheet_name not in wb.sheetnames and len(wb.worksheets) == 1):
+            # Tek sayfalı ayrı geçmiş dosyası (ör. "Ürün - Adet.xlsx" / Sheet1): adı ne olursa olsun
+            ws = wb.worksheets[0]
+        else:
+            ws = wb[sheet_name]
+        yield from ws.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _iter_csv_rows(file_path, sep, chunk_size):
+    for df in pd.read_csv(file_path, sep=sep, header=None, chunksize=chunk_size, dtype=object):
+        yield from df.itertuples(index=False, name=None)
+
+
+def iter_history(file_path, sheet_name=None, header=True, chunk_size=DEFAULT_CHUNK_SIZE, sep=';'):
+    """Satış geçmişini ürün parçaları halinde akıt
+
+    İlk sütun ürün adı, kalan sütunlar dönemlerdir (yıl, ay ... sayısı serbest).
+    Her adımda (ürünler, dönemler, değerler) döner; değerler
+    len(ürünler) x len(dönemler) float matristir, eksik/metin hücreler NaN.
+    Tablo hiçbir zaman bütünüyle belleğe alınmaz; Excel dosyaları openpyxl
+    read_only modunda satır satır okunur. sheet_name tek sayfalı kitapta
+    yoksa o tek sayfa okunur. header='auto' iken ilk satır yalnızca ürün
+    sütunu etiketiyle başlıyorsa (URUN_BASLIKLARI) başlık sayılır.
+    """
+    if os.path.splitext(file_path)[1].lower() == '.csv':
+        rows = _iter_csv_rows(file_path, sep, chunk_size)
+    else:
+        rows = _iter_excel_rows(file_path, sheet_name)
+
+    donemler = None
+    if header:
+        first = next(rows, None)
+        if first is None:
+            return
+        if header != 'auto' or _is_header(first):
+            donemler = [str(c) for c in first[1:] if c is not None]
+        else:
+            rows = itertools.chain([first], rows)
+
+    urunler = []
+    buf = None
+    for row in rows:
+        if not row or row[0] is None:
+            continue
+        if donemler is None:
+            # Başlıksız tablo: dönem sayısı ilk satırdan belirlenir
+            donemler = [str(i) for i in range(1, len(row))]
+        if buf is None:
+            buf = np.full((chunk_size, len(donemler)), np.nan)
+        i = len(urunler)
+        urunler.append(row[0])
+        for j, value in enumerate(row[1:len(donemler) + 1]):
+            buf[i, j] = _to_float(value)
+        if len(urunler) == chunk_size:
+            yield urunler, donemler, buf
+            urunler = []
+            buf = None
+    if urunler:
+        yield urunler, donemler, buf[:len(urunler)]
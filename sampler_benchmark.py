@@ -0,0 +1,99 @@
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from problem_instance import ProblemInstance
+from scenarios import DAGILIMLAR, SAMPLERS, demand_matrix_from_params
+from SDP_IP_Excel import OptimizationTester
+
+# Örneklem dışı değerlendirme için sabit, büyük MC test kümesi
+TEST_SENARYO = 5000
+TEST_SEED = 99991
+
+
+def run_benchmark(files, samplers=SAMPLERS, scenario_counts=(10, 25, 50, 100), seeds=(1, 2, 3, 4, 5),
+                  dagilim='normal'):
+    """Her (dosya, örnekleyici, K) için amaç değerinin tohumlar arası kararlılığını ölç
+
+    SAA amaç değeri (örneklem içi) ve bulunan planın ortak test senaryolarındaki
+    karı (örneklem dışı) kaydedilir; aynı std'ye daha küçük K ile ulaşan
+    örnekleyici daha küçük MIP demektir.
+    """
+    rows = []
+    for file_path in files:
+        tester = OptimizationTester(dagilim=dagilim)
+        data = tester.load_data(file_path)
+        if data is None:
+            continue
+        instance = ProblemInstance.from_data(data)
+        test_demand = demand_matrix_from_params(data['urunler'], data['urun_param_dict'], TEST_SENARYO,
+                                                seed=TEST_SEED, dagilim=dagilim)
+        print(f"\n📁 {os.path.basename(file_path)} | {instance}")
+
+        for sampler in samplers:
+            tester.sampler = sampler
+            for k in scenario_counts:
+                for seed in seeds:
+                    scenarios = tester.generate_scenarios(data['urunler'], data['urun_param_dict'], k, seed)
+                    result = tester.solve_optimization(data, scenarios, k, verbose=False)
+                    if result['status'] != 'success':
+                        continue
+                    x_arc = instance.plan_to_array(result['x_values'])
+                    rows.append({
+                        'file': os.path.basename(file_path),
+                        'sampler': sampler,
+                        'scenario_count': k,
+                        'seed': seed,
+                        # Model amacı: senaryo başına ortalama gelir - üretim maliyeti
+                        'saa_objective': result['total_revenue'] / k - result['total_cost'],
+                        'test_profit': instance.expected_profit(x_arc, test_demand),
+                        'solve_time': result['solve_time'],
+                    })
+                ozet = [r for r in rows if r['file'] == os.path.basename(file_path)
+                        and r['sampler'] == sampler and r['scenario_count'] == k]
+                if ozet:
+                    obj = np.array([r['saa_objective'] for r in ozet])
+                    # summarize() ile aynı örneklem std'si (ddof=1; tek tohumda tanımsız)
+                    std = obj.std(ddof=1) if len(obj) > 1 else float('nan')
+                    print(f"   {sampler:<10} K={k:<5} | SAA ort: {obj.mean():>15,.0f} | "
+                          f"std: {std:>12,.0f} | süre: {np.mean([r['solve_time'] for r in ozet]):.2f}s")
+    return pd.DataFrame(rows)
+
+
+def summarize(df):
+    """Örnekleyici ve K bazında ortalama / standart sapma tablosu"""
+    return (df.groupby(['file', 'sampler', 'scenario_count'])
+              .agg(saa_ort=('saa_objective', 'mean'), saa_std=('saa_objective', 'std'),
+                   test_ort=('test_profit', 'mean'), test_std=('test_profit', 'std'),
+                   sure_ort=('solve_time', 'mean'))
+              .reset_index())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Senaryo örnekleyicilerini K'ya göre amaç kararlılığı ile karşılaştır")
+    parser.add_argument('files', nargs='*', default=["ORTEST50_IP.xlsx", "ORTEST100_IP.xlsx", "ORTEST200_IP.xlsx"])
+    parser.add_argument('--sampler', nargs='+', choices=SAMPLERS, default=list(SAMPLERS))
+    parser.add_argument('--senaryo', type=int, nargs='+', default=[10, 25, 50, 100])
+    parser.add_argument('--seed', type=int, nargs='+', default=[1, 2, 3, 4, 5])
+    parser.add_argument('--dagilim', choices=DAGILIMLAR, default='normal')
+    args = parser.parse_args()
+
+    start = time.time()
+    df = run_benchmark(args.files, args.sampler, args.senaryo, args.seed, args.dagilim)
+    if df.empty:
+        print("❌ Başarılı çözüm yok")
+        return
+    ozet = summarize(df)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    out_file = f"sampler_benchmark_{timestamp}.csv"
+    ozet.to_csv(out_file, index=False, encoding='utf-8-sig')
+    print(f"\n{ozet.to_string(index=False, float_format=lambda v: f'{v:,.2f}')}")
+    print(f"\n📊 Sonuçlar kaydedildi: {out_file} | Toplam süre: {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import warnings
+
+import numpy as np
+
+from instance_loader import CACHE_DIR
+from scenarios import demand_matrix_sampled, marginal_from_normal, scenario_rows
+
+SCENARIO_CACHE_DIR = os.path.join(CACHE_DIR, "scenarios")
+# Disk bütçesi aşılınca en uzun süredir kullanılmayan matrisler silinir
+DEFAULT_BUDGET_BYTES = 2 * 1024 ** 3
+# Bu örnekleyicilerde K senaryonun tamamı birlikte belirlenir (önek özelliği yok)
+EXACT_K_SAMPLERS = ('lhs', 'antithetic')
+
+
+def spec_key(urunler, ortalama, std, sampler, dagilim, seed, per_scenario, k=None):
+    """Senaryo matrisinin içerik adresi: talep parametreleri + dağılım + örnekleyici + tohum"""
+    h = hashlib.sha256()
+    h.update(json.dumps([str(u) for u in urunler], ensure_ascii=False).encode('utf-8'))
+    h.update(np.ascontiguousarray(ortalama, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(std, dtype=np.float64).tobytes())
+    h.update(json.dumps({'sampler': sampler, 'dagilim': dagilim, 'seed': seed,
+                         'per_scenario': bool(per_scenario), 'k': k}).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _extend_rows(ortalama, std, seed, start, stop, sampler, dagilim, per_scenario, state):
+    """[start, stop) senaryolarını üret; (satırlar, sonraki üreteç durumu) döner
+
+    Sonuç, tek seferde stop senaryo üretmenin son (stop - start) satırıyla aynıdır.
+    """
+    from scipy.special import ndtri
+    if per_scenario:
+        return scenario_rows(ortalama, std, seed, start, stop), None
+    if sampler == 'sobol':
+        from scipy.stats import qmc
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            engine = qmc.Sobol(d=len(ortalama), scramble=True, seed=np.random.default_rng(seed))
+            if start:
+                engine.fast_forward(start)
+            u = engine.random(stop - start)
+        return marginal_from_normal(ndtri(np.clip(u, 1e-12, 1 - 1e-12)), ortalama, std, dagilim), None
+
+    rng = np.random.default_rng(seed)
+    if state is not None:
+        rng.bit_generator.state = state
+    if dagilim == 'normal':
+        # scenarios.demand_matrix ile aynı çekiliş
+        rows = rng.normal(ortalama, std, size=(stop - start, len(ortalama)))
+        np.maximum(rows, 0, out=rows)
+    else:
+        u = rng.random((stop - start, len(ortalama)))
+        rows = marginal_from_normal(ndtri(np.clip(u, 1e-12, 1 - 1e-12)), ortalama, std, dagilim)
+    return rows, rng.bit_generator.state
+
+
+class ScenarioCache:
+    """Çalıştırmalar ve betikler arası paylaşılan senaryo önbelleği
+
+    Matrisler içerik adresli .npy dosyaları olarak saklanır ve bellek
+    eşlemeli (salt okunur) döner. Önek özelliği: bir tohumun K=250
+    senaryosu, K=750 kümesinin ilk 250 satırıdır; daha büyük K istenirse
+    kayıtlı matris yeniden üretilmeden uzatılır. LHS / antitetik
+    örneklemede önek özelliği yoktur, bu yüzden K anahtara dahil edilir.
+    Toplam boyut bütçeyi aşınca en eski kullanılan dosyalar silinir (LRU).
+    """
+
+    def __init__(self, root=SCENARIO_CACHE_DIR, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.root = root
+        self.budget_bytes = budget_bytes
+
+    def _paths(self, key):
+        base = os.path.join(self.root, key)
+        return base + ".npy", base + ".json"
+
+    def demand_matrix(self, urunler, urun_param_dict, simulasyon_sayisi, seed, sampler='mc',
+                      dagilim='normal', per_scenario=False):
+        """demand_matrix_from_params ile aynı K x N matris (önbellekten, salt okunur)"""
+        ortalama = np.array([urun_param_dict[u]['ortalama'] for u in urunler], dtype=np.float64)
+        std = np.array([urun_param_dict[u]['std'] for u in urunler], dtype=np.float64)
+        # Senaryo başına akışlar yalnızca varsayılan mc / normal yolunda vardır
+        if per_scenario and (sampler != 'mc' or dagilim != 'normal'):
+            raise ValueError(f"per_scenario yalnızca sampler='mc', dagilim='normal' ile desteklenir "
+                             f"(sampler={sampler}, dagilim={dagilim})")
+        exact = sampler in EXACT_K_SAMPLERS
+        key = spec_key(urunler, ortalama, std, sampler, dagilim, seed, per_scenario,
+                       k=simulasyon_sayisi if exact else None)
+        npy_path, meta_path = self._paths(key)
+
+        meta = self._read_meta(meta_path)
+        if meta is not None and meta['rows'] >= simulasyon_sayisi and os.path.exists(npy_path):
+            os.utime(npy_path)
+            return np.load(npy_path, mmap_mode='r')[:simulasyon_sayisi]
+
+        os.makedirs(self.root, exist_ok=True)
+        if exact:
+            demand = demand_matrix_sampled(ortalama, std, simulasyon_sayisi, sampler, dagilim, seed=seed)
+            self._write(npy_path, meta_path, [demand], simulasyon_sayisi, None)
+        else:
+            start, state = 0, None
+            parts = []
+            if meta is not None and os.path.exists(npy_path):
+                start, state = meta['rows'], meta['state']
+                parts.append(np.load(npy_path, mmap_mode='r'))
+            rows, state = _extend_rows(ortalama, std, seed, start, simulasyon_sayisi,
+                                       sampler, dagilim, per_scenario, state)
+            parts.append(rows)
+            self._write(npy_path, meta_path, parts, simulasyon_sayisi, state)
+
+        self.evict(keep=npy_path)
+        return np.load(npy_path, mmap_mode='r')
+
+    @staticmethod
+    def _read_meta(meta_path):
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(npy_path, meta_path, parts, rows, state):
+        """Parçaları yeni dosyaya yaz ve atomik olarak değiştir (okuyucular eski eşlemeyi korur)"""
+        tmp = f"{npy_path}.{os.getpid()}.tmp.npy"
+        out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float64, shape=(rows, parts[0].shape[1]))
+        s = 0
+        for part in parts:
+            out[s:s + len(part)] = part
+            s += len(part)
+        out.flush()
+        del out
+        os.replace(tmp, npy_path)
+        tmp = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'rows': rows, 'state': state}, f)
+        os.replace(tmp, meta_path)
+
+    def entries(self):
+        """(son kullanım zamanı, boyut, yol) listesi, en eskiden yeniye"""
+        if not os.path.isdir(self.root):
+            return []
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith('.npy') and '.tmp' not in name:
+                path = os.path.join(self.root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """Toplam boyut bütçeye inene kadar en eski kullanılan matrisleri sil"""
+        entries = self.entries()
+        toplam = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if toplam <= self.budget_bytes:
+                break
+            if path == keep:
+                continue
+            for p in (path, path[:-4] + ".json"):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            toplam -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            for p in (path, path[:-4] + ".json"):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
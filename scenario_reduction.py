@@ -0,0 +1,125 @@
+import numpy as np
+
+REDUCTION_METHODS = ('fast_forward', 'kmedoids')
+# Uzaklık hesapları bu kadar satırlık parçalarla yapılır (bellek sınırı)
+CHUNK_SIZE = 2048
+
+
+def _sq_norms(a):
+    return np.einsum('ij,ij->i', a, a)
+
+
+def pairwise_distances(a, b, a_sq=None, b_sq=None):
+    """Öklid uzaklık matrisi len(a) x len(b)"""
+    a_sq = _sq_norms(a) if a_sq is None else a_sq
+    b_sq = _sq_norms(b) if b_sq is None else b_sq
+    d2 = a_sq[:, None] + b_sq[None, :] - 2.0 * (a @ b.T)
+    np.maximum(d2, 0, out=d2)
+    return np.sqrt(d2)
+
+
+def nearest(demand, centers, sq=None):
+    """Her senaryo için en yakın temsilci indeksi ve uzaklığı (parçalı)"""
+    sq = _sq_norms(demand) if sq is None else sq
+    c_sq = _sq_norms(centers)
+    idx = np.empty(len(demand), dtype=np.int64)
+    dist = np.empty(len(demand))
+    for s in range(0, len(demand), CHUNK_SIZE):
+        d = pairwise_distances(demand[s:s + CHUNK_SIZE], centers, sq[s:s + CHUNK_SIZE], c_sq)
+        idx[s:s + CHUNK_SIZE] = d.argmin(axis=1)
+        dist[s:s + CHUNK_SIZE] = d[np.arange(len(d)), idx[s:s + CHUNK_SIZE]]
+    return idx, dist
+
+
+def fast_forward_selection(demand, m, p=None):
+    """Heitsch-Römisch ileri seçim: M senaryo indeksini döndür
+
+    K x K uzaklık matrisi tutulur; K birkaç bini aşıyorsa kmedoids tercih edilmeli.
+    """
+    k = len(demand)
+    p = np.full(k, 1.0 / k) if p is None else p
+    dist = pairwise_distances(demand, demand)
+    mind = np.full(k, np.inf)
+    secilen = []
+    for _ in range(m):
+        # z_u = sum_k p_k * min(mind_k, d(k, u)); seçilmişler için +inf
+        z = np.empty(k)
+        for s in range(0, k, CHUNK_SIZE):
+            z[s:s + CHUNK_SIZE] = p @ np.minimum(mind[:, None], dist[:, s:s + CHUNK_SIZE])
+        z[secilen] = np.inf
+        u = int(z.argmin())
+        secilen.append(u)
+        np.minimum(mind, dist[:, u], out=mind)
+    return np.array(secilen, dtype=np.int64)
+
+
+def _medoid(demand, uyeler, p, sq):
+    """Kümenin ağırlıklı uzaklık toplamı en küçük üyesi
+
+    Aday üyeler CHUNK_SIZE'lık parçalarla değerlendirilir; bellek |küme| x CHUNK_SIZE ile sınırlıdır.
+    """
+    noktalar, w, n_sq = demand[uyeler], p[uyeler], sq[uyeler]
+    maliyet = np.empty(len(uyeler))
+    for s in range(0, len(uyeler), CHUNK_SIZE):
+        maliyet[s:s + CHUNK_SIZE] = w @ pairwise_distances(noktalar, noktalar[s:s + CHUNK_SIZE],
+                                                           n_sq, n_sq[s:s + CHUNK_SIZE])
+    return uyeler[int(maliyet.argmin())]
+
+
+def kmedoids(demand, m, p=None, max_iter=50, seed=0):
+    """Ağırlıklı k-medoids (alternatif atama / medoid güncelleme)
+
+    Başlangıç k-means++ ile seçilir. Atama K x M uzaklıklarla, medoid güncellemesi
+    küme içinde parçalı yapılır (bkz. _medoid); bellek O(K x max(M, CHUNK_SIZE)),
+    süre ise en büyük kümenin boyutunun karesiyle büyür.
+    """
+    k = len(demand)
+    p = np.full(k, 1.0 / k) if p is None else p
+    rng = np.random.default_rng(seed)
+    sq = _sq_norms(demand)
+
+    medoids = [int(rng.choice(k, p=p))]
+    mind = pairwise_distances(demand, demand[medoids], sq, sq[medoids])[:, 0]
+    for _ in range(1, m):
+        w = p * mind ** 2
+        medoids.append(int(rng.choice(k, p=w / w.sum())) if w.sum() > 0 else int(rng.integers(k)))
+        np.minimum(mind, pairwise_distances(demand, demand[medoids[-1:]], sq, sq[medoids[-1:]])[:, 0], out=mind)
+    medoids = np.array(medoids, dtype=np.int64)
+
+    for _ in range(max_iter):
+        atama, _ = nearest(demand, demand[medoids], sq)
+        yeni = medoids.copy()
+        for c in range(m):
+            uyeler = np.flatnonzero(atama == c)
+            if len(uyeler) == 0:
+                continue
+            yeni[c] = _medoid(demand, uyeler, p, sq)
+        if np.array_equal(yeni, medoids):
+            break
+        medoids = yeni
+    return medoids
+
+
+def reduce_scenarios(demand, m, method='kmedoids', p=None, seed=0):
+    """K x N senaryo matrisini M ağırlıklı temsilciye indir
+
+    Döndürür: (M x N temsilci matrisi, M olasılık vektörü, Wasserstein-1 uzaklığı).
+    Her senaryonun olasılığı en yakın temsilciye aktarılır; bu aktarımın
+    maliyeti, seçilen destek üzerinde orijinal ve indirgenmiş dağılım
+    arasındaki Wasserstein-1 (Kantorovich) uzaklığına eşittir.
+    """
+    demand = np.ascontiguousarray(demand, dtype=np.float64)
+    k = len(demand)
+    p = np.full(k, 1.0 / k) if p is None else np.asarray(p, dtype=np.float64)
+    if m >= k:
+        return demand, p, 0.0
+    if method == 'fast_forward':
+        secilen = fast_forward_selection(demand, m, p)
+    elif method == 'kmedoids':
+        secilen = kmedoids(demand, m, p, seed=seed)
+    else:
+        raise ValueError(f"Bilinmeyen indirgeme yöntemi: {method} (seçenekler: {', '.join(REDUCTION_METHODS)})")
+
+    atama, dist = nearest(demand, demand[secilen])
+    olasilik = np.bincount(atama, weights=p, minlength=m)
+    return np.ascontiguousarray(demand[secilen]), olasilik, float(p @ dist)
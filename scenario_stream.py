@@ -0,0 +1,95 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scenarios import marginal_from_normal
+from shared_arrays import SharedArrays, attach
+
+# Blok başına satır; N=200 için ~100 MB float64
+BLOCK_SIZE = 65536
+# Blok akışlarını senaryo akışlarından (scenarios.scenario_seed) ayırmak için anahtar öneki
+_BLOCK_KEY = 0xB10C
+
+
+def block_seed(seed, b):
+    """b. bloğun tohum dizisi; yalnızca (seed, b) ile belirlenir"""
+    return np.random.SeedSequence(seed, spawn_key=(_BLOCK_KEY, b))
+
+
+def block_count(total, block_size=BLOCK_SIZE):
+    return (total + block_size - 1) // block_size
+
+
+def demand_block(ortalama, std, seed, b, total, block_size=BLOCK_SIZE, dagilim='normal'):
+    """b. senaryo bloğu (block_size x N, son blok daha kısa olabilir)
+
+    Blok, diğer bloklar üretilmeden ve hangi işçide üretildiğinden
+    bağımsız olarak aynıdır; 10⁶-10⁷ senaryo hiçbir zaman birlikte tutulmaz.
+    """
+    ortalama = np.asarray(ortalama, dtype=np.float64)
+    std = np.asarray(std, dtype=np.float64)
+    rows = min(block_size, total - b * block_size)
+    rng = np.random.Generator(np.random.PCG64(block_seed(seed, b)))
+    return marginal_from_normal(rng.standard_normal((rows, len(ortalama))), ortalama, std, dagilim)
+
+
+def iter_demand_blocks(ortalama, std, total, seed, block_size=BLOCK_SIZE, dagilim='normal', start_block=0):
+    """(blok indeksi, K_b x N talep bloğu) çiftlerini sırayla üret"""
+    for b in range(start_block, block_count(total, block_size)):
+        yield b, demand_block(ortalama, std, seed, b, total, block_size, dagilim)
+
+
+def iter_demand_blocks_from_params(urunler, urun_param_dict, total, seed, block_size=BLOCK_SIZE, dagilim='normal'):
+    """load_data() sözlüğündeki urun_param_dict ile iter_demand_blocks"""
+    ortalama = [urun_param_dict[u]['ortalama'] for u in urunler]
+    std = [urun_param_dict[u]['std'] for u in urunler]
+    return iter_demand_blocks(ortalama, std, total, seed, block_size, dagilim)
+
+
+def _block_profit_sums(instance, x_arc, seed, blocks, total, block_size, dagilim):
+    """Her blok için (satır sayısı, ortalama kar, ortalamadan sapma kareleri toplamı)"""
+    sonuc = []
+    for b in blocks:
+        demand = demand_block(instance.talep_ortalama, instance.talep_std, seed, b, total, block_size, dagilim)
+        kar = instance.scenario_profits(x_arc, demand)
+        ort = float(kar.mean())
+        sonuc.append((len(kar), ort, float(np.square(kar - ort).sum())))
+    return sonuc
+
+
+def _block_profit_task(args):
+    handle, x_arc, seed, blocks, total, block_size, dagilim = args
+    instance, _ = attach(handle)
+    return _block_profit_sums(instance, x_arc, seed, blocks, total, block_size, dagilim)
+
+
+def evaluate_plan_streaming(instance, x_arc, total, seed, block_size=BLOCK_SIZE, workers=None, dagilim='normal'):
+    """Planı total senaryo üzerinde sabit bellekle değerlendir
+
+    Bloklar işçilere eşit dağıtılır (örnek dizileri SharedArrays ile
+    paylaşılır); blok toplamları blok sırasıyla birleştirildiği için sonuç
+    işçi sayısından bağımsızdır. Döndürür: {'ortalama', 'std', 'std_hata', 'senaryo'}.
+    """
+    x_arc = np.asarray(x_arc, dtype=np.float64)
+    n_block = block_count(total, block_size)
+    if not workers or workers <= 1 or n_block == 1:
+        sums = _block_profit_sums(instance, x_arc, seed, range(n_block), total, block_size, dagilim)
+    else:
+        parcalar = [list(range(w, n_block, workers)) for w in range(workers)]
+        sums = [None] * n_block
+        with SharedArrays(instance) as shared, ProcessPoolExecutor(workers) as ex:
+            tasks = [(shared.handle, x_arc, seed, p, total, block_size, dagilim) for p in parcalar]
+            for p, sonuc in zip(parcalar, ex.map(_block_profit_task, tasks)):
+                for b, s in zip(p, sonuc):
+                    sums[b] = s
+
+    # Blok istatistiklerini birleştir (Chan vd.; büyük karlarda kare toplamı farkından kararlı)
+    n, ortalama, m2 = 0, 0.0, 0.0
+    for n_b, ort_b, m2_b in sums:
+        fark = ort_b - ortalama
+        n_yeni = n + n_b
+        ortalama += fark * n_b / n_yeni
+        m2 += m2_b + fark ** 2 * n * n_b / n_yeni
+        n = n_yeni
+    std = float(np.sqrt(m2 / n))
+    return {'ortalama': ortalama, 'std': std, 'std_hata': float(std / np.sqrt(n)), 'senaryo': n}
@@ -0,0 +1,183 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def scenario_seed(seed, k):
+    """k. senaryonun tohum dizisi; SeedSequence(seed).spawn(K)[k] ile aynıdır"""
+    return np.random.SeedSequence(seed, spawn_key=(k,))
+
+
+def scenario_rows(ortalama, std, seed, start, stop):
+    """[start, stop) senaryolarını her biri kendi akışından üret
+
+    Senaryo k'nın değerleri yalnızca (seed, k) ile belirlenir; senaryolar
+    nasıl parçalanırsa ya da hangi işçide üretilirse üretilsin aynıdır.
+    Global np.random durumu kullanılmaz.
+    """
+    ortalama = np.asarray(ortalama, dtype=np.float64)
+    std = np.asarray(std, dtype=np.float64)
+    rows = np.empty((stop - start, len(ortalama)))
+    for r, k in enumerate(range(start, stop)):
+        rng = np.random.Generator(np.random.PCG64(scenario_seed(seed, k)))
+        rows[r] = rng.normal(ortalama, std)
+    np.maximum(rows, 0, out=rows)
+    return rows
+
+
+def _scenario_rows_task(args):
+    return scenario_rows(*args)
+
+
+def demand_matrix_streams(ortalama, std, simulasyon_sayisi, seed, workers=None,
+                          chunk_size=DEFAULT_CHUNK_SIZE):
+    """Senaryo başına akışlarla K x N talep matrisi; workers > 1 iken paralel
+
+    Sonuç işçi sayısından ve parça boyutundan bağımsız olarak bit düzeyinde aynıdır.
+    """
+    if not workers or workers <= 1 or simulasyon_sayisi <= chunk_size:
+        return scenario_rows(ortalama, std, seed, 0, simulasyon_sayisi)
+    demand = np.empty((simulasyon_sayisi, len(ortalama)))
+    bounds = [(k, min(k + chunk_size, simulasyon_sayisi)) for k in range(0, simulasyon_sayisi, chunk_size)]
+    with ProcessPoolExecutor(workers) as ex:
+        tasks = [(ortalama, std, seed, start, stop) for start, stop in bounds]
+        for (start, stop), rows in zip(bounds, ex.map(_scenario_rows_task, tasks)):
+            demand[start:stop] = rows
+    return demand
+
+
+def demand_matrix(ortalama, std, simulasyon_sayisi, seed=None, rng=None):
+    """K x N talep senaryo matrisini tek vektörel çağrıyla üret
+
+    Talep ~ max(0, Normal(ortalama, std)); satır = senaryo, sütun = ürün.
+    rng verilmezse seed ile np.random.default_rng kullanılır. Eski
+    np.random.seed(seed) + çift döngü senaryolarını birebir üretmek için
+    rng=np.random.RandomState(seed) verilebilir (çekiliş sırası aynıdır).
+    """
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    ortalama = np.asarray(ortalama, dtype=np.float64)
+    std = np.asarray(std, dtype=np.float64)
+    demand = rng.normal(ortalama, std, size=(simulasyon_sayisi, len(ortalama)))
+    np.maximum(demand, 0, out=demand)
+    return np.ascontiguousarray(demand)
+
+
+def demand_matrix_from_params(urunler, urun_param_dict, simulasyon_sayisi, seed=None, rng=None,
+                              per_scenario=False, workers=None, sampler='mc', dagilim='normal',
+                              fitted=None, copula=None):
+    """load_data() sözlüğündeki urun_param_dict ile K x N senaryo matrisi
+
+    per_scenario=True iken her senaryo kendi SeedSequence akışından üretilir
+    (bkz. demand_matrix_streams); eski "seed + k" döngülerinin karşılığıdır ve
+    yalnızca sampler='mc', dagilim='normal' ile (kopulasız) geçerlidir.
+    sampler/dagilim varsayılan dışındaysa demand_matrix_sampled kullanılır.
+    dagilim='fitted' iken ürün bazlı uydurulmuş dağılımlar (fitted, bkz.
+    fitted_distributions.load_fitted) örneklenir.
+    copula (copula.CopulaModel) verilirse ürünler arası korelasyonlu senaryolar
+    Gauss kopulası ile, seçilen marjinal dağılımla üretilir.
+    """
+    if per_scenario and (sampler != 'mc' or dagilim != 'normal' or copula is not None):
+        raise ValueError(f"per_scenario yalnızca kopulasız sampler='mc', dagilim='normal' ile desteklenir "
+                         f"(sampler={sampler}, dagilim={dagilim})")
+    if dagilim == 'fitted':
+        from fitted_distributions import fitted_demand_matrix, fitted_quantiles, load_fitted
+        fitted = fitted if fitted is not None else load_fitted()
+        if copula is not None:
+            u = copula.subset(urunler).uniforms(simulasyon_sayisi, seed, sampler)
+            return fitted_quantiles(urunler, fitted, u, urun_param_dict)
+        return fitted_demand_matrix(urunler, fitted, simulasyon_sayisi, seed=seed, urun_param_dict=urun_param_dict)
+    ortalama = [urun_param_dict[u]['ortalama'] for u in urunler]
+    std = [urun_param_dict[u]['std'] for u in urunler]
+    if copula is not None:
+        z = copula.subset(urunler).normals(simulasyon_sayisi, seed, sampler)
+        return marginal_from_normal(z, ortalama, std, dagilim)
+    if sampler != 'mc' or dagilim != 'normal':
+        return demand_matrix_sampled(ortalama, std, simulasyon_sayisi, sampler, dagilim, seed=seed)
+    if per_scenario:
+        return demand_matrix_streams(ortalama, std, simulasyon_sayisi, seed, workers=workers)
+    return demand_matrix(ortalama, std, simulasyon_sayisi, seed=seed, rng=rng)
+
+
+# ----------------------------------------------------------------------
+# Varyans azaltan örnekleyiciler (SAA için daha az senaryo)
+# ----------------------------------------------------------------------
+
+SAMPLERS = ('mc', 'antithetic', 'lhs', 'sobol')
+DAGILIMLAR = ('normal', 'lognormal', 'fitted', 'tamsayi')
+
+
+def uniform_matrix(sampler, simulasyon_sayisi, n, seed=None):
+    """K x N (0, 1) aralığında düzgün örnek matrisi
+
+    mc: bağımsız örnekler, lhs: Latin Hiperküp, sobol: karıştırılmış Sobol
+    (en iyi denge için K ikinin kuvveti olmalı), antithetic: u ve 1 - u çiftleri.
+    """
+    if sampler == 'mc':
+        return np.random.default_rng(seed).random((simulasyon_sayisi, n))
+    if sampler == 'antithetic':
+        yarim = np.random.default_rng(seed).random(((simulasyon_sayisi + 1) // 2, n))
+        return np.vstack([yarim, 1.0 - yarim])[:simulasyon_sayisi]
+    from scipy.stats import qmc
+    if sampler == 'lhs':
+        return qmc.LatinHypercube(d=n, seed=np.random.default_rng(seed)).random(simulasyon_sayisi)
+    if sampler == 'sobol':
+        import warnings
+        with warnings.catch_warnings():
+            # K ikinin kuvveti değilse denge uyarısı verilir; örnekler yine geçerlidir
+            warnings.simplefilter('ignore', UserWarning)
+            return qmc.Sobol(d=n, scramble=True, seed=np.random.default_rng(seed)).random(simulasyon_sayisi)
+    raise ValueError(f"Bilinmeyen örnekleyici: {sampler} (seçenekler: {', '.join(SAMPLERS)})")
+
+
+def demand_matrix_sampled(ortalama, std, simulasyon_sayisi, sampler='mc', dagilim='normal', seed=None):
+    """Örnekleyici + ters dağılım fonksiyonu ile K x N talep matrisi (bkz. marginal_from_normal)"""
+    from scipy.special import ndtri
+    u = uniform_matrix(sampler, simulasyon_sayisi, len(ortalama), seed)
+    # Sobol/LHS uç değerleri 0 veya 1 olabilir; sonsuz z değerlerini önle
+    z = ndtri(np.clip(u, 1e-12, 1 - 1e-12))
+    return marginal_from_normal(z, ortalama, std, dagilim)
+
+
+def marginal_from_normal(z, ortalama, std, dagilim='normal'):
+    """K x N standart normal matrisini ürün marjinallerine çevir
+
+    normal: max(0, ortalama + std * z). lognormal: ortalama ve std'yi
+    koruyan log-normal (sigma² = ln(1 + std²/ortalama²)). tamsayi: sıfırın
+    altı kesilmiş, tam sayılara ayrıklaştırılmış normal (bkz. integer_from_normal).
+    """
+    ortalama = np.asarray(ortalama, dtype=np.float64)
+    std = np.asarray(std, dtype=np.float64)
+    if dagilim == 'tamsayi':
+        return integer_from_normal(z, ortalama, std)
+    if dagilim == 'normal':
+        demand = ortalama + std * z
+        np.maximum(demand, 0, out=demand)
+    elif dagilim == 'lognormal':
+        sigma2 = np.log1p((std / ortalama) ** 2)
+        demand = np.exp(np.log(ortalama) - sigma2 / 2 + np.sqrt(sigma2) * z)
+    else:
+        raise ValueError(f"Bilinmeyen dağılım: {dagilim} (seçenekler: {', '.join(DAGILIMLAR)})")
+    return np.ascontiguousarray(demand)
+
+
+def integer_from_normal(z, ortalama, std):
+    """Standart normalleri kesik, ayrıklaştırılmış normal talebe çevir (tam sayı değerli)
+
+    D = round(X), X ~ Normal(ortalama, std) koşulu X >= -0.5 altında; yani
+    P(D = n) ∝ Φ((n + 0.5 - μ)/σ) - Φ((n - 0.5 - μ)/σ), n = 0, 1, 2, ...
+    max(0, ·) kırpmasının sıfırdaki nokta kütlesi oluşmaz. Ters dağılım
+    yöntemi kuyruk olasılığıyla hesaplanır (ortalama << 0 durumunda da
+    kararlı) ve z'ye göre monotondur; LHS / Sobol / kopula ile uyumludur.
+    """
+    from scipy.special import ndtr, ndtri
+    ortalama = np.asarray(ortalama, dtype=np.float64)
+    std = np.asarray(std, dtype=np.float64)
+    # Kesilmiş kuyruk: P(X >= -0.5); v ∈ (0, kuyruk) -> X = μ - σ Φ⁻¹(v) >= -0.5
+    kuyruk = ndtr((ortalama + 0.5) / std)
+    v = np.clip(ndtr(-z) * kuyruk, 1e-300, None)
+    demand = np.rint(ortalama - std * ndtri(v))
+    np.maximum(demand, 0, out=demand)
+    return demand
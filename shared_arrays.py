@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from instance_io import load_columnar, save_columnar
+
+# Bellek eşlemeli dosyalar mümkünse RAM üzerindeki /dev/shm altında tutulur;
+# tüm işlemler aynı sayfa önbelleğini paylaşır, veri kopyalanmaz.
+SHARED_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") else None
+INSTANCE_DIR = "instance.ortest"
+DEMAND_FILE = "demand.npy"
+
+
+class SharedArrays:
+    """Örnek dizilerini ve senaryo matrisini işçi süreçlerle paylaş
+
+    Diziler bir kez bellek eşlemeli .npy dosyalarına yazılır; işçilere
+    yalnızca dizin yolu (handle) gönderilir ve attach() ile kopyasız
+    bağlanılır. Böylece dağıtım maliyeti K x N x işçi sayısıyla büyümez.
+
+        with SharedArrays(instance, sales_scenarios) as shared:
+            pool.map(worker, [(shared.handle, g) for g in gruplar])
+
+        def worker(args):
+            instance, demand = attach(args[0])
+    """
+
+    def __init__(self, instance, scenarios=None, root=SHARED_ROOT):
+        self.handle = tempfile.mkdtemp(prefix="ortest_shared_", dir=root)
+        try:
+            save_columnar(instance, os.path.join(self.handle, INSTANCE_DIR))
+            if scenarios is not None:
+                if isinstance(scenarios, dict):
+                    scenarios = instance.demand_matrix(scenarios)
+                np.save(os.path.join(self.handle, DEMAND_FILE),
+                        np.ascontiguousarray(scenarios, dtype=np.float64))
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Paylaşılan dosyaları sil (bağlı işçilerin eşlemeleri açık kalır)"""
+        shutil.rmtree(self.handle, ignore_errors=True)
+
+
+def attach(handle):
+    """Paylaşılan örneğe ve senaryo matrisine kopyasız bağlan
+
+    Diziler salt okunurdur; senaryo yayımlanmadıysa demand None döner.
+    """
+    instance = load_columnar(os.path.join(handle, INSTANCE_DIR), mmap=True)
+    demand_path = os.path.join(handle, DEMAND_FILE)
+    demand = np.load(demand_path, mmap_mode='r') if os.path.exists(demand_path) else None
+    return instance, demand
@@ -22,10 +22,16 @@ urunler = [urun for urun in urun_kisit_data['Ürün']]
 # "Ürün - Param" sayfasından her ürün için ortalama ve standart sapma değerlerini alalım
 urun_param_df = pd.read_excel("ORTEST.xlsx", sheet_name="Ürün - Param")
 urun_param_dict = {
-    row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]}
-    for _, row in urun_param_df.iterrows()
+    u: {"ortalama": m, "std": s}
+    for u, m, s in zip(urun_param_df["Ürün"], urun_param_df["Ortalama"], urun_param_df["STD"])
 }
 
+# Sınır ve kapasite sözlükleri (döngü içinde .loc araması yerine)
+urun_alt_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Alt Sınır']))
+urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
+uretici_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Üst Kapasite']))
+uretici_alt_kapasite_dict = dict(zip(uretici_kapasite_data['Üretici'], uretici_kapasite_data['Alt Kapasite']))
+
 for i in range(ITERASYON_SAYISI):
     # Stokastik Satış Miktarları (Normal Dağılım)
     sales_stochastic = {
@@ -44,8 +50,8 @@ for i in range(ITERASYON_SAYISI):
 
     # Üretim Kısıtları
     for urun in urunler:
-        urun_alt = urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Alt Sınır'].values[0]
-        urun_ust = urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Üst Sınır'].values[0]
+        urun_alt = urun_alt_kisit_dict[urun]
+        urun_ust = urun_ust_kisit_dict[urun]
         gecerli_uretici_ciftleri = [uretici for uretici in ureticiler if (urun, uretici) in x]
 
         solver.Add(solver.Sum(x[(urun, uretici)] for uretici in gecerli_uretici_ciftleri) >= urun_alt * y[urun])
@@ -58,8 +64,8 @@ for i in range(ITERASYON_SAYISI):
     # Üretici Kapasite Kısıtları
     for uretici in ureticiler:
         gecerli_urun_ciftleri = [urun for urun in urunler if (urun, uretici) in x]
-        alt_kapasite = uretici_kapasite_data.loc[uretici_kapasite_data['Üretici'] == uretici, 'Alt Kapasite'].values[0]
-        ust_kapasite = uretici_kapasite_data.loc[uretici_kapasite_data['Üretici'] == uretici, 'Üst Kapasite'].values[0]
+        alt_kapasite = uretici_alt_kapasite_dict[uretici]
+        ust_kapasite = uretici_kapasite_dict[uretici]
 
         solver.Add(solver.Sum(x[(urun, uretici)] for urun in gecerli_urun_ciftleri) >= alt_kapasite * z[uretici])
         solver.Add(solver.Sum(x[(urun, uretici)] for urun in gecerli_urun_ciftleri) <= ust_kapasite * z[uretici])
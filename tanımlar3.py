@@ -23,8 +23,12 @@ ureticiler = list(set(urun_uretici_data['Üretici']))
 
 # Sözlük hazırlama
 satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
+urun_uretici_dict = dict(zip(zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']), urun_uretici_data['Birim Maliyet']))
+urun_param_dict = {u: {"ortalama": m, "std": s} for u, m, s in zip(urun_param_df["Ürün"], urun_param_df["Ortalama"], urun_param_df["STD"])}
+
+# Sınır ve kapasite sözlükleri (döngü içinde .loc araması yerine)
+urun_alt_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Alt Sınır']))
+urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
 
 def iterasyon_sonuclarini_yazdir(iterasyon, sales_stochastic, x_values, toplam_kar):
     print(f"\n=== {iterasyon + 1}. İTERASYON SONUÇLARI ===")
@@ -76,8 +80,8 @@ for i in range(ITERASYON_SAYISI):
     
     # Üretim kararlarını yalnızca seçilen ürünler için yap
     for urun in selected_urunler:
-        urun_alt = urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Alt Sınır'].values[0]
-        urun_ust = urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Üst Sınır'].values[0]
+        urun_alt = urun_alt_kisit_dict[urun]
+        urun_ust = urun_ust_kisit_dict[urun]
         
         for uretici in ureticiler:
             if (urun, uretici) in urun_uretici_dict:  # Eğer geçerli bir üretici-ürün ikilisi varsa
@@ -97,11 +101,11 @@ for i in range(ITERASYON_SAYISI):
     for urun in selected_urunler:
         urun_toplam_kisit = solver.Add(
             sum(x[(urun, uretici)] for uretici in ureticiler if (urun, uretici) in x) >= 
-            urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Alt Sınır'].values[0]
+            urun_alt_kisit_dict[urun]
         )
         urun_toplam_ust_kisit = solver.Add(
             sum(x[(urun, uretici)] for uretici in ureticiler if (urun, uretici) in x) <= 
-            urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Üst Sınır'].values[0]
+            urun_ust_kisit_dict[urun]
         )
     
     # Modeli Çöz
@@ -23,8 +23,11 @@ ureticiler = list(set(urun_uretici_data['Üretici']))
 
 # Sözlük hazırlama
 satis_fiyat = dict(zip(urun_satis_data['Ürün'], urun_satis_data['Satış Fiyatı']))
-urun_uretici_dict = {(row['Ürün'], row['Üretici']): row['Birim Maliyet'] for _, row in urun_uretici_data.iterrows()}
-urun_param_dict = {row["Ürün"]: {"ortalama": row["Ortalama"], "std": row["STD"]} for _, row in urun_param_df.iterrows()}
+urun_uretici_dict = dict(zip(zip(urun_uretici_data['Ürün'], urun_uretici_data['Üretici']), urun_uretici_data['Birim Maliyet']))
+urun_param_dict = {u: {"ortalama": m, "std": s} for u, m, s in zip(urun_param_df["Ürün"], urun_param_df["Ortalama"], urun_param_df["STD"])}
+
+# Sınır ve kapasite sözlükleri (döngü içinde .loc araması yerine)
+urun_ust_kisit_dict = dict(zip(urun_kisit_data['Ürün'], urun_kisit_data['Üretim Üst Sınır']))
 
 def iterasyon_sonuclarini_yazdir(iterasyon, sales_stochastic, x_values, toplam_kar):
     print(f"\n=== {iterasyon + 1}. İTERASYON SONUÇLARI ===")
@@ -69,7 +72,7 @@ for i in range(ITERASYON_SAYISI):
         uretim_kar[urun] = urun_kar
     
     # Üst üretim sınırlarını belirle
-    urun_ust_kisit = {urun: min(sales_stochastic[urun], urun_kisit_data.loc[urun_kisit_data['Ürün'] == urun, 'Üretim Üst Sınır'].values[0]) for urun in urunler}
+    urun_ust_kisit = {urun: min(sales_stochastic[urun], urun_ust_kisit_dict[urun]) for urun in urunler}
     # Üretim kararlarını yalnızca seçilen ürünler için yap
     for urun in urunler:
         for uretici in ureticiler:
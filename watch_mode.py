@@ -0,0 +1,289 @@
+import os
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+from ortools.linear_solver import pywraplp
+
+from instance_loader import (INSTANCE_SHEETS, SHEET_FIYAT, SHEET_KAPASITE, SHEET_KISIT,
+                             SHEET_PARAM, SHEET_URETICI, _capacity_vectors, _csr_from_arcs,
+                             _product_vector, _split_budget, read_excel_instance)
+from recourse import sales_bound
+
+_NS = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+       'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+       'rel': 'http://schemas.openxmlformats.org/package/2006/relationships'}
+
+# Yeniden yüklemede dosya yarım yazılmış ya da geçici olarak tutarsız olabilir;
+# bu hatalarda değişiklik uygulanmaz ve bir sonraki turda yeniden denenir
+_OKUMA_HATALARI = (OSError, zipfile.BadZipFile, ET.ParseError, KeyError, ValueError, IndexError)
+
+
+def sheet_fingerprints(file_path):
+    """Her sayfa için zip dizinindeki CRC değeri (sayfalar ayrıştırılmaz)
+
+    Paylaşılan metin tablosu (sharedStrings) değişirse tüm sayfalar
+    değişmiş sayılır; hücre metinleri oradan okunur.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+        rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+        targets = {r.get('Id'): r.get('Target') for r in rels.findall('rel:Relationship', _NS)}
+        crc = {info.filename: info.CRC for info in zf.infolist()}
+        shared = crc.get('xl/sharedStrings.xml', 0)
+
+        fingerprints = {}
+        for sheet in workbook.find('m:sheets', _NS):
+            target = targets[sheet.get(f"{{{_NS['r']}}}id")].lstrip('/')
+            if not target.startswith('xl/'):
+                target = 'xl/' + target
+            fingerprints[sheet.get('name')] = (crc.get(target), shared)
+    return fingerprints
+
+
+def changed_sheets(old, new):
+    """İki parmak izi arasında değişen sayfa adları"""
+    return [name for name in new if old.get(name) != new[name]]
+
+
+class IncrementalModel:
+    """Değişen sınır ve katsayıları yerinde güncellenebilen iki aşamalı model
+
+    SDP_IP_Excel.solve_optimization'ın varsayılan formülasyonu: y sürekli ve
+    y <= taban(talep) (recourse.sales_bound) değişken üst sınırı olarak
+    tutulur, böylece talep değişince yalnızca sınırlar güncellenir. Her
+    çözüm bir önceki çözümü başlangıç ipucu olarak kullanır.
+    """
+
+    def __init__(self, instance, demand):
+        self.instance = instance
+        self.demand = demand
+        self.solver = pywraplp.Solver.CreateSolver('SCIP')
+        solver = self.solver
+        inf = solver.infinity()
+        n_senaryo = demand.shape[0]
+
+        self.x = [solver.IntVar(0, inf, f"x_{a}") for a in range(instance.n_arc)]
+        talep_siniri = sales_bound(demand)
+        self.y = [[solver.NumVar(0, float(talep_siniri[k, u]), f"y_{u}_{k}") for k in range(n_senaryo)]
+                  for u in range(instance.n_urun)]
+        self.b = [solver.BoolVar(f"b_{u}") for u in range(instance.n_urun)]
+
+        objective = solver.Objective()
+        for a, var in enumerate(self.x):
+            objective.SetCoefficient(var, -float(instance.birim_maliyet[a]))
+        objective.SetMaximization()
+        self.set_prices(instance.satis_fiyat)
+
+        # Üretici kapasite kısıtları (alt <= toplam <= üst tek satırda)
+        self.cap = []
+        for j in range(instance.n_uretici):
+            ct = solver.Constraint(float(instance.uretici_alt_kapasite[j]),
+                                   float(instance.uretici_ust_kapasite[j]), f"kap_{j}")
+            for a in np.flatnonzero(instance.uretici_idx == j):
+                ct.SetCoefficient(self.x[a], 1)
+            self.cap.append(ct)
+
+        # Ürün alt-üst sınırları ve satılabilir miktar kısıtları
+        self.alt = []
+        self.ust = []
+        for u in range(instance.n_urun):
+            arcs = range(instance.indptr[u], instance.indptr[u + 1])
+            alt = solver.Constraint(0, inf, f"alt_{u}")
+            ust = solver.Constraint(-inf, 0, f"ust_{u}")
+            for a in arcs:
+                alt.SetCoefficient(self.x[a], 1)
+                ust.SetCoefficient(self.x[a], 1)
+            self.alt.append(alt)
+            self.ust.append(ust)
+            for var in self.y[u]:
+                ct = solver.Constraint(-inf, 0)
+                ct.SetCoefficient(var, 1)
+                for a in arcs:
+                    ct.SetCoefficient(self.x[a], -1)
+        self.set_product_bounds(instance.alt_sinir, instance.ust_sinir)
+        self.values = None
+
+    def set_prices(self, satis_fiyat):
+        objective = self.solver.Objective()
+        n_senaryo = self.demand.shape[0]
+        for u, row in enumerate(self.y):
+            coef = float(satis_fiyat[u]) / n_senaryo
+            for var in row:
+                objective.SetCoefficient(var, coef)
+
+    def set_costs(self, birim_maliyet):
+        objective = self.solver.Objective()
+        for a, var in enumerate(self.x):
+            objective.SetCoefficient(var, -float(birim_maliyet[a]))
+
+    def set_capacities(self, ust, alt):
+        for j, ct in enumerate(self.cap):
+            ct.SetBounds(float(alt[j]), float(ust[j]))
+
+    def set_product_bounds(self, alt_sinir, ust_sinir):
+        for u in range(len(self.b)):
+            self.alt[u].SetCoefficient(self.b[u], -float(alt_sinir[u]))
+            self.ust[u].SetCoefficient(self.b[u], -float(ust_sinir[u]))
+
+    def set_demand(self, demand, urunler=None):
+        """Talep matrisini güncelle; urunler verilirse yalnızca o sütunlar"""
+        self.demand = demand
+        talep_siniri = sales_bound(demand)
+        for u in (range(len(self.y)) if urunler is None else urunler):
+            for k, var in enumerate(self.y[u]):
+                var.SetUb(float(talep_siniri[k, u]))
+
+    def solve(self):
+        variables = self.x + self.b + [v for row in self.y for v in row]
+        if self.values is not None:
+            self.solver.SetHint(variables, self.values)
+        status = self.solver.Solve()
+        if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+            self.values = None
+            return None
+        self.values = [v.solution_value() for v in variables]
+        x_arc = np.array(self.values[:len(self.x)])
+        return {'status': status, 'profit': self.solver.Objective().Value(), 'x_arc': x_arc}
+
+
+class InstanceWatcher:
+    """Çalışma kitabını izle; değişen sayfayı yeniden ayrıştırıp modeli güncelle"""
+
+    def __init__(self, file_path, simulasyon_sayisi=100, seed=1300):
+        self.file_path = file_path
+        self.simulasyon_sayisi = simulasyon_sayisi
+        self.seed = seed
+        self.full_reload()
+
+    def full_reload(self):
+        """Tam yükleme: örnek, senaryolar ve model baştan kurulur
+
+        Alanlar yalnızca her şey kurulduktan sonra atanır; okuma hatasında
+        izleyici önceki durumunu korur.
+        """
+        mtime = os.path.getmtime(self.file_path)
+        fingerprints = sheet_fingerprints(self.file_path)
+        instance = read_excel_instance(self.file_path, validate=False)
+        # Standart normal çekilişler sabit tutulur; talep = max(0, ort + std * z)
+        # (aynı seed ile scenarios.demand_matrix'in ürettiği senaryolar)
+        rng = np.random.default_rng(self.seed)
+        z = rng.standard_normal((self.simulasyon_sayisi, instance.n_urun))
+        model = IncrementalModel(instance, self._demand(instance.talep_ortalama, instance.talep_std, z))
+        self.mtime, self.fingerprints, self.instance, self.z, self.model = mtime, fingerprints, instance, z, model
+
+    @staticmethod
+    def _demand(ortalama, std, z):
+        return np.maximum(0, ortalama + std * z)
+
+    def refresh(self):
+        """Değişen sayfaları uygula; değişen sayfa adlarını döndür
+
+        Önce tüm değişen sayfalar ayrıştırılır, model ancak hepsi okunabildiyse
+        güncellenir; parmak izi ve mtime en son kaydedilir. Böylece yarıda
+        kalan bir okuma (_OKUMA_HATALARI) sonraki turda yeniden denenir.
+        """
+        mtime = os.path.getmtime(self.file_path)
+        fingerprints = sheet_fingerprints(self.file_path)
+        sheets = [s for s in changed_sheets(self.fingerprints, fingerprints) if s in INSTANCE_SHEETS]
+        if not sheets:
+            self.mtime, self.fingerprints = mtime, fingerprints
+            return []
+
+        inst = self.instance
+        frames = pd.read_excel(self.file_path, sheet_name=sheets)
+        urun_index = pd.Index(inst.urunler)
+        uretici_index = pd.Index(inst.ureticiler)
+
+        sinirlar = maliyet = kapasite = fiyat = param = None
+        if SHEET_KISIT in frames:
+            kisit, toplam_maliyet = _split_budget(frames[SHEET_KISIT])
+            if kisit['Ürün'].tolist() != inst.urunler:
+                # Ürün kümesi değişti: yapısal değişiklik, tam yeniden kurulum
+                self.full_reload()
+                return sheets
+            sinirlar = (kisit['Üretim Alt Sınır'].to_numpy(dtype=np.float64),
+                        kisit['Üretim Üst Sınır'].to_numpy(dtype=np.float64), toplam_maliyet)
+
+        if SHEET_URETICI in frames:
+            arcs = frames[SHEET_URETICI]
+            indptr, cols, maliyet = _csr_from_arcs(arcs, urun_index, pd.Index(pd.unique(arcs['Üretici'])))
+            if (pd.unique(arcs['Üretici']).tolist() != inst.ureticiler
+                    or not np.array_equal(indptr, inst.indptr) or not np.array_equal(cols, inst.uretici_idx)):
+                self.full_reload()
+                return sheets
+
+        if SHEET_KAPASITE in frames:
+            kapasite = _capacity_vectors(frames[SHEET_KAPASITE], uretici_index)
+
+        if SHEET_FIYAT in frames:
+            fiyat = _product_vector(frames[SHEET_FIYAT], 'Satış Fiyatı', urun_index)
+
+        if SHEET_PARAM in frames:
+            param = (_product_vector(frames[SHEET_PARAM], 'Ortalama', urun_index),
+                     _product_vector(frames[SHEET_PARAM], 'STD', urun_index))
+
+        # Tüm sayfalar okundu: örneği ve modeli güncelle
+        if sinirlar is not None:
+            inst.alt_sinir, inst.ust_sinir, inst.toplam_maliyet = sinirlar
+            self.model.set_product_bounds(inst.alt_sinir, inst.ust_sinir)
+        if maliyet is not None:
+            inst.birim_maliyet = maliyet
+            self.model.set_costs(maliyet)
+        if kapasite is not None:
+            inst.uretici_ust_kapasite, inst.uretici_alt_kapasite = kapasite
+            self.model.set_capacities(*kapasite)
+        if fiyat is not None:
+            inst.satis_fiyat = fiyat
+            self.model.set_prices(fiyat)
+        if param is not None:
+            ortalama, std = param
+            degisen = np.flatnonzero((ortalama != inst.talep_ortalama) | (std != inst.talep_std))
+            inst.talep_ortalama, inst.talep_std = ortalama, std
+            # Yalnızca parametresi değişen ürünlerin senaryo sütunları güncellenir
+            self.model.set_demand(self._demand(ortalama, std, self.z), degisen)
+
+        self.mtime, self.fingerprints = mtime, fingerprints
+        return sheets
+
+    def solve(self):
+        start = time.time()
+        result = self.model.solve()
+        return result, time.time() - start
+
+    def watch(self, interval=1.0):
+        """Dosya değiştikçe yalnızca etkilenen kısmı güncelleyip yeniden çöz"""
+        result, sure = self.solve()
+        self._report("İlk çözüm", result, sure)
+        print(f"👀 İzleniyor: {self.file_path} (çıkmak için Ctrl+C)")
+        try:
+            while True:
+                time.sleep(interval)
+                if os.path.getmtime(self.file_path) == self.mtime:
+                    continue
+                start = time.time()
+                try:
+                    sheets = self.refresh()
+                except _OKUMA_HATALARI:
+                    # Dosya henüz yazılıyor olabilir; bir sonraki turda tekrar dene
+                    continue
+                if not sheets:
+                    continue
+                guncelleme = time.time() - start
+                result, sure = self.solve()
+                self._report(f"Değişen: {', '.join(sheets)} | Güncelleme: {guncelleme:.2f}s", result, sure)
+        except KeyboardInterrupt:
+            print("\n⏹️  İzleme durduruldu")
+
+    @staticmethod
+    def _report(baslik, result, sure):
+        if result is None:
+            print(f"❌ {baslik} | Çözüm bulunamadı ({sure:.2f}s)")
+        else:
+            print(f"✅ {baslik} | Çözüm: {sure:.2f}s | Kar: {result['profit']:,.2f} TL")
+
+
+if __name__ == "__main__":
+    InstanceWatcher("ORTEST.xlsx").watch()